@@ -1,5 +1,4 @@
 import os
-import re
 import signal
 import threading
 import time
@@ -10,7 +9,7 @@ from typing import Optional, Dict, Any
 import inflection
 from cached_property import cached_property
 
-from module.base.decorator import del_cached_property
+from module.base.decorator import del_cached_property, has_cached_property
 from module.config.config import AzurLaneConfig, TaskEnd
 from module.config.deep import deep_get, deep_set
 from module.exception import *
@@ -85,10 +84,28 @@ class AzurLaneAutoScript:
             logger.exception(e)
             exit(1)
 
+    def config_flush(self):
+        """
+        Write delayed config modifications now, if config is created.
+        """
+        if has_cached_property(self, 'config'):
+            self.config.flush()
+
+    def config_reload(self):
+        """
+        Re-create config from file.
+        Delayed modifications are written first, or the new config would read the file before they land.
+        """
+        self.config_flush()
+        del_cached_property(self, 'config')
+
     @cached_property
     def device(self) -> 'Device':
         try:
             from module.device.device import Device
+            from module.ocr.ocr import OCR_MODEL
+            # Load OCR models at background while connecting to emulator
+            OCR_MODEL.prewarm()
             device = Device(config=self.config)
             
             # Initialize error counter with config after device is created
@@ -191,6 +208,9 @@ class AzurLaneAutoScript:
                 content=f"<{self.config_name}> Exception occured",
             )
             exit(1)
+        finally:
+            # Write delayed config modifications at task end, including the exit() above
+            self.config_flush()
 
     def save_error_log(self):
         """
@@ -210,15 +230,9 @@ class AzurLaneAutoScript:
                 image_time = datetime.strftime(data['time'], '%Y-%m-%d_%H-%M-%S-%f')
                 image = handle_sensitive_image(data['image'])
                 save_image(image, f'{folder}/{image_time}.png')
-            with open(logger.log_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                start = 0
-                for index, line in enumerate(lines):
-                    line = line.strip(' \r\t\n')
-                    if re.match('^═{15,}$', line):
-                        start = index
-                lines = lines[start - 2:]
-                lines = handle_sensitive_logs(lines)
+            # Seek to the start of current task in log store, instead of reading the whole log file
+            lines = [logger.log_store.format(record) for record in logger.log_store.since_task_start()]
+            lines = handle_sensitive_logs(lines)
             with open(f'{folder}/log.txt', 'w', encoding='utf-8') as f:
                 f.writelines(lines)
 
@@ -494,6 +508,10 @@ class AzurLaneAutoScript:
     def graceful_shutdown(self):
         """Perform graceful shutdown with resource cleanup"""
         logger.hr('Graceful Shutdown', level=0)
+        try:
+            self.config_flush()
+        except Exception as e:
+            logger.warning(f"Error during config flush: {e}")
         try:
             # Import here to avoid circular dependency
             from module.base.resource import release_resources
@@ -563,11 +581,11 @@ class AzurLaneAutoScript:
                     release_resources()
                     self.device.release_during_wait()
                     if not self.wait_until(task.next_run):
-                        del_cached_property(self, 'config')
+                        self.config_reload()
                         continue
                     if task.command != 'Restart':
                         self.config.task_call('Restart')
-                        del_cached_property(self, 'config')
+                        self.config_reload()
                         continue
                 elif method == 'goto_main':
                     logger.info('Goto main page during wait')
@@ -575,21 +593,21 @@ class AzurLaneAutoScript:
                     release_resources()
                     self.device.release_during_wait()
                     if not self.wait_until(task.next_run):
-                        del_cached_property(self, 'config')
+                        self.config_reload()
                         continue
                 elif method == 'stay_there':
                     logger.info('Stay there during wait')
                     release_resources()
                     self.device.release_during_wait()
                     if not self.wait_until(task.next_run):
-                        del_cached_property(self, 'config')
+                        self.config_reload()
                         continue
                 else:
                     logger.warning(f'Invalid Optimization_WhenTaskQueueEmpty: {method}, fallback to stay_there')
                     release_resources()
                     self.device.release_during_wait()
                     if not self.wait_until(task.next_run):
-                        del_cached_property(self, 'config')
+                        self.config_reload()
                         continue
             break
 
@@ -616,7 +634,7 @@ class AzurLaneAutoScript:
                 # Sometimes, config won't be updated due to blocking
                 # even though it has been changed
                 # So update it once recovered
-                del_cached_property(self, 'config')
+                self.config_reload()
                 logger.info('Server or network is recovered. Restart game client')
                 self.config.task_call('Restart')
             # Get task
@@ -628,7 +646,7 @@ class AzurLaneAutoScript:
             if self.is_first_task and task == 'Restart':
                 logger.info('Skip task `Restart` at scheduler start')
                 self.config.task_delay(server_update=True)
-                del_cached_property(self, 'config')
+                self.config_reload()
                 continue
 
             # Run
@@ -659,11 +677,11 @@ class AzurLaneAutoScript:
                 exit(1)
 
             if success:
-                del_cached_property(self, 'config')
+                self.config_reload()
                 continue
             elif self.config.Error_HandleError:
                 # self.config.task_delay(success=False)
-                del_cached_property(self, 'config')
+                self.config_reload()
                 self.checker.check_now()
                 continue
             else:
@@ -0,0 +1,74 @@
+import importlib
+import os
+
+import module.config.server as server
+from module.base.asset_bundle import ASSET_BUNDLE, ASSETS_BUNDLE_FILE, compile_bundle
+from module.base.button import Button
+from module.base.template import Template
+from module.config.server import VALID_SERVER
+from module.logger import logger
+
+MODULE_FOLDER = './module'
+BUTTON_FILE = 'assets.py'
+
+
+def iter_assets():
+    """
+    Yields:
+        Button | Template: Assets defined in module/*/assets.py
+    """
+    for module in sorted(os.listdir(MODULE_FOLDER)):
+        if not os.path.exists(os.path.join(MODULE_FOLDER, module, BUTTON_FILE)):
+            continue
+        assets = importlib.import_module(f'module.{module}.assets')
+        for obj in vars(assets).values():
+            if isinstance(obj, (Button, Template)):
+                yield obj
+
+
+def iter_arrays(assets):
+    """
+    Decode assets of all servers from source files.
+
+    Yields:
+        tuple[str, tuple | None, dict]: (source, area, arrays), input of compile_bundle()
+    """
+    for s in VALID_SERVER:
+        logger.info(f'Decode assets: {s}')
+        server.server = s
+        for obj in assets:
+            obj.resource_release()
+            if isinstance(obj, Button):
+                if not obj.file:
+                    continue
+                obj.ensure_template()
+                obj.ensure_binary_template()
+                obj.ensure_luma_template()
+                arrays = {'image': obj.image, 'binary': obj.image_binary, 'luma': obj.image_luma}
+                yield obj.file, tuple(obj.area), arrays
+            else:
+                if type(obj).pre_process is not Template.pre_process:
+                    continue
+                arrays = {'image': obj.image, 'binary': obj.image_binary, 'luma': obj.image_luma}
+                yield obj.file, None, arrays
+            obj.resource_release()
+    server.server = 'cn'
+
+
+class AssetCompiler:
+    """
+    Compile decoded assets into ./log/cache/assets.bundle, see module/base/asset_bundle.py
+    Run this after assets are updated, outdated assets are decoded from source files at runtime.
+    Stop running Alas instances before compiling on Windows, mapped files can't be replaced.
+    """
+
+    def __init__(self, file=ASSETS_BUNDLE_FILE):
+        logger.info('Asset compile')
+        ASSET_BUNDLE.enabled = False
+        assets = list(iter_assets())
+        count = compile_bundle(iter_arrays(assets), file=file)
+        logger.info(f'Compiled {count} assets into {file}, {os.path.getsize(file) / 1024 / 1024:.1f} MB')
+
+
+if __name__ == '__main__':
+    AssetCompiler()
@@ -834,6 +834,31 @@ def random_choice(size, possibility_cumsum):
     return np.searchsorted(possibility_cumsum, rdm_unif)
 
 
+@jit(nopython=True, fastmath=True)
+def select_project(projects, project_select_index, reset_index):
+    """
+    与 np.argmin() 相同，选择过滤器索引最低的项目，相同时选择靠前的
+
+    Args:
+        projects (np.ndarray): Shape: (5,) 科研项目
+        project_select_index (np.ndarray): Shape: (188,)
+        reset_index (int): 刷新所对应的优先级数值，放在最后
+
+    Returns:
+        int: 选择的科研项目，1000表示刷新
+    """
+    selected = projects[0]
+    lowest = project_select_index[projects[0]]
+    for i in range(1, 5):
+        f = project_select_index[projects[i]]
+        if f < lowest:
+            selected = projects[i]
+            lowest = f
+    if reset_index < lowest:
+        selected = 1000
+    return selected
+
+
 @jit(nopython=True, fastmath=True)
 def sample(condition, project_select_index, reset_index):
     """
@@ -847,32 +872,26 @@ def sample(condition, project_select_index, reset_index):
     Returns:
         int, int: 有刷新时选择的科研项目, 无刷新时选择的科研项目
     """
+    # 将完成情况转换成数组索引
+    index = 0
+    for i, c in enumerate(condition):
+        if c:
+            index += 2 ** i
+    projects = np.zeros(5, dtype=np.int64)
     while 1:
-        # 将完成情况转换成数组索引
-        index = 0
-        for i, c in enumerate(condition):
-            if c:
-                index += 2 ** i
         # 随机生成5个科研项目，包含3个四期，和2个任意
         # np.random.seed(3)
-        p1, p2, p3 = random_choice(3, SPAWN_RATE_S4[index])
-        p4, p5 = random_choice(2, SPAWN_RATE[index])
+        projects[:3] = random_choice(3, SPAWN_RATE_S4[index])
+        projects[3:] = random_choice(2, SPAWN_RATE[index])
+        p1, p2, p3, p4, p5 = projects
         # 去重
         if p1 == p4 or p2 == p4 or p3 == p4 or p1 == p5 or p2 == p5 or p3 == p5:
             continue
-        # 加入刷新，1000表示刷新
-        project_list = np.array([p1, p2, p3, p4, p5, 1000])
-        # 将项目索引转换为过滤器索引
-        f1, f2, f3, f4, f5 = np.take(project_select_index, project_list[:5])
-        # print(filter_index)
-        # print(project_list)
 
-        # 无刷新时，选择的科研项目
-        s_index = np.array([f1, f2, f3, f4, f5, 999])
-        selected_no_reset = project_list[np.argmin(s_index)]
         # 有刷新时，选择的科研项目
-        s_index = np.array([f1, f2, f3, f4, f5, reset_index])
-        selected_with_reset = project_list[np.argmin(s_index)]
+        selected_with_reset = select_project(projects, project_select_index, reset_index)
+        # 无刷新时，选择的科研项目
+        selected_no_reset = select_project(projects, project_select_index, 999)
 
         return selected_with_reset, selected_no_reset
 
@@ -962,10 +981,68 @@ def simulate(project_select_index, reset_index, target, active=1., interval=0.):
     return day_cost, rewards
 
 
+@jit(nopython=True, fastmath=True)
+def simulate_batch(project_select_index, reset_index, target, active, interval, seed, count):
+    """
+    使用独立的随机数种子，模拟一批玩家做科研到毕业
+
+    Args:
+        project_select_index (np.ndarray):
+        reset_index (int):
+        target (np.ndarray):
+        active (float):
+        interval (float):
+        seed (int): 随机数种子，相同种子结果相同
+        count (int): 模拟次数
+
+    Returns:
+        np.ndarray, np.ndarray: 每次模拟的消耗时间 Shape: (count,)，累计获得物品之和 Shape: (6,)
+    """
+    # numba有自己的随机数状态，在numba函数内设置种子
+    np.random.seed(seed)
+    day_cost = np.zeros(count)
+    rewards = np.zeros(6)
+    for i in range(count):
+        sim_day, sim_rewards = simulate(project_select_index, reset_index, target, active, interval)
+        day_cost[i] = sim_day
+        rewards += sim_rewards
+    return day_cost, rewards
+
+
+def batch_seed(seed, *key):
+    """
+    Args:
+        seed (int):
+        *key (int): 不同的key生成互不相关的随机数序列
+
+    Returns:
+        int: 给numba的种子
+    """
+    return int(np.random.SeedSequence(seed, spawn_key=key).generate_state(1)[0])
+
+
+def batch_worker(data):
+    string, seed, count = data
+    pool = FilterSimulator(string).pool
+    return simulate_batch(
+        pool.project_select_index,
+        pool.reset_index,
+        FilterSimulator.target,
+        FilterSimulator.active,
+        FilterSimulator.interval,
+        seed,
+        count,
+    )
+
+
 class FilterSimulator:
     active = 24 / 24
     interval = 0 / 60 / 24
     target = np.array([513, 513, 343, 343, 343, 150])
+    # 每批模拟次数
+    batch_size = 2000
+    # 提前结束需要的标准误倍数
+    confidence = 3.
 
     def __init__(self, string):
         string = string.replace('E-315', 'A2')
@@ -973,29 +1050,63 @@ class FilterSimulator:
         self.string = string
         self.pool = ResearchPool(string)
 
-    def run(self, sample_count=1000):
-        day_cost = 0
-        rewards = PROJECT_DROP[0] * 0
-        for _ in tqdm(range(sample_count)):
-            sim_day, sim_rewards = simulate(
-                self.pool.project_select_index,
-                self.pool.reset_index,
-                target=FilterSimulator.target,
-                active=FilterSimulator.active,
-                interval=FilterSimulator.interval
-            )
-            day_cost += sim_day
-            rewards += sim_rewards
-        day_cost /= sample_count
-        rewards /= sample_count
+    def run(self, sample_count=1000, seed=0, key=(), baseline=None, process=1):
+        """
+        分批模拟，每批有独立的随机数种子，结果只和种子有关，和进程数无关
+
+        Args:
+            sample_count (int): 最大模拟次数
+            seed (int): 随机数种子
+            key (tuple[int]): 随机数序列的key，同时测试的过滤器需要使用不同的key
+            baseline (float): 平均消耗时间在置信区间上明显高于baseline时，提前结束
+            process (int): 运行的进程数，大于1时不会提前结束
+
+        Returns:
+            float: 平均消耗时间
+        """
+        batches = [min(self.batch_size, sample_count - n) for n in range(0, sample_count, self.batch_size)]
+        data = [(self.string, batch_seed(seed, *key, index), count) for index, count in enumerate(batches)]
+        if process > 1:
+            results = process_map(batch_worker, data, max_workers=process)
+        else:
+            results = []
+            for row in tqdm(data):
+                results.append(batch_worker(row))
+                if baseline is not None and self.is_dominated(results, baseline):
+                    break
+
+        days = np.concatenate([r[0] for r in results])
+        rewards = np.sum([r[1] for r in results], axis=0)
+        day_cost = np.mean(days)
+        rewards /= len(days)
 
         hr3('End Testing')
         print(self.string)
+        if len(days) < sample_count:
+            print(f'Stopped early: {len(days)}/{sample_count}, worse than baseline {baseline}')
         print(f'Average time cost: {day_cost}')
         print(f'Average rewards: {rewards}')
 
         return day_cost
 
+    @classmethod
+    def is_dominated(cls, results, baseline):
+        """
+        序贯检验，平均消耗时间的置信区间下限高于baseline时，认为过滤器明显更差
+
+        Args:
+            results (list[tuple[np.ndarray, np.ndarray]]): simulate_batch() 的结果
+            baseline (float):
+
+        Returns:
+            bool:
+        """
+        days = np.concatenate([r[0] for r in results])
+        if len(days) < 2:
+            return False
+        stderr = np.std(days, ddof=1) / np.sqrt(len(days))
+        return np.mean(days) - cls.confidence * stderr > baseline
+
 
 def split_filter(string):
     if isinstance(string, list):
@@ -1038,9 +1149,9 @@ def position_insert(string, insert, position):
 
 
 def epoch_worker(data):
-    index, total, sample_count, select_index, forward_index, string = data
+    index, total, sample_count, select_index, forward_index, string, seed, key, baseline = data
     hr3(f'Start Testing: {index}/{total}')
-    return FilterSimulator(string).run(sample_count)
+    return FilterSimulator(string).run(sample_count, seed=seed, key=key, baseline=baseline)
 
 
 class BruteForceOptimizer:
@@ -1048,7 +1159,7 @@ class BruteForceOptimizer:
     def optimize(self, string, diff=10):
         for epoch in range(100):
             hr0(f'Epoch: {epoch}')
-            new, diff = self.epoch(string, diff=diff)
+            new, diff = self.epoch(string, diff=diff, epoch=epoch)
             if new == string:
                 break
             else:
@@ -1070,7 +1181,7 @@ class BruteForceOptimizer:
                 string_added = join_filter(string_added)
                 yield select_index, select_index - forward_index, string_added
 
-    def epoch(self, string, diff=10):
+    def epoch(self, string, diff=10, epoch=0):
         diff = min(abs(diff), 1)
         level = np.log(diff) / np.log(10) + 1
         sample_count = int(np.power(10, 5 - level / 2))
@@ -1083,10 +1194,16 @@ class BruteForceOptimizer:
         string_count = len(string_split)
         all_tests = list(self.gen(string, look_forward=look_forward))
         total = len(all_tests)
-        # index, total, sample_count, select_index, forward_index, string_added
-        tests_data = [(index, total, sample_count, *row) for index, row in enumerate(all_tests)]
+        # 先用所有进程测试原过滤器，作为其他过滤器提前结束的基准
+        # 比原过滤器明显更差的过滤器不会被选中，不需要跑满模拟次数
+        hr3(f'Start Testing: 0/{total}')
+        baseline = FilterSimulator(all_tests[0][2]).run(
+            sample_count, seed=BruteForceOptimizer.seed, key=(epoch, 0), process=BruteForceOptimizer.process)
+        # index, total, sample_count, select_index, forward_index, string_added, seed, key, baseline
+        tests_data = [(index, total, sample_count, *row, BruteForceOptimizer.seed, (epoch, index), baseline)
+                      for index, row in enumerate(all_tests)]
 
-        results = process_map(epoch_worker, tests_data, max_workers=BruteForceOptimizer.process)
+        results = [baseline] + process_map(epoch_worker, tests_data[1:], max_workers=BruteForceOptimizer.process)
 
         day_cost = np.ones((string_count, look_forward + 1)) * 1000
         for data, result in zip(tests_data[1:], results[1:]):
@@ -1142,6 +1259,9 @@ FilterSimulator.target = np.array([513, 513, 343, 343, 343, 100])
 # 运行的进程数
 # 建议为cpu的物理进程数
 BruteForceOptimizer.process = 6
+# 随机数种子
+# 相同的种子和设置，结果相同
+BruteForceOptimizer.seed = 0
 
 if __name__ == '__main__':
     """
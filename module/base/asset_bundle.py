@@ -0,0 +1,209 @@
+"""
+Bundle of decoded asset images, compiled by dev_tools/asset_compiler.py
+
+Every Alas instance decodes the same PNG and GIF files when Button and Template are first used.
+The bundle stores decoded arrays and their binary and luma variants, it's memory-mapped read-only,
+so Button and Template get zero-copy views and instances share the same pages.
+
+File layout:
+    8 bytes: Length of manifest, uint64 little endian.
+    Manifest: JSON, {"sources": {file: [size, mtime_ns, sha1]}, "entries": {key: entry}}
+        key: "<sha1>" for Template, "<sha1>|x1,y1,x2,y2" for Button cropped at area.
+            Servers sharing the same image are stored once.
+        entry: {"gif": bool, "image": [array, ...], "binary": [array, ...], "luma": [array, ...]}
+        array: [offset, shape, dtype], offset from the start of data.
+    Data: Arrays aligned to 64 bytes, starts at the first aligned offset after manifest.
+"""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import threading
+
+import numpy as np
+
+ASSETS_BUNDLE_FILE = "./log/cache/assets.bundle"
+ALIGN = 64
+VARIANTS = ("image", "binary", "luma")
+
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def file_sha1(file):
+    with open(file, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def bundle_key(sha1, area=None):
+    """
+    Args:
+        sha1 (str): Hash of source file.
+        area (tuple[int, int, int, int]): Area to crop, None for the whole image.
+
+    Returns:
+        str:
+    """
+    if area is None:
+        return sha1
+    return f"{sha1}|{','.join(str(int(x)) for x in area)}"
+
+
+class AssetBundle:
+    def __init__(self, file=ASSETS_BUNDLE_FILE):
+        self.file = file
+        # Set False to always decode from source files
+        self.enabled = True
+        # Key: file, value: [size, mtime_ns, sha1]
+        self.sources = {}
+        # Key: bundle key, value: entry
+        self.entries = {}
+
+        self._data = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                with open(self.file, "rb") as f:
+                    length = struct.unpack("<Q", f.read(8))[0]
+                    manifest = json.loads(f.read(length))
+                data = np.memmap(self.file, dtype=np.uint8, mode="r", offset=_align(8 + length))
+            except FileNotFoundError:
+                self._loaded = True
+                return
+            except Exception as e:
+                from module.logger import logger
+                logger.warning(f"Failed to load asset bundle {self.file}: {e}")
+                self._loaded = True
+                return
+
+            self._data = data
+            self.sources = manifest["sources"]
+            self.entries = manifest["entries"]
+            # Set last, get() reads entries without lock once loaded
+            self._loaded = True
+
+    def release(self):
+        with self._lock:
+            self._data = None
+            self.sources = {}
+            self.entries = {}
+            self._loaded = False
+
+    def source_sha1(self, file):
+        """
+        Args:
+            file (str):
+
+        Returns:
+            str | None: Hash of file, or None if file is not in bundle or has changed.
+        """
+        source = self.sources.get(file)
+        if source is None:
+            return None
+        try:
+            stat = os.stat(file)
+        except OSError:
+            return None
+        if stat.st_size == source[0] and stat.st_mtime_ns == source[1]:
+            return source[2]
+        # Modify time changes on git checkout, content may be the same
+        sha1 = file_sha1(file)
+        if sha1 == source[2]:
+            return sha1
+        return None
+
+    def _view(self, array):
+        offset, shape, dtype = array
+        return np.ndarray(shape, dtype=dtype, buffer=self._data, offset=offset)
+
+    def get(self, file, area=None):
+        """
+        Args:
+            file (str): Source file.
+            area (tuple[int, int, int, int]): Area to crop, None for the whole image.
+
+        Returns:
+            dict[str, np.ndarray | list[np.ndarray]] | None:
+                Key: "image", "binary", "luma". Value is a list of frames if source is gif.
+                Arrays are read-only. None if not in bundle.
+        """
+        if not self.enabled:
+            return None
+        if not self._loaded:
+            self.load()
+        if not self.entries:
+            return None
+        sha1 = self.source_sha1(file)
+        if sha1 is None:
+            return None
+        entry = self.entries.get(bundle_key(sha1, area))
+        if entry is None:
+            return None
+
+        out = {}
+        for name in VARIANTS:
+            frames = [self._view(array) for array in entry[name]]
+            out[name] = frames if entry["gif"] else frames[0]
+        return out
+
+
+def compile_bundle(items, file=ASSETS_BUNDLE_FILE):
+    """
+    Args:
+        items: Iterable of (source, area, arrays)
+            source (str): Source file.
+            area (tuple[int, int, int, int]): Area to crop, None for the whole image.
+            arrays (dict[str, np.ndarray | list[np.ndarray]]): Key: "image", "binary", "luma",
+                same as the return of AssetBundle.get()
+        file (str): Output file.
+
+    Returns:
+        int: Number of entries.
+    """
+    sources = {}
+    entries = {}
+    os.makedirs(os.path.dirname(file) or ".", exist_ok=True)
+    # Arrays are written to a temp file first, manifest length is unknown until all are decoded
+    data_file = f"{file}.data"
+    with open(data_file, "wb") as data:
+        for source, area, arrays in items:
+            if source not in sources:
+                stat = os.stat(source)
+                sources[source] = [stat.st_size, stat.st_mtime_ns, file_sha1(source)]
+            key = bundle_key(sources[source][2], area)
+            if key in entries:
+                continue
+
+            entry = {"gif": isinstance(arrays["image"], list)}
+            for name in VARIANTS:
+                frames = arrays[name] if entry["gif"] else [arrays[name]]
+                entry[name] = []
+                for frame in frames:
+                    frame = np.ascontiguousarray(frame)
+                    offset = _align(data.tell())
+                    data.seek(offset)
+                    data.write(frame.tobytes())
+                    entry[name].append([offset, list(frame.shape), frame.dtype.str])
+            entries[key] = entry
+
+    manifest = json.dumps({"sources": sources, "entries": entries}).encode("utf-8")
+    # Write to a temp file then replace, instances may be reading the old bundle
+    tmp = f"{file}.tmp"
+    with open(tmp, "wb") as f, open(data_file, "rb") as data:
+        f.write(struct.pack("<Q", len(manifest)))
+        f.write(manifest)
+        f.seek(_align(8 + len(manifest)))
+        shutil.copyfileobj(data, f)
+    os.remove(data_file)
+    os.replace(tmp, file)
+    return len(entries)
+
+
+ASSET_BUNDLE = AssetBundle()
@@ -1,4 +1,5 @@
 from module.base.button import Button
+from module.base.button_batch import ButtonBatch
 from module.base.decorator import cached_property
 from module.base.timer import Timer
 from module.base.utils import *
@@ -8,7 +9,6 @@ from module.config.server import set_server, to_package
 from module.device.device import Device
 from module.device.method.utils import HierarchyButton
 from module.logger import logger
-from module.map_detection.utils import fit_points
 from module.statistics.azurstats import AzurStats
 from module.webui.setting import cached_class_property
 
@@ -201,6 +201,39 @@ class ModuleBase:
 
         return appear
 
+    def appear_batch(self, batch, offset=0, similarity=0.85, threshold=10, prefilter=None):
+        """
+        Detect a group of buttons on the same screenshot.
+        Interval timers are not supported, use `appear()` if needed.
+
+        Args:
+            batch (ButtonBatch, list[Button, Template]):
+            offset (bool, int):
+            similarity (int, float): 0 to 1.
+            threshold (int, float): 0 to 255 if not use offset, smaller means more similar
+            prefilter (int, float): Color threshold to skip template matching, only works with offset.
+
+        Returns:
+            dict[Button, bool]:
+
+        Examples:
+            POPUPS = ButtonBatch([POPUP_CONFIRM, POPUP_CANCEL, GET_ITEMS_1])
+            result = self.appear_batch(POPUPS, offset=(30, 30))
+            if result[POPUP_CONFIRM]:
+                ...
+        """
+        if not isinstance(batch, ButtonBatch):
+            batch = ButtonBatch(batch)
+        for button in batch:
+            self.device.stuck_record_add(button)
+
+        if offset:
+            if isinstance(offset, bool):
+                offset = self.config.BUTTON_OFFSET
+            return batch.match(self.device.image, offset=offset, similarity=similarity, prefilter=prefilter)
+        else:
+            return batch.appear_on(self.device.image, threshold=threshold)
+
     def match_template_color(self, button, offset=(20, 20), interval=0, similarity=0.85, threshold=30):
         """
         Args:
@@ -271,6 +304,7 @@ class ModuleBase:
     ):
         button._match_init = False
         timeout.reset()
+        matched = False
         while 1:
             if skip_first_screenshot:
                 skip_first_screenshot = False
@@ -278,7 +312,10 @@ class ModuleBase:
                 self.device.screenshot()
 
             if button._match_init:
-                if button.match(self.device.image, offset=(0, 0)):
+                # Matched on previous screenshot and pixels are the same, no need to match again
+                if not matched or self.device.area_changed(button.area):
+                    matched = button.match(self.device.image, offset=(0, 0))
+                if matched:
                     if timer.reached():
                         break
                 else:
@@ -346,6 +383,8 @@ class ModuleBase:
             # Not having enough pixels to match
             return None
 
+        # map_detection imports scipy, import on demand to cut import time of all modules
+        from module.map_detection.utils import fit_points
         point = fit_points(points, mod=image_size(image), encourage=encourage)
         point = ensure_int(point + area[:2])
         button_area = area_offset((-encourage, -encourage, encourage, encourage), offset=point)
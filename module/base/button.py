@@ -1,10 +1,11 @@
 import os
 import traceback
 
-import imageio
 from PIL import ImageDraw
 
+from module.base.asset_bundle import ASSET_BUNDLE
 from module.base.decorator import cached_property
+from module.base.frame import Frame
 from module.base.resource import Resource
 from module.base.utils import *
 from module.config.server import VALID_SERVER
@@ -147,7 +148,19 @@ class Button(Resource):
         If needs to call self.match, call this first.
         """
         if not self._match_init:
+            bundled = ASSET_BUNDLE.get(self.file, self.area)
+            if bundled is not None:
+                self.image = bundled["image"]
+                self.image_binary = bundled["binary"]
+                self.image_luma = bundled["luma"]
+                self._match_init = True
+                self._match_binary_init = True
+                self._match_luma_init = True
+                return
             if self.is_gif:
+                # Only a few assets are gif, import on demand to cut import time of assets
+                import imageio
+
                 self.image = []
                 for image in imageio.mimread(self.file):
                     image = image[:, :, :3].copy() if len(image.shape) == 3 else image
@@ -252,14 +265,11 @@ class Button(Resource):
                 offset = np.array(offset)
         else:
             offset = np.array((-3, -offset, 3, offset))
-        image = crop(image, offset + self.area, copy=False)
+        # graying and binarization, cached in frame
+        image_binary = Frame.get(image).crop_binary(offset + self.area)
 
         if self.is_gif:
             for template in self.image_binary:
-                # graying
-                image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                # binarization
-                _, image_binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
                 # template matching
                 res = cv2.matchTemplate(template, image_binary, cv2.TM_CCOEFF_NORMED)
                 _, sim, _, point = cv2.minMaxLoc(res)
@@ -268,10 +278,6 @@ class Button(Resource):
                     return True
             return False
         else:
-            # graying
-            image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            # binarization
-            _, image_binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
             # template matching
             res = cv2.matchTemplate(self.image_binary, image_binary, cv2.TM_CCOEFF_NORMED)
             _, sim, _, point = cv2.minMaxLoc(res)
@@ -300,10 +306,9 @@ class Button(Resource):
                 offset = np.array(offset)
         else:
             offset = np.array((-3, -offset, 3, offset))
-        image = crop(image, offset + self.area, copy=False)
+        image_luma = Frame.get(image).crop_luma(offset + self.area)
 
         if self.is_gif:
-            image_luma = rgb2luma(image)
             for template in self.image_luma:
                 res = cv2.matchTemplate(template, image_luma, cv2.TM_CCOEFF_NORMED)
                 _, sim, _, point = cv2.minMaxLoc(res)
@@ -311,7 +316,6 @@ class Button(Resource):
                 if sim > similarity:
                     return True
         else:
-            image_luma = rgb2luma(image)
             res = cv2.matchTemplate(self.image_luma, image_luma, cv2.TM_CCOEFF_NORMED)
             _, sim, _, point = cv2.minMaxLoc(res)
             self._button_offset = area_offset(self._button, offset[:2] + np.array(point))
@@ -0,0 +1,181 @@
+import module.config.server as server
+from module.base.button import Button
+from module.base.frame import Frame
+from module.base.utils import *
+
+
+def get_colors(image, areas):
+    """
+    Calculate the average colors of multiple areas in one pass.
+    Results are the same as calling `get_color(image, area)` on each area,
+    but the image is only summed once using an integral image.
+
+    Args:
+        image (np.ndarray): Screenshot.
+        areas (np.ndarray): Shape (n, 4), (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y)
+
+    Returns:
+        np.ndarray: Shape (n, 3), (r, g, b) of each area.
+    """
+    areas = np.round(np.asarray(areas)).astype(np.int64).reshape(-1, 4)
+    h, w = image.shape[:2]
+    # Cached in frame, reused by other batches and identical screenshots
+    integral = Frame.get(image).integral
+
+    # Areas out of image are padded with black in `crop()`,
+    # so sum within the image and divide by the full area size.
+    x1 = np.clip(areas[:, 0], 0, w)
+    y1 = np.clip(areas[:, 1], 0, h)
+    x2 = np.clip(areas[:, 2], 0, w)
+    y2 = np.clip(areas[:, 3], 0, h)
+    total = integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+    size = (areas[:, 2] - areas[:, 0]) * (areas[:, 3] - areas[:, 1])
+    size = np.maximum(size, 1).astype(np.float64)
+    colors = total / size[:, np.newaxis]
+    # cv2.mean() of an empty image is 0
+    colors[(x2 <= x1) | (y2 <= y1)] = 0
+
+    if colors.shape[1] < 3:
+        colors = np.repeat(colors[:, :1], 3, axis=1)
+    return colors[:, :3]
+
+
+class ButtonBatch:
+    def __init__(self, buttons, name=None):
+        """
+        A group of buttons which are usually detected on the same screenshot,
+        such as check buttons of all pages.
+
+        Color means of all buttons are calculated in one vectorized pass,
+        template matching runs only on candidates that pass the color prefilter.
+
+        Args:
+            buttons (list[Button, Template]):
+            name (str):
+        """
+        self.buttons = list(buttons)
+        self.name = name if name else "BUTTON_BATCH"
+        self._areas_server = None
+        self._areas = None
+        self._colors = None
+
+    def __str__(self):
+        return self.name
+
+    __repr__ = __str__
+
+    def __len__(self):
+        return len(self.buttons)
+
+    def __iter__(self):
+        return iter(self.buttons)
+
+    @property
+    def color_buttons(self):
+        """
+        Returns:
+            list[Button]: Buttons that have area and color, Templates excluded.
+        """
+        return [button for button in self.buttons if isinstance(button, Button) and len(button.color) == 3]
+
+    def _ensure_areas(self):
+        # Button areas are server specific, re-parse them if server changed.
+        if self._areas_server != server.server:
+            buttons = self.color_buttons
+            self._areas = np.array([button.area for button in buttons], dtype=np.float64).reshape(-1, 4)
+            self._colors = np.array([button.color for button in buttons], dtype=np.float64).reshape(-1, 3)
+            self._areas_server = server.server
+        return self._areas, self._colors
+
+    def color_diff(self, image):
+        """
+        Args:
+            image (np.ndarray): Screenshot.
+
+        Returns:
+            dict[Button, float]: Color tolerance of each button, the same as `color_similarity()`.
+                Smaller means more similar.
+        """
+        areas, colors = self._ensure_areas()
+        if not len(areas):
+            return {}
+        diff = get_colors(image, areas) - colors
+        diff = np.max(np.maximum(diff, 0), axis=1) - np.min(np.minimum(diff, 0), axis=1)
+        return dict(zip(self.color_buttons, diff.tolist()))
+
+    def appear_on(self, image, threshold=10):
+        """
+        Batched `Button.appear_on()`.
+
+        Args:
+            image (np.ndarray): Screenshot.
+            threshold (int): Default to 10.
+
+        Returns:
+            dict[Button, bool]:
+        """
+        return {button: diff <= threshold for button, diff in self.color_diff(image).items()}
+
+    def match(self, image, offset=30, similarity=0.85, prefilter=None):
+        """
+        Batched `Button.match()` and `Template.match()`.
+
+        Args:
+            image (np.ndarray): Screenshot.
+            offset (int, tuple): Detection area offset.
+            similarity (float): 0-1.
+            prefilter (int): Color threshold to pre-filter buttons before template matching.
+                None to match all buttons.
+                Note that color prefilter is measured at the original button area,
+                so it should be loose if buttons may move within offset.
+
+        Returns:
+            dict[Button, bool]:
+        """
+        result = {}
+        diff = self.color_diff(image) if prefilter is not None else {}
+        for button in self.buttons:
+            if prefilter is not None and diff.get(button, 0) > prefilter:
+                result[button] = False
+                continue
+            if isinstance(button, Button):
+                result[button] = button.match(image, offset=offset, similarity=similarity)
+            else:
+                result[button] = button.match(image, similarity=similarity)
+        return result
+
+    def match_first(self, image, offset=30, similarity=0.85):
+        """
+        Template match buttons ordered by color similarity, return the first one matched.
+        Buttons with similar colors at their original area are more likely to appear,
+        so most frames only need a few template matching.
+
+        Args:
+            image (np.ndarray): Screenshot.
+            offset (int, tuple): Detection area offset.
+            similarity (float): 0-1.
+
+        Returns:
+            Button: Or None if nothing matched.
+        """
+        for button in self.iter_by_color(image):
+            if isinstance(button, Button):
+                if button.match(image, offset=offset, similarity=similarity):
+                    return button
+            else:
+                if button.match(image, similarity=similarity):
+                    return button
+        return None
+
+    def iter_by_color(self, image):
+        """
+        Args:
+            image (np.ndarray): Screenshot.
+
+        Yields:
+            Button: Buttons sorted by color similarity, buttons without color come last.
+                Sort is stable, so buttons with the same similarity keep their original order.
+        """
+        diff = self.color_diff(image)
+        inf = float("inf")
+        yield from sorted(self.buttons, key=lambda b: diff.get(b, inf))
@@ -0,0 +1,156 @@
+import itertools
+
+from module.base.decorator import cached_property
+from module.base.utils import *
+
+
+def _area_key(area):
+    """
+    Args:
+        area: (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y), tuple or np.ndarray
+
+    Returns:
+        tuple[int]: Hashable area, rounded the same as `crop()`
+    """
+    return tuple(round(x) for x in area)
+
+
+def image_binary(image):
+    """
+    Graying and OTSU binarization, the same as what template matching does.
+
+    Args:
+        image (np.ndarray): Shape (height, width, channel)
+
+    Returns:
+        np.ndarray: Shape (height, width)
+    """
+    image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, image_bin = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    return image_bin
+
+
+# Size of screenshot thumbnails for change detection, each pixel is a 20x20 cell of 1280x720 screenshots
+THUMBNAIL_SIZE = (64, 36)
+
+
+def image_thumbnail(image, size=THUMBNAIL_SIZE):
+    """
+    A downscaled luma image as a cheap signature of screenshot content.
+
+    Args:
+        image (np.ndarray): Shape (height, width, channel)
+        size (tuple[int, int]): (width, height)
+
+    Returns:
+        np.ndarray: Shape (size[1], size[0]), average luma of each cell
+    """
+    return cv2.resize(rgb2luma(image), size, interpolation=cv2.INTER_AREA)
+
+
+class Frame:
+    """
+    A screenshot with its derived images cached.
+
+    Derived images are calculated lazily on first access and cached in the frame,
+    so multiple buttons and templates reading the same area of the same screenshot
+    only do color conversions once.
+    A new Frame is created when `Device.image` changes, old caches are dropped along with the old frame.
+
+    Examples:
+        frame = Frame.get(self.device.image)
+        binary = frame.crop_binary(BUTTON.area)
+        luma = frame.luma
+    """
+    _counter = itertools.count()
+    # The latest frame of full screenshot
+    _current: "Frame" = None
+
+    def __init__(self, image):
+        """
+        Args:
+            image (np.ndarray): Screenshot
+        """
+        self.image = image
+        self.id = next(Frame._counter)
+        self._cache = {}
+
+    @classmethod
+    def get(cls, image):
+        """
+        Get the frame object of an image.
+        Frames of full screenshots are reused until next screenshot,
+        other images get a temporary frame without cache sharing.
+
+        Args:
+            image (np.ndarray):
+
+        Returns:
+            Frame:
+        """
+        frame = cls._current
+        if frame is not None and frame.image is image:
+            return frame
+        frame = cls(image)
+        # Only share full screenshots, cropped images are usually used once
+        if image_size(image) == (1280, 720):
+            cls._current = frame
+        return frame
+
+    @classmethod
+    def release(cls):
+        cls._current = None
+
+    def __str__(self):
+        return f"Frame({self.id})"
+
+    __repr__ = __str__
+
+    @cached_property
+    def binary(self):
+        return image_binary(self.image)
+
+    @cached_property
+    def luma(self):
+        return rgb2luma(self.image)
+
+    @cached_property
+    def integral(self):
+        """
+        np.ndarray: Integral image in float64, shape (height + 1, width + 1, channel)
+        """
+        integral = cv2.integral(self.image, sdepth=cv2.CV_64F)
+        if integral.ndim == 2:
+            integral = integral[:, :, np.newaxis]
+        return integral
+
+    def _cached(self, key, func):
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = func()
+            self._cache[key] = value
+            return value
+
+    def crop(self, area):
+        """
+        Args:
+            area: (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y)
+
+        Returns:
+            np.ndarray: Cropped image. It may be a view of the screenshot, don't modify it.
+        """
+        area = _area_key(area)
+        return self._cached(("crop", area), lambda: crop(self.image, area, copy=False))
+
+    def crop_binary(self, area):
+        """
+        Note that OTSU threshold is calculated within the area,
+        so it's not the same as cropping `Frame.binary`.
+        """
+        area = _area_key(area)
+        return self._cached(("binary", area), lambda: image_binary(self.crop(area)))
+
+    def crop_luma(self, area):
+        area = _area_key(area)
+        return self._cached(("luma", area), lambda: rgb2luma(self.crop(area)))
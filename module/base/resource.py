@@ -82,33 +82,30 @@ class Resource:
 
 def release_resources(next_task=""):
     # Release all OCR models
-    # Usually to have 2 models loaded and each model takes about 20MB
-    # This will release 20-40MB
     from module.webui.setting import State
 
     if State.deploy_config.UseOcrServer:
         if not next_task:
             # Disconnect OCR server on idle
             from module.ocr.ocr import OCR_MODEL
+            from module.ocr.router import OCR_ROUTER
 
-            try:
-                OCR_MODEL.close()
-            except AttributeError:
-                pass
+            OCR_MODEL.close()
+            # Check if OCR server is alive on next use
+            OCR_ROUTER.reset()
     else:
         # Release only when using per-instance OCR
-        from module.ocr.ocr import OCR_MODEL
-
-        if "Opsi" in next_task or "commission" in next_task:
-            # OCR models will be used soon, don't release
-            models = []
-        elif next_task:
-            # Release OCR models except 'azur_lane'
-            models = ["jp", "tw"]
-        else:
-            models = ["azur_lane", "jp", "tw"]
-        for model in models:
-            del_cached_property(OCR_MODEL, model)
+        # PaddleOCR takes hundreds of MB, OCR_MODEL loads it lazily so it can be released on idle.
+        # Keep it if next task runs immediately, reloading takes seconds.
+        if not next_task:
+            from module.ocr.ocr import OCR_MODEL
+
+            OCR_MODEL.release()
+    if not next_task:
+        from module.logger import logger
+        from module.ocr.cache import OCR_CACHE
+
+        logger.attr("OcrCache", OCR_CACHE.stats())
 
     # Release assets cache
     # module.ui has about 80 assets and takes about 3MB
@@ -1,13 +1,12 @@
 import os
 
-import imageio
-
+from module.base.asset_bundle import ASSET_BUNDLE
 from module.base.button import Button
 from module.base.decorator import cached_property
+from module.base.frame import Frame
 from module.base.resource import Resource
 from module.base.utils import *
 from module.config.server import VALID_SERVER
-from module.map_detection.utils import Points
 
 
 class Template(Resource):
@@ -40,8 +39,20 @@ class Template(Resource):
     @property
     def image(self):
         if self._image is None:
+            # Bundle stores images without pre_process() of subclasses
+            if type(self).pre_process is Template.pre_process:
+                bundled = ASSET_BUNDLE.get(self.file)
+                if bundled is not None:
+                    self._image_binary = bundled["binary"]
+                    self._image_luma = bundled["luma"]
+                    self._image = bundled["image"]
+                    return self._image
             if self.is_gif:
-                self._image = []
+                # Only a few assets are gif, import on demand to cut import time of assets
+                import imageio
+
+                # Build the list before assigning, other threads may be reading
+                images = []
                 channel = 0
                 for image in imageio.mimread(self.file):
                     if not channel:
@@ -53,7 +64,8 @@ class Template(Resource):
                         image = image[:, :, 0].copy()
 
                     image = self.pre_process(image)
-                    self._image += [image, cv2.flip(image, 1)]
+                    images += [image, cv2.flip(image, 1)]
+                self._image = images
             else:
                 self._image = self.pre_process(load_image(self.file))
 
@@ -63,11 +75,12 @@ class Template(Resource):
     def image_binary(self):
         if self._image_binary is None:
             if self.is_gif:
-                self._image_binary = []
+                images = []
                 for image in self.image:
                     image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
                     _, image_binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
-                    self._image_binary.append(image_binary)
+                    images.append(image_binary)
+                self._image_binary = images
             else:
                 image_gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
                 _, self._image_binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
@@ -78,10 +91,11 @@ class Template(Resource):
     def image_luma(self):
         if self._image_luma is None:
             if self.is_gif:
-                self._image_luma = []
+                images = []
                 for image in self.image:
                     luma = rgb2luma(image)
-                    self.image_luma.append(luma)
+                    images.append(luma)
+                self._image_luma = images
             else:
                 self._image_luma = rgb2luma(self.image)
 
@@ -162,6 +176,59 @@ class Template(Resource):
 
             return result
 
+    def match_stacked(self, images, similarity=0.85):
+        """
+        Match on a stack of images with one `cv2.matchTemplate` call,
+        same as calling `match()` on each image but much faster on many small images.
+        Images are joined vertically, results on windows across two images are dropped.
+
+        Args:
+            images (np.ndarray): Shape (n, height, width), or (n, height, width, channel).
+            similarity (float): 0 to 1.
+
+        Returns:
+            np.ndarray | None: Shape (n,), bool, if each image matches.
+                None if template is larger than the images.
+        """
+        n, h, w = images.shape[:3]
+        t_w, t_h = self.size
+        if t_h > h or t_w > w:
+            return None
+        joined = images.reshape((n * h, *images.shape[2:]))
+        # Row index of valid windows in each image
+        rows = np.arange(n)[:, np.newaxis] * h + np.arange(h - t_h + 1)
+
+        if self.is_gif:
+            result = np.zeros(n, dtype=bool)
+            for template in self.image:
+                res = cv2.matchTemplate(joined, template, cv2.TM_CCOEFF_NORMED)
+                sim = np.max(res[rows], axis=(1, 2))
+                result |= sim > similarity
+
+            return result
+
+        else:
+            res = cv2.matchTemplate(joined, self.image, cv2.TM_CCOEFF_NORMED)
+            sim = np.max(res[rows], axis=(1, 2))
+            result = sim > similarity
+
+            # --- START: New Vision LLM Logging ---
+            try:
+                from module.vision_llm import log_vision_comparison
+                for image, s in zip(images[result], sim[result]):
+                    log_vision_comparison(
+                        screen_image=image,
+                        template_image=self.image,
+                        template_name=self.name,
+                        traditional_result={'matched': True, 'similarity': round(float(s), 4), 'method': 'match_stacked'}
+                    )
+            except Exception as e:
+                from module.logger import logger
+                logger.warning(f"Vision LLM logging failed: {e}")
+            # --- END: New Vision LLM Logging ---
+
+            return result
+
     def match_binary(self, image, similarity=0.85):
         """
         Use template match after binarization.
@@ -173,11 +240,10 @@ class Template(Resource):
         Returns:
             bool: If matches.
         """
+        # graying and binarization, cached in frame
+        image_binary = Frame.get(image).binary
+
         if self.is_gif:
-            # graying
-            image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            # binarization
-            _, image_binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
             for template in self.image_binary:
                 # template matching
                 res = cv2.matchTemplate(template, image_binary, cv2.TM_CCOEFF_NORMED)
@@ -189,10 +255,6 @@ class Template(Resource):
             return False
 
         else:
-            # graying
-            image_gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            # binarization
-            _, image_binary = cv2.threshold(image_gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
             # template matching
             res = cv2.matchTemplate(self.image_binary, image_binary, cv2.TM_CCOEFF_NORMED)
             _, sim, _, _ = cv2.minMaxLoc(res)
@@ -219,7 +281,7 @@ class Template(Resource):
 
     def match_luma(self, image, similarity=0.85):
         if self.is_gif:
-            image = rgb2luma(image)
+            image = Frame.get(image).luma
             for template in self.image_luma:
                 res = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
                 _, sim, _, _ = cv2.minMaxLoc(res)
@@ -289,7 +351,7 @@ class Template(Resource):
         return sim, button
 
     def match_luma_result(self, image, name=None):
-        image = rgb2luma(image)
+        image = Frame.get(image).luma
         res = cv2.matchTemplate(image, self.image_luma, cv2.TM_CCOEFF_NORMED)
         _, sim, _, point = cv2.minMaxLoc(res)
         # print(self.file, sim)
@@ -313,6 +375,9 @@ class Template(Resource):
         if scaling != 1.0:
             image = cv2.resize(image, None, fx=scaling, fy=scaling)
 
+        # map_detection imports scipy, import on demand to cut import time of assets
+        from module.map_detection.utils import Points
+
         raw = image
         if self.is_gif:
             result = []
@@ -1206,3 +1206,21 @@ def color_bar_percentage(image, area, prev_color, reverse=False, starter=0, thre
         prev_color = np.mean(image[:, left : prev_index + 1][mask], axis=0)
 
     return 0.0
+
+
+def find_peaks(x, **kwargs):
+    """
+    Same as scipy.signal.find_peaks(), but scipy.signal is imported on first call.
+    Importing scipy.signal takes about 1s, and peak finding is only used in a few pages,
+    such as story options and scrolls.
+
+    Args:
+        x (np.ndarray): 1D array.
+        **kwargs: Parameters passing to scipy.signal.find_peaks()
+
+    Returns:
+        np.ndarray: Indices of peaks.
+        dict: Properties of peaks.
+    """
+    from scipy.signal import find_peaks
+    return find_peaks(x, **kwargs)
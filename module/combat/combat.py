@@ -215,6 +215,8 @@ class Combat(Level, HPBalancer, Retirement, SubmarineCall, CombatAuto, CombatMan
             if not interval_set:
                 if self.is_combat_loading():
                     self.device.screenshot_interval_set("combat")
+                    # Auto battle takes minutes, back off more if screen is static
+                    self.device.screenshot_expect_wait(300, max_interval=1.5)
                     interval_set = True
 
             # End
@@ -1,8 +1,6 @@
 import copy
 from datetime import datetime, timedelta
 
-from scipy import signal
-
 from module.base.timer import Timer
 from module.base.utils import *
 from module.combat.assets import *
@@ -41,7 +39,7 @@ def lines_detect(image):
     # (597, 0, 619, 720) is somewhere with white lines only.
     color_height = np.mean(rgb2gray(crop(image, (597, 0, 619, 720), copy=False)), axis=1)
     parameters = {"height": 200, "distance": 100}
-    peaks, _ = signal.find_peaks(color_height, **parameters)
+    peaks, _ = find_peaks(color_height, **parameters)
     # 67 is the height of commission list header
     # 117 is the height of one commission card.
     peaks = [y for y in peaks if y > 67 + 117]
@@ -359,12 +357,14 @@ class RewardCommission(UI, InfoHandler):
 
             # End
             if self.info_bar_count():
+                self.device.screenshot_expect_wait_end()
                 break
             if count >= 3:
                 # Restart game and handle commission recommend bug.
                 # After you click "Recommend", your ships appear and then suddenly disappear.
                 # At the same time, the icon of commission is flashing.
                 logger.warning("Triggered commission list flashing bug")
+                self.device.screenshot_expect_wait_end()
                 raise GameStuckError("Triggered commission list flashing bug")
 
             # Click
@@ -372,6 +372,8 @@ class RewardCommission(UI, InfoHandler):
                 self.device.click(COMMISSION_START)
                 self.interval_reset(COMMISSION_ADVICE)
                 comm_timer.reset()
+                # Fleet departure takes seconds until info bar shows
+                self.device.screenshot_expect_wait(comm_timer.limit, max_interval=1)
                 continue
             if self.handle_popup_confirm("COMMISSION_START"):
                 self.interval_reset(COMMISSION_ADVICE)
@@ -395,6 +397,7 @@ class RewardCommission(UI, InfoHandler):
                         logger.info("Selected to the correct commission")
                     else:
                         logger.warning("Selected to the wrong commission")
+                        self.device.screenshot_expect_wait_end()
                         return False
                 else:
                     logger.warning("No selected commission detected, assuming correct")
@@ -409,6 +412,8 @@ class RewardCommission(UI, InfoHandler):
                 self.device.click(comm.button)
                 self.device.sleep(0.3)
                 comm_timer.reset()
+                # Commission details unfold with animation, wait until the next click
+                self.device.screenshot_expect_wait(comm_timer.limit, max_interval=1)
 
         return True
 
@@ -63,17 +63,28 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
 
     # Class property
     is_hoarding_task = True
+    # Seconds to wait before writing the file after an argument modification,
+    # modifications during the wait are written together.
+    SAVE_DELAY = 1.0
 
     def __setattr__(self, key, value):
         if key in self.bound:
             path = self.bound[key]
-            self.modified[path] = value
-            if self.auto_update:
-                self.update()
+            with self._save_lock:
+                self.modified[path] = value
+                if self.auto_update:
+                    # Visible immediately, written later
+                    deep_set(self.data, keys=path, value=value)
+                    if key not in self.overridden:
+                        super().__setattr__(key, value)
+                    self.save_later()
         else:
             super().__setattr__(key, value)
 
     def __init__(self, config_name, task=None):
+        # Guards `modified` and `data` against the delayed save in timer thread
+        self._save_lock = threading.RLock()
+        self._save_timer: threading.Timer = None
         logger.attr("Server", self.SERVER)
         # This will read ./config/<config_name>.json
         self.config_name = config_name
@@ -123,11 +134,13 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
         self.save()
 
     def load(self):
-        self.data = self.read_file(self.config_name)
-        self.config_override()
+        with self._save_lock:
+            self.data = self.read_file(self.config_name)
+            self.mark_synced()
+            self.config_override()
 
-        for path, value in self.modified.items():
-            deep_set(self.data, keys=path, value=value)
+            for path, value in self.modified.copy().items():
+                deep_set(self.data, keys=path, value=value)
 
     def bind(self, func, func_list=None):
         """
@@ -255,22 +268,86 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
             raise RequestHumanTakeover
 
     def save(self, mod_name="alas"):
-        if not self.modified:
-            return False
-
-        for path, value in self.modified.items():
-            deep_set(self.data, keys=path, value=value)
-
-        logger.info(f"Save config {filepath_config(self.config_name, mod_name)}, {dict_to_kv(self.modified)}")
-        # Don't use self.modified = {}, that will create a new object.
-        self.modified.clear()
-        self.write_file(self.config_name, data=self.data)
+        with self._save_lock:
+            if not self.modified:
+                return False
+
+            # Other threads may add modifications during saving, take a snapshot
+            modified = self.modified.copy()
+            for path, value in modified.items():
+                deep_set(self.data, keys=path, value=value)
+
+            logger.info(f"Save config {filepath_config(self.config_name, mod_name)}, {dict_to_kv(modified)}")
+            # Don't use self.modified = {}, that will create a new object.
+            for path, value in modified.items():
+                if self.modified.get(path) is value:
+                    del self.modified[path]
+            self.write_file(self.config_name, data=self.data)
+            self.mark_synced()
 
     def update(self):
-        self.load()
-        self.config_override()
-        self.bind(self.task)
-        self.save()
+        with self._save_lock:
+            self._cancel_save_timer()
+            if self.is_synced():
+                # File not modified by others since last read or write, `data` is up-to-date,
+                # skip parsing and migrating the file again.
+                for path, value in self.modified.copy().items():
+                    deep_set(self.data, keys=path, value=value)
+            else:
+                self.load()
+            self.config_override()
+            self.bind(self.task)
+            self.save()
+
+    def __getstate__(self):
+        # Locks and timers can't be copied
+        state = self.__dict__.copy()
+        state["_save_lock"] = None
+        state["_save_timer"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._save_lock = threading.RLock()
+
+    def save_later(self):
+        """
+        Save modifications after `SAVE_DELAY` seconds in a timer thread,
+        so modifications in a row are written once.
+        """
+        with self._save_lock:
+            if self._save_timer is not None:
+                return
+            timer = threading.Timer(self.SAVE_DELAY, self._save_delayed)
+            timer.name = f"ConfigSave_{self.config_name}"
+            self._save_timer = timer
+            timer.start()
+
+    def _save_delayed(self):
+        with self._save_lock:
+            if self._save_timer is None:
+                # Saved by others
+                return
+            self._save_timer = None
+            # Arguments are not re-bound in timer thread, they will be bound in next `update()`
+            if not self.is_synced():
+                self.load()
+            self.save()
+
+    def _cancel_save_timer(self):
+        timer = self._save_timer
+        if timer is not None:
+            timer.cancel()
+            self._save_timer = None
+
+    def flush(self):
+        """
+        Write pending modifications now.
+        Call this at task boundaries.
+        """
+        with self._save_lock:
+            if self._save_timer is not None or self.modified:
+                self.update()
 
     def override(self, **kwargs):
         now = datetime.now().replace(microsecond=0)
@@ -364,9 +441,11 @@ class AzurLaneConfig(ConfigUpdater, ManualConfig, GeneratedConfig, ConfigWatcher
         Returns:
             Any:
         """
-        self.modified[keys] = value
-        if self.auto_update:
-            self.update()
+        with self._save_lock:
+            self.modified[keys] = value
+            if self.auto_update:
+                deep_set(self.data, keys=keys, value=value)
+                self.save_later()
 
     def task_delay(self, success=None, server_update=None, target=None, minute=None, task=None):
         """
@@ -92,6 +92,14 @@ class ManualConfig:
     MAATOUCH_FILEPATH_LOCAL = "./bin/MaaTouch/maatouchsync"
     MAATOUCH_FILEPATH_REMOTE = "/data/local/tmp/maatouchsync"
 
+    # Screenshots before actions, see module/device/action_archive.py
+    # Max screenshots waiting to be archived
+    ACTION_ARCHIVE_QUEUE = 8
+    # True to drop screenshots when the queue is full, False to delay actions until archived
+    ACTION_ARCHIVE_DROP = True
+    # Max delta frames after a keyframe
+    ACTION_ARCHIVE_KEYFRAME_INTERVAL = 30
+
     """
     module.campaign.gems_farming
     """
@@ -153,6 +161,10 @@ class ManualConfig:
     MAP_MYSTERY_MAP_CLICK = True
     MAP_MYSTERY_HAS_CARRIER = False
     MAP_GRID_CENTER_TOLERANCE = 0.2
+    # Number of threads to predict map grids and radar grids, 1 to predict on main thread
+    MAP_GRID_PREDICT_THREADS = 4
+    # Log time cost of each grid predictor, for debugging
+    MAP_GRID_PREDICT_TIMING = False
 
     MOVABLE_ENEMY_FLEET_STEP = 2
     MOVABLE_ENEMY_TURN = (2,)
@@ -218,6 +230,9 @@ class ManualConfig:
     HOMO_CENTER_THRESHOLD = 0.8
     HOMO_CORNER_THRESHOLD = 0.8
     HOMO_RECTANGLE_THRESHOLD = 10
+    # Search free tiles around the previous result moved by the expected swipe first,
+    # within this distance in pixel. 0 to always search the entire image.
+    HOMO_TRACK_RADIUS = 15
 
     HOMO_EDGE_DETECT = True
     HOMO_EDGE_HOUGHLINES_THRESHOLD = 180
@@ -8,6 +8,8 @@ from module.logger import logger
 class ConfigWatcher:
     config_name = "alas"
     start_mtime = DEFAULT_TIME
+    # (st_mtime_ns, st_size) of the file when it was last read or written by this object
+    synced_signature = None
 
     def start_watching(self) -> None:
         self.start_mtime = self.get_mtime()
@@ -31,3 +33,31 @@ class ConfigWatcher:
             return True
         else:
             return False
+
+    def get_signature(self):
+        """
+        Returns:
+            tuple[int, int]: (st_mtime_ns, st_size), or None if file not exist
+        """
+        try:
+            stat = os.stat(filepath_config(self.config_name))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def mark_synced(self) -> None:
+        """
+        Call this after reading or writing the file.
+        """
+        self.synced_signature = self.get_signature()
+
+    def is_synced(self) -> bool:
+        """
+        Unlike `should_reload()` which works in seconds and compares with `start_watching()`,
+        this compares with the last read or write of this object in nanoseconds.
+
+        Returns:
+            bool: True if the file hasn't been modified by others since last read or write
+        """
+        signature = self.synced_signature
+        return signature is not None and signature == self.get_signature()
@@ -0,0 +1,248 @@
+"""
+Archive of screenshots taken before actions, for debugging.
+
+Screenshots are appended to one segment per hour, instead of one PNG per action:
+    ./log/action_archive/<date>/<hour>_<name>.archive: Compressed frames, back to back.
+    ./log/action_archive/<date>/<hour>_<name>.idx: One JSON entry per action,
+        {"time": float, "action": str, "button": str, "kind": str, "offset": int, "length": int,
+         "ref": int, "shape": [height, width, channel]}
+
+Each segment has only one writer. Offsets and entry numbers are kept in memory by the writer,
+so a segment is created exclusively, and another Alas instance or another archive writing the same
+hour gets a new segment `<hour>_<name>_1`, `<hour>_<name>_2`, ...
+
+Kind of entries:
+    "key": zlib compressed raw frame.
+    "delta": zlib compressed (frame - keyframe) in uint8, keyframe is entry `ref` of the same segment.
+        Most pixels are unchanged between actions, so deltas are mostly zeros and compress well.
+    "dup": Same frame as entry `ref`, nothing written.
+"""
+import json
+import os
+import queue
+import threading
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from module.base.frame import image_thumbnail
+from module.base.utils import copy_image
+from module.logger import logger
+
+
+class ActionArchive:
+    # zlib level, 1 is the fastest, archive is for debugging
+    COMPRESS_LEVEL = 1
+
+    def __init__(
+            self,
+            folder="./log/action_archive",
+            name="alas",
+            queue_size=8,
+            drop=True,
+            keyframe_interval=30,
+    ):
+        """
+        Args:
+            folder (str):
+            name (str): Name of segment files, usually config name.
+            queue_size (int): Max screenshots waiting to be archived.
+            drop (bool): True to drop screenshots when queue is full, so actions are never delayed.
+                False to block until there's a space.
+            keyframe_interval (int): Max delta frames after a keyframe.
+        """
+        self.folder = folder
+        self.name = name
+        self.drop = drop
+        self.keyframe_interval = keyframe_interval
+        # Number of screenshots dropped
+        self.dropped = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+
+        # Current segment, (date, hour), and its path without extension
+        self._segment = None
+        self._prefix = None
+        self._file = None
+        self._index_file = None
+        self._count = 0
+        # Keyframe of current segment, (entry number, image, compressed length)
+        self._key = None
+        self._key_deltas = 0
+        # Last entry written with data, (entry number, thumbnail, image)
+        self._last = None
+
+    def put(self, image, action="unknown", button=""):
+        """
+        Queue a screenshot, called before actions.
+
+        Args:
+            image (np.ndarray):
+            action (str): Name of the action, e.g. 'click', 'swipe'.
+            button (str): Name of the button or element being interacted with.
+
+        Returns:
+            bool: If queued.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+            logger.info("Started screenshot archive background thread")
+
+        created = datetime.now().timestamp()
+        if self.drop:
+            if self._queue.full():
+                self.dropped += 1
+                if self.dropped % 100 == 1:
+                    logger.warning(f"Action archive is busy, dropped {self.dropped} screenshots")
+                return False
+            try:
+                self._queue.put_nowait((copy_image(image), created, action, button))
+            except queue.Full:
+                self.dropped += 1
+                return False
+        else:
+            self._queue.put((copy_image(image), created, action, button))
+        return True
+
+    def _worker(self):
+        while 1:
+            data = self._queue.get()
+            if data is None:
+                break
+            try:
+                self.write(*data)
+            except Exception as e:
+                logger.warning(f"Archive worker error: {e}")
+        self.close()
+
+    def stop(self):
+        """
+        Write queued screenshots and stop the worker.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    """
+    Write, only called in worker thread
+    """
+
+    def _open_segment(self, segment):
+        self.close()
+        folder = os.path.join(self.folder, segment[0])
+        os.makedirs(folder, exist_ok=True)
+        base = os.path.join(folder, f"{segment[1]}_{self.name}")
+        prefix = base
+        suffix = 0
+        while 1:
+            # Exclusive creation of index file claims the segment, even between processes
+            try:
+                self._index_file = open(f"{prefix}.idx", mode="xb")
+                break
+            except FileExistsError:
+                suffix += 1
+                prefix = f"{base}_{suffix}"
+        self._file = open(f"{prefix}.archive", mode="wb")
+        self._segment = segment
+        self._prefix = prefix
+        self._count = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        self._segment = None
+        self._prefix = None
+        self._key = None
+        self._key_deltas = 0
+        self._last = None
+
+    def write(self, image, created, action="unknown", button=""):
+        """
+        Args:
+            image (np.ndarray):
+            created (float): Timestamp.
+            action (str):
+            button (str):
+        """
+        now = datetime.fromtimestamp(created)
+        segment = (now.strftime("%Y-%m-%d"), now.strftime("%H"))
+        if segment != self._segment:
+            self._open_segment(segment)
+
+        entry = {
+            "time": created, "action": action, "button": button,
+            "kind": "key", "offset": self._file.tell(), "length": 0, "ref": self._count,
+            "shape": list(image.shape),
+        }
+        thumbnail = image_thumbnail(image)
+        key = self._key
+        # Thumbnails are too coarse to tell small changes like a digit, any difference goes to delta.
+        # Same thumbnail is only a quick rejection, duplicates are exactly the same frame.
+        last = self._last
+        if last is not None and last[2].shape == image.shape \
+                and np.array_equal(thumbnail, last[1]) and np.array_equal(image, last[2]):
+            entry["kind"] = "dup"
+            entry["ref"] = self._last[0]
+        else:
+            data = None
+            if key is not None and key[1].shape == image.shape and self._key_deltas < self.keyframe_interval:
+                data = zlib.compress(np.subtract(image, key[1]).tobytes(), self.COMPRESS_LEVEL)
+                # Screen changed too much, delta doesn't help
+                if len(data) > key[2] // 2:
+                    data = None
+            if data is None:
+                data = zlib.compress(image.tobytes(), self.COMPRESS_LEVEL)
+                self._key = (self._count, image, len(data))
+                self._key_deltas = 0
+            else:
+                entry["kind"] = "delta"
+                entry["ref"] = key[0]
+                self._key_deltas += 1
+            entry["length"] = len(data)
+            self._file.write(data)
+            self._file.flush()
+            self._last = (self._count, thumbnail, image)
+
+        self._index_file.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._index_file.flush()
+        self._count += 1
+
+
+def read_archive(prefix):
+    """
+    Read frames from an archive segment.
+
+    Args:
+        prefix (str): Path without extension, such as `./log/action_archive/2020-01-01/12_alas`
+
+    Yields:
+        tuple[dict, np.ndarray]: Index entry and screenshot.
+    """
+    with open(f"{prefix}.idx", mode="rb") as f:
+        entries = [json.loads(line) for line in f if line.endswith(b"\n")]
+
+    # Deltas refer to the latest keyframe, duplicates refer to the latest written frame
+    key, last = None, None
+    with open(f"{prefix}.archive", mode="rb") as f:
+        for entry in entries:
+            kind = entry["kind"]
+            if kind == "dup":
+                image = last
+            else:
+                f.seek(entry["offset"])
+                image = np.frombuffer(zlib.decompress(f.read(entry["length"])), dtype=np.uint8)
+                image = image.reshape(entry["shape"])
+                if kind == "delta":
+                    image = np.add(key, image)
+                else:
+                    key = image
+                last = image
+            yield entry, image
@@ -34,6 +34,7 @@ from module.device.method.utils import (
 from module.exception import EmulatorNotRunningError, RequestHumanTakeover
 from module.logger import logger
 from module.map.map_grids import SelectedGrids
+from module.ocr.router import OCR_ROUTER
 
 
 def retry(func):
@@ -134,6 +135,7 @@ class Connection(ConnectionAttr):
         # Connect
         self.adb_connect(wait_device=False)
         logger.attr("AdbDevice", self.adb)
+        OCR_ROUTER.on_connect()
 
         # Package
         self.package = self.config.Emulator_PackageName
@@ -867,6 +869,8 @@ class Connection(ConnectionAttr):
         return True
 
     def release_resource(self):
+        # Connection changed, re-evaluate OCR backend on next OCR call
+        OCR_ROUTER.on_disconnect()
         del_cached_property(self, "hermit_session")
         del_cached_property(self, "droidcast_session")
         del_cached_property(self, "_minitouch_builder")
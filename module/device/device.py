@@ -216,6 +216,9 @@ class Device(Screenshot, Control, AppControl):
             self._scrcpy_server_stop()
         if self.config.Emulator_ScreenshotMethod == "nemu_ipc":
             self.nemu_ipc_release()
+        # Write queued screenshots and stop the archive worker, it starts again on the next action
+        if self._action_archive is not None:
+            self._action_archive.stop()
 
     def get_orientation(self):
         """
@@ -262,6 +265,7 @@ class Device(Screenshot, Control, AppControl):
 
     def handle_control_check(self, button):
         self.stuck_record_clear()
+        self.screenshot_interval_reset()
         self.click_record_add(button)
         self.click_record_check()
 
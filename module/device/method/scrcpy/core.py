@@ -28,8 +28,17 @@ class ScrcpyCore(Connection):
     Module from https://github.com/leng-yue/py-scrcpy-client
     """
 
+    # Latest frame converted to RGB, and the decoded frame it's converted from
     _scrcpy_last_frame: np.ndarray | None = None
+    _scrcpy_last_frame_source = None
+    # Latest decoded frame in its native YUV format, av.VideoFrame
+    _scrcpy_last_av_frame = None
+    # Latest key frame packet not yet decoded, av.Packet
+    _scrcpy_last_packet = None
+    # Time when the latest packet is received, and when the frame of _scrcpy_last_av_frame is received
+    _scrcpy_last_packet_time: float = 0.0
     _scrcpy_last_frame_time: float = 0.0
+    _scrcpy_codec = None
 
     _scrcpy_alive = False
     _scrcpy_server_stream: AdbConnection | None = None
@@ -44,6 +53,10 @@ class ScrcpyCore(Connection):
     def _scrcpy_control(self) -> ControlSender:
         return ControlSender(self)
 
+    @cached_property
+    def _scrcpy_codec_lock(self) -> threading.Lock:
+        return threading.Lock()
+
     def scrcpy_init(self):
         self._scrcpy_server_stop()
 
@@ -131,6 +144,8 @@ class ScrcpyCore(Connection):
         self._scrcpy_alive = True
 
         logger.info("Start video stream loop thread")
+        # Create lock before the thread, so both threads get the same one
+        _ = self._scrcpy_codec_lock
         self._scrcpy_stream_loop_thread = threading.Thread(target=self._scrcpy_stream_loop, daemon=True)
         self._scrcpy_stream_loop_thread.start()
         while 1:
@@ -202,21 +217,21 @@ class ScrcpyCore(Connection):
             raise RequestHumanTakeover
 
         codec = CodecContext.create("h264", "r")
+        with self._scrcpy_codec_lock:
+            self._scrcpy_codec = codec
+            self._scrcpy_last_packet = None
+            self._scrcpy_last_av_frame = None
+            self._scrcpy_last_frame_time = 0.0
         while self._scrcpy_alive:
             try:
                 raw_h264 = self._scrcpy_video_socket.recv(0x10000)
                 if raw_h264 == b"":
                     if self._scrcpy_alive:
                         raise ScrcpyError("_scrcpy_stream_loop_thread: Video stream disconnected")
-                packets = codec.parse(raw_h264)
-                for packet in packets:
-                    frames = codec.decode(packet)
-                    for frame in frames:
-                        # logger.info('frame received')
-                        frame = frame.to_ndarray(format="rgb24")
-                        self._scrcpy_last_frame = frame
-                        self._scrcpy_last_frame_time = time.time()
-                        self._scrcpy_resolution = (frame.shape[1], frame.shape[0])
+                with self._scrcpy_codec_lock:
+                    packets = codec.parse(raw_h264)
+                    for packet in packets:
+                        self._scrcpy_receive_packet(packet)
             except (BlockingIOError, InvalidDataError):
                 # only return nonempty frames, may block cv2 render thread
                 time.sleep(0.001)
@@ -229,3 +244,101 @@ class ScrcpyCore(Connection):
                 raise
 
         raise ScrcpyError("_scrcpy_stream_loop stopped")
+
+    @staticmethod
+    def _scrcpy_has_config(packet) -> bool:
+        """
+        If packet carries SPS or PPS, which the decoder needs before any frame.
+
+        Args:
+            packet (av.Packet):
+        """
+        # SPS and PPS are placed before slices in an access unit
+        head = memoryview(packet)[:128].tobytes()
+        start = head.find(b"\x00\x00\x01")
+        while 0 <= start < len(head) - 3:
+            if head[start + 3] & 0x1F in (7, 8):
+                return True
+            start = head.find(b"\x00\x00\x01", start + 3)
+        return False
+
+    def _scrcpy_receive_packet(self, packet):
+        """
+        Must be called with `_scrcpy_codec_lock` acquired.
+
+        Args:
+            packet (av.Packet):
+        """
+        received = time.time()
+        if (
+            ScrcpyOptions.decode_latest_only
+            and packet.is_keyframe
+            and self._scrcpy_last_av_frame is not None
+            and not self._scrcpy_has_config(packet)
+        ):
+            # Key frames don't depend on previous frames,
+            # keep the latest and decode it when a screenshot is requested.
+            self._scrcpy_last_packet = packet
+        elif packet.is_keyframe:
+            # The first key frame and config packets go to decoder right away,
+            # so parameter sets are never dropped. Pending key frame is outdated.
+            self._scrcpy_last_packet = None
+            self._scrcpy_decode(packet, received)
+        else:
+            # Non-key frames reference the previous key frame, decode it first
+            self._scrcpy_decode_pending()
+            self._scrcpy_decode(packet, received)
+        # Set after decoding pending packet, it's the receive time of the pending one
+        self._scrcpy_last_packet_time = received
+
+    def _scrcpy_decode(self, packet, received):
+        """
+        Decode a packet and keep the frame without conversion.
+        Must be called with `_scrcpy_codec_lock` acquired.
+
+        Args:
+            packet (av.Packet):
+            received (float): Time when packet is received.
+        """
+        for frame in self._scrcpy_codec.decode(packet):
+            self._scrcpy_last_av_frame = frame
+            self._scrcpy_last_frame_time = received
+            self._scrcpy_resolution = (frame.width, frame.height)
+
+    def _scrcpy_decode_pending(self):
+        """
+        Decode the key frame kept by `ScrcpyOptions.decode_latest_only`.
+        Must be called with `_scrcpy_codec_lock` acquired.
+        """
+        packet = self._scrcpy_last_packet
+        if packet is not None:
+            self._scrcpy_last_packet = None
+            self._scrcpy_decode(packet, self._scrcpy_last_packet_time)
+
+    def scrcpy_get_last_frame(self, after=0.0):
+        """
+        Decode the latest frame if it's pending, and convert it to RGB.
+        Conversion is cached, calling it multiple times on the same frame costs nothing.
+
+        Args:
+            after (float): Only return frames received after this time.
+
+        Returns:
+            np.ndarray | None: Latest frame in RGB,
+                or None if no frame received yet, or the latest frame is not newer than `after`.
+        """
+        with self._scrcpy_codec_lock:
+            try:
+                self._scrcpy_decode_pending()
+            except Exception as e:
+                # Invalid data, frame stays at the previous one
+                logger.warning(f"Scrcpy decode failed: {repr(e)}")
+            frame = self._scrcpy_last_av_frame
+            frame_time = self._scrcpy_last_frame_time
+
+        if frame is None or frame_time <= after:
+            return None
+        if frame is not self._scrcpy_last_frame_source:
+            self._scrcpy_last_frame = frame.to_ndarray(format="rgb24")
+            self._scrcpy_last_frame_source = frame
+        return self._scrcpy_last_frame
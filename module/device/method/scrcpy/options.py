@@ -5,6 +5,9 @@ import module.device.method.scrcpy.const as const
 
 class ScrcpyOptions:
     frame_rate = 6
+    # Stream is requested to be all key frames (key_i_frame_interval=0),
+    # so key frames can be decoded lazily and frames nobody reads are dropped without decoding.
+    decode_latest_only = True
 
     @classmethod
     def codec_options(cls) -> str:
@@ -108,10 +108,11 @@ class Scrcpy(ScrcpyCore, Uiautomator2):
                 thread = self._scrcpy_stream_loop_thread
                 if thread is None or not thread.is_alive():
                     raise ScrcpyError("_scrcpy_stream_loop_thread died")
-                if self._scrcpy_last_frame_time > now:
+                if self._scrcpy_last_packet_time > now:
                     # no copy
-                    screenshot = self._scrcpy_last_frame
-                    return screenshot
+                    screenshot = self.scrcpy_get_last_frame(after=now)
+                    if screenshot is not None:
+                        return screenshot
 
     @retry
     def click_scrcpy(self, x, y):
@@ -1,8 +1,5 @@
 import os
 import time
-import threading
-import queue
-import re
 from collections import deque
 from datetime import datetime
 
@@ -11,8 +8,10 @@ import numpy as np
 from PIL import Image
 
 from module.base.decorator import cached_property
+from module.base.frame import THUMBNAIL_SIZE, Frame, image_thumbnail
 from module.base.timer import Timer
-from module.base.utils import get_color, image_size, limit_in, save_image
+from module.base.utils import crop, get_color, image_size, limit_in, save_image
+from module.device.action_archive import ActionArchive
 from module.device.method.adb import Adb
 from module.device.method.ascreencap import AScreenCap
 from module.device.method.droidcast import DroidCast
@@ -31,11 +30,25 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy, NemuIpc, LDOpenGL):
     _screenshot_interval = Timer(0.1)
     _last_save_time = {}
     image: np.ndarray
-    
-    # Async archiving
-    _archive_queue = None
-    _archive_thread = None
-    _archive_thread_started = False
+    # Screenshot before the current one
+    image_previous: np.ndarray = None
+    # Thumbnail of current screenshot, and its absolute difference from the previous one
+    _thumbnail: np.ndarray = None
+    _thumbnail_diff: np.ndarray = None
+    # Max luma difference of thumbnail cells to consider as unchanged
+    # Video streams and JPEG based screenshot methods have noises between static frames
+    SCREEN_CHANGE_THRESHOLD = 3
+    # Interval set by screenshot_interval_set(), `_screenshot_interval.limit` backs off from it
+    _screenshot_interval_base = 0.1
+    # Number of unchanged screenshots in a row
+    _screenshot_unchanged = 0
+    # Expected wait declared by screenshot_expect_wait(), (end time, max interval)
+    _screenshot_expect_wait = (0.0, 0.0)
+    # Start to back off after this number of unchanged screenshots
+    SCREENSHOT_BACKOFF_PATIENCE = 3
+    SCREENSHOT_BACKOFF_FACTOR = 1.5
+    # Archive of screenshots before actions
+    _action_archive: ActionArchive = None
 
     @cached_property
     def screenshot_methods(self):
@@ -63,6 +76,7 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy, NemuIpc, LDOpenGL):
         """
         self._screenshot_interval.wait()
         self._screenshot_interval.reset()
+        previous = self.image if self.has_cached_image else None
 
         for attempt in range(10):
             if self.screenshot_method_override:
@@ -89,8 +103,146 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy, NemuIpc, LDOpenGL):
                     time.sleep(wait_time)
                 continue
 
+        self._screen_compare(previous)
+        self._screenshot_interval_adapt()
         return self.image
 
+    def _screen_compare(self, previous):
+        """
+        Compare the new screenshot with the previous one.
+        If they are identical, the previous image object is reused,
+        so derived images cached in its Frame are reused as well.
+
+        Args:
+            previous (np.ndarray): Previous screenshot, or None
+        """
+        self.image_previous = previous
+        thumbnail = image_thumbnail(self.image)
+        if previous is None or self._thumbnail is None or self._thumbnail.shape != thumbnail.shape:
+            self._thumbnail_diff = None
+        else:
+            self._thumbnail_diff = cv2.absdiff(thumbnail, self._thumbnail)
+            if not self._thumbnail_diff.any() and previous.shape == self.image.shape \
+                    and np.array_equal(previous, self.image):
+                self.image = previous
+        self._thumbnail = thumbnail
+
+    def _screenshot_interval_adapt(self):
+        """
+        Back off screenshot interval when screen is static during an expected wait,
+        restore it once screen changes or the wait ends.
+        Outside of screenshot_expect_wait(), interval is always the base,
+        so wait loops that expect a quick response are not slowed down.
+        """
+        if self.frame_changed:
+            self._screenshot_unchanged = 0
+        else:
+            self._screenshot_unchanged += 1
+
+        base = self._screenshot_interval_base
+        end, wait_max = self._screenshot_expect_wait
+        backoff = self._screenshot_unchanged - self.SCREENSHOT_BACKOFF_PATIENCE
+        if backoff > 0 and time.time() < end:
+            interval = min(base * self.SCREENSHOT_BACKOFF_FACTOR ** backoff, max(wait_max, base))
+        else:
+            interval = base
+        self._screenshot_interval.limit = interval
+
+    def screenshot_expect_wait(self, seconds, max_interval=2.0):
+        """
+        Declare that screen is expected to stay static for a while, such as loading and auto battle.
+        Screenshot interval can back off up to `max_interval` during the wait if screen doesn't change.
+        It restores immediately once screen changes.
+        The wait ends after `seconds`, on screenshot_expect_wait_end() or on the next screenshot_interval_set().
+
+        Args:
+            seconds (int, float): Expected wait.
+            max_interval (int, float):
+        """
+        self._screenshot_expect_wait = (time.time() + seconds, max_interval)
+
+    def screenshot_expect_wait_end(self):
+        """
+        End the wait declared by screenshot_expect_wait(), called when leaving the wait loop
+        so following loops are not slowed down.
+        """
+        self._screenshot_expect_wait = (0.0, 0.0)
+        self.screenshot_interval_reset()
+
+    def screenshot_interval_reset(self):
+        """
+        Restore screenshot interval to base, called after control actions
+        since screen is expected to change.
+        """
+        self._screenshot_unchanged = 0
+        self._screenshot_interval.limit = self._screenshot_interval_base
+
+    @property
+    def frame_changed(self):
+        """
+        Returns:
+            bool: If current screenshot is visually different from the previous one.
+                True if there's no previous screenshot.
+        """
+        diff = self._thumbnail_diff
+        if diff is None:
+            return True
+        return bool(np.max(diff) > self.SCREEN_CHANGE_THRESHOLD)
+
+    def changed_regions(self, area=(0, 0, 1280, 720)):
+        """
+        Args:
+            area (tuple): (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y)
+
+        Returns:
+            list[tuple]: Areas of changed thumbnail cells that intersect with the given area,
+                in screenshot coordinates. The whole area if there's no previous screenshot.
+        """
+        diff = self._thumbnail_diff
+        if diff is None:
+            return [tuple(area)]
+        width, height = image_size(self.image)
+        cell_x = width / THUMBNAIL_SIZE[0]
+        cell_y = height / THUMBNAIL_SIZE[1]
+        x1, y1, x2, y2 = area
+        x1, x2 = max(int(x1 // cell_x), 0), min(int(np.ceil(x2 / cell_x)), THUMBNAIL_SIZE[0])
+        y1, y2 = max(int(y1 // cell_y), 0), min(int(np.ceil(y2 / cell_y)), THUMBNAIL_SIZE[1])
+        ys, xs = np.nonzero(diff[y1:y2, x1:x2] > self.SCREEN_CHANGE_THRESHOLD)
+        return [
+            (round((x1 + x) * cell_x), round((y1 + y) * cell_y),
+             round((x1 + x + 1) * cell_x), round((y1 + y + 1) * cell_y))
+            for y, x in zip(ys.tolist(), xs.tolist())
+        ]
+
+    def area_changed(self, area):
+        """
+        Exact comparison of an area between current and previous screenshot.
+        Results detected on the previous screenshot in an unchanged area can be reused.
+
+        Args:
+            area (tuple): (upper_left_x, upper_left_y, bottom_right_x, bottom_right_y)
+
+        Returns:
+            bool: True if any pixel changed, or there's no previous screenshot.
+        """
+        previous = self.image_previous
+        if previous is None:
+            return True
+        if previous is self.image:
+            return False
+        if previous.shape != self.image.shape:
+            return True
+        return not np.array_equal(crop(previous, area, copy=False), crop(self.image, area, copy=False))
+
+    @property
+    def frame(self):
+        """
+        Returns:
+            Frame: Current screenshot with derived images cached,
+                caches are dropped when a new screenshot is taken.
+        """
+        return Frame.get(self.image)
+
     @property
     def has_cached_image(self):
         return hasattr(self, "image") and self.image is not None
@@ -132,38 +284,14 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy, NemuIpc, LDOpenGL):
         length = max(1, min(length, 300))
         return deque(maxlen=length)
 
-    def _start_archive_thread(self):
-        """Start the background thread for async screenshot archiving"""
-        if not self._archive_thread_started:
-            self._archive_queue = queue.Queue()
-            self._archive_thread = threading.Thread(target=self._archive_worker, daemon=True)
-            self._archive_thread.start()
-            self._archive_thread_started = True
-            logger.info("Started screenshot archive background thread")
-    
-    def _archive_worker(self):
-        """Background thread that saves screenshots without blocking main thread"""
-        while True:
-            try:
-                data = self._archive_queue.get(timeout=1)
-                if data is None:  # Shutdown signal
-                    break
-                
-                image, file_path = data
-                save_image(image, file_path)
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.warning(f"Archive worker error: {e}")
-    
     def archive_action_screenshot(self, action_name="unknown", button_name=""):
         """
         Archives the current screenshot before an action is taken.
         This is useful for debugging and understanding the bot's behavior.
-        Saves to 'log/action_archive/<date>/<action_name>/<timestamp>_<button>.png'.
-        
-        Uses async I/O to avoid blocking the main thread.
+        Appends to 'log/action_archive/<date>/<hour>_<config_name>.archive', see ActionArchive.
+
+        Archived in a background thread, screenshots are dropped if the archive can't keep up,
+        unless ACTION_ARCHIVE_DROP=False.
 
         Args:
             action_name (str): Name of the action being taken, e.g. 'click', 'swipe'.
@@ -172,34 +300,16 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy, NemuIpc, LDOpenGL):
         # Ensure we have an image to save
         if not hasattr(self, 'image') or self.image is None:
             return
-        
-        # Start archive thread if needed
-        if not self._archive_thread_started:
-            self._start_archive_thread()
-
-        now = time.time()
-        timestamp = datetime.fromtimestamp(now).strftime("%Y%m%d_%H%M%S_%f")[:-3]
-        date_folder = datetime.fromtimestamp(now).strftime("%Y-%m-%d")
-        
-        # Robust filename sanitization - remove all invalid Windows filename characters
-        button_clean = re.sub(r'[<>:"|?*\\/]', '_', str(button_name))
-        button_clean = button_clean.replace(' ', '_')[:50]  # Limit length
-        
-        if button_clean:
-            file = f"{timestamp}_{button_clean}.png"
-        else:
-            file = f"{timestamp}.png"
 
+        if self._action_archive is None:
+            self._action_archive = ActionArchive(
+                name=self.config.config_name,
+                queue_size=self.config.ACTION_ARCHIVE_QUEUE,
+                drop=self.config.ACTION_ARCHIVE_DROP,
+                keyframe_interval=self.config.ACTION_ARCHIVE_KEYFRAME_INTERVAL,
+            )
         try:
-            # Create folder structure
-            folder = os.path.join("./log/action_archive", date_folder, action_name)
-            os.makedirs(folder, exist_ok=True)
-            
-            file_path = os.path.join(folder, file)
-            
-            # Queue for async save - returns immediately
-            self._archive_queue.put((self.image.copy(), file_path))
-            
+            self._action_archive.put(self.image, action=action_name, button=str(button_name))
         except Exception as e:
             logger.warning(f"Failed to queue screenshot for archiving: {e}")
 
@@ -274,9 +384,11 @@ class Screenshot(Adb, WSA, DroidCast, AScreenCap, Scrcpy, NemuIpc, LDOpenGL):
         if self.config.Emulator_ScreenshotMethod == "scrcpy":
             interval = 0.1
 
-        if interval != self._screenshot_interval.limit:
+        if interval != self._screenshot_interval_base:
             logger.info(f"Screenshot interval set to {interval}s")
-            self._screenshot_interval.limit = interval
+        self._screenshot_interval_base = interval
+        self._screenshot_expect_wait = (0.0, 0.0)
+        self.screenshot_interval_reset()
 
     def image_show(self, image=None):
         if image is None:
@@ -1,5 +1,3 @@
-from scipy import signal
-
 from module.base.base import ModuleBase
 from module.base.button import Button
 from module.base.timer import Timer
@@ -53,7 +51,7 @@ class InfoHandler(ModuleBase):
             # Blue lines are in a interval of 56
             "distance": 50,
         }
-        peaks, _ = signal.find_peaks(line, **parameters)
+        peaks, _ = find_peaks(line, **parameters)
         return len(peaks)
 
     def wait_until_info_bar_disappear(self):
@@ -329,7 +327,7 @@ class InfoHandler(ModuleBase):
             "rel_height": 5,
         }
         y_count = np.sum(image, axis=1)
-        peaks, properties = signal.find_peaks(y_count, **parameters)
+        peaks, properties = find_peaks(y_count, **parameters)
         buttons = []
         total = len(peaks)
         if not total:
@@ -370,7 +368,7 @@ class InfoHandler(ModuleBase):
             # rel_height is about 240 / 48
             "rel_height": 4,
         }
-        peaks, properties = signal.find_peaks(line, **parameters)
+        peaks, properties = find_peaks(line, **parameters)
         buttons = []
         total = len(peaks)
         if not total:
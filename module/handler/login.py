@@ -1,14 +1,13 @@
 from typing import Union
 
 import numpy as np
-from scipy.signal import find_peaks
 from uiautomator2 import UiObject
 from uiautomator2.exceptions import XPathElementNotFoundError
 from uiautomator2.xpath import XPath, XPathSelector
 
 import module.config.server as server
 from module.base.timer import Timer
-from module.base.utils import color_similarity_2d, crop, random_rectangle_point
+from module.base.utils import color_similarity_2d, crop, find_peaks, random_rectangle_point
 from module.handler.assets import *
 from module.logger import logger
 from module.map.assets import *
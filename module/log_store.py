@@ -0,0 +1,320 @@
+"""
+Structured log sink, records are kept next to the Rich formatted text log.
+
+Files:
+    <prefix>.<segment>.jsonl: Append-only segments, one record per line,
+        {"time": float, "level": str, "task": str | None, "message": str, "exc": str (optional)}
+    <prefix>.idx: Sidecar index, one entry per line, [time, segment, offset, task]
+        `task` is the task name if the record at `offset` starts a task,
+        or None for periodic marks and segment starts.
+
+Index is small enough to load in memory, so tail, seek to task start and time range queries
+only read the part of segments they need instead of whole files.
+"""
+import datetime
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from bisect import bisect_right
+
+
+class LogStore:
+    # Roll over to a new segment when the current one exceeds this size
+    SEGMENT_SIZE = 32 * 1024 * 1024
+    # Add an index mark every N seconds
+    INDEX_INTERVAL = 60
+
+    def __init__(self, prefix):
+        """
+        Args:
+            prefix (str): Path without extension, such as `./log/2020-01-01_20200101_000000_alas`
+        """
+        self.prefix = prefix
+        # List of [time, segment, offset, task]
+        self.index = []
+        # Current task, attached to every record
+        self.task = None
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._index_file = None
+        self._index_offset = 0
+        self._segment = 0
+        self._last_mark = 0.
+        self.load_index()
+
+    @property
+    def index_file(self):
+        return f"{self.prefix}.idx"
+
+    def segment_file(self, segment):
+        return f"{self.prefix}.{segment}.jsonl"
+
+    @property
+    def segments(self):
+        """
+        Returns:
+            list[int]: Every segment has a mark at offset 0 in index.
+        """
+        segments = []
+        for entry in self.index:
+            if not segments or segments[-1] != entry[1]:
+                segments.append(entry[1])
+        return segments
+
+    """
+    Write
+    """
+
+    def _open_segment(self, segment):
+        if self._file is not None:
+            self._file.close()
+        self._segment = segment
+        self._file = open(self.segment_file(segment), mode="ab")
+        if self._index_file is None:
+            self._index_file = open(self.index_file, mode="ab")
+
+    def _mark(self, created, offset, task=None):
+        entry = [created, self._segment, offset, task]
+        self._index_file.write((json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._index_file.flush()
+        self._index_offset = self._index_file.tell()
+        self.index.append(entry)
+        self._last_mark = created
+
+    def append(self, level, message, task=None, created=None, exc=None):
+        """
+        Args:
+            level (str): Level name, such as "INFO"
+            message (str):
+            task (str): Task name if this record starts a new task.
+            created (float): Timestamp, default to now.
+            exc (str): Formatted traceback.
+        """
+        if created is None:
+            created = time.time()
+        with self._lock:
+            if task is not None:
+                self.task = task
+            data = {"time": created, "level": level, "task": self.task, "message": message}
+            if exc:
+                data["exc"] = exc
+            line = (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+
+            if self._file is None:
+                self._open_segment(self.segments[-1] + 1 if self.index else 0)
+            offset = self._file.tell()
+            if offset and offset + len(line) > self.SEGMENT_SIZE:
+                self._open_segment(self._segment + 1)
+                offset = 0
+
+            if task is not None:
+                self._mark(created, offset, task)
+            elif not offset or created - self._last_mark >= self.INDEX_INTERVAL:
+                self._mark(created, offset)
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._index_file is not None:
+                self._index_file.close()
+                self._index_file = None
+
+    """
+    Read
+    """
+
+    def load_index(self):
+        """
+        Read new index entries, so a reader can follow a store written by another process.
+        """
+        if self._index_file is not None or not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, mode="rb") as f:
+            f.seek(self._index_offset)
+            for line in f:
+                # Partial line being written
+                if not line.endswith(b"\n"):
+                    break
+                self._index_offset += len(line)
+                self.index.append(json.loads(line))
+
+    def iter_records(self, segment=None, offset=0):
+        """
+        Args:
+            segment (int): Start segment, default to the first one.
+            offset (int): Start offset in the segment.
+
+        Yields:
+            dict: Records in writing order.
+        """
+        self.load_index()
+        for seg in self.segments:
+            if segment is not None and seg < segment:
+                continue
+            try:
+                f = open(self.segment_file(seg), mode="rb")
+            except FileNotFoundError:
+                continue
+            with f:
+                if segment is not None and seg == segment:
+                    f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    yield json.loads(line)
+
+    def tail(self, n=100):
+        """
+        Read the last N records from the end of segments, without reading them from start.
+
+        Args:
+            n (int):
+
+        Returns:
+            list[dict]: In writing order.
+        """
+        self.load_index()
+        lines = []
+        for seg in reversed(self.segments):
+            try:
+                f = open(self.segment_file(seg), mode="rb")
+            except FileNotFoundError:
+                continue
+            with f:
+                size = os.fstat(f.fileno()).st_size
+                if not size:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    # Drop partial line being written
+                    end = mm.rfind(b"\n") + 1
+                    while end > 0 and len(lines) < n:
+                        start = mm.rfind(b"\n", 0, end - 1) + 1
+                        lines.append(mm[start:end])
+                        end = start
+            if len(lines) >= n:
+                break
+        return [json.loads(line) for line in reversed(lines)]
+
+    def task_start(self, task=None):
+        """
+        Args:
+            task (str): Task name, None for any task.
+
+        Returns:
+            tuple[int, int] | None: (segment, offset) of the last start of given task.
+        """
+        self.load_index()
+        for entry in reversed(self.index):
+            if entry[3] is not None and (task is None or entry[3] == task):
+                return entry[1], entry[2]
+        return None
+
+    def since_task_start(self, task=None):
+        """
+        Args:
+            task (str): Task name, None for the current task.
+
+        Returns:
+            list[dict]: Records from the last start of given task to the end.
+        """
+        position = self.task_start(task)
+        if position is None:
+            return list(self.iter_records())
+        return list(self.iter_records(*position))
+
+    def query(self, start=None, end=None, level=None, task=None, keyword=None):
+        """
+        Args:
+            start (float): Timestamp, records before it are skipped.
+            end (float): Timestamp, reading stops after it.
+            level (str): Minimum level name, such as "WARNING".
+            task (str): Only records of this task.
+            keyword (str): Only records contain this keyword in message.
+
+        Yields:
+            dict:
+        """
+        self.load_index()
+        segment, offset = None, 0
+        if start is not None:
+            # Seek to the last mark before start
+            times = [entry[0] for entry in self.index]
+            position = bisect_right(times, start) - 1
+            if position >= 0:
+                segment, offset = self.index[position][1:3]
+        elif task is not None:
+            # Seek to the first start of this task
+            for entry in self.index:
+                if entry[3] == task:
+                    segment, offset = entry[1:3]
+                    break
+            else:
+                return
+        levelno = logging.getLevelName(level) if level is not None else None
+
+        for record in self.iter_records(segment, offset):
+            if start is not None and record["time"] < start:
+                continue
+            if end is not None and record["time"] > end:
+                break
+            if levelno is not None and logging.getLevelName(record["level"]) < levelno:
+                continue
+            if task is not None and record["task"] != task:
+                continue
+            if keyword is not None and keyword not in record["message"]:
+                continue
+            yield record
+
+    @staticmethod
+    def format(record):
+        """
+        Args:
+            record (dict):
+
+        Returns:
+            str: Line in the same format as text log, ending with a new line.
+        """
+        t = datetime.datetime.fromtimestamp(record["time"]).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        text = f'{t} | {record["level"]} | {record["message"]}\n'
+        if "exc" in record:
+            text += record["exc"] + "\n"
+        return text
+
+
+class LogStoreHandler(logging.Handler):
+    """
+    Write records into a LogStore.
+    Log with `extra={"task": name}` to mark the start of a task.
+    """
+
+    def __init__(self, store, level=logging.NOTSET):
+        super().__init__(level=level)
+        self.store = store
+        self._exc_formatter = logging.Formatter()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            exc = None
+            if record.exc_info and record.exc_info != (None, None, None):
+                exc = self._exc_formatter.formatException(record.exc_info)
+            self.store.append(
+                level=record.levelname,
+                message=record.getMessage(),
+                task=getattr(record, "task", None),
+                created=record.created,
+                exc=exc,
+            )
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        self.store.close()
+        super().close()
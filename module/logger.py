@@ -13,6 +13,8 @@ from rich.style import Style
 from rich.theme import Theme
 from rich.traceback import Traceback
 
+from module.log_store import LogStore, LogStoreHandler
+
 
 def empty_function(*args, **kwargs):
     pass
@@ -211,9 +213,20 @@ def set_file_logger(name=pyw_name, clear_on_start=False):
     )
     hdlr.setFormatter(file_formatter)
 
-    logger.handlers = [h for h in logger.handlers if not isinstance(h, logging.FileHandler | RichFileHandler)]
+    # Structured records next to the text log, for fast tail and seeking to task start
+    store = LogStore(os.path.splitext(log_file)[0])
+    store_hdlr = LogStoreHandler(store)
+
+    for h in logger.handlers:
+        if isinstance(h, LogStoreHandler):
+            h.close()
+    logger.handlers = [
+        h for h in logger.handlers if not isinstance(h, logging.FileHandler | RichFileHandler | LogStoreHandler)
+    ]
     logger.addHandler(hdlr)
+    logger.addHandler(store_hdlr)
     logger.log_file = log_file
+    logger.log_store = store
 
 
 def set_func_logger(func):
@@ -300,7 +313,8 @@ def hr(title, level=3):
     if level == 3:
         logger.info(f"[bold]<<< {title} >>>[/bold]", extra={"markup": True})
     if level == 0:
-        logger.info("=" * 79)
+        # Mark task start in log store
+        logger.info("=" * 79, extra={"task": title})
         logger.info(f"{title:^79}")
         logger.info("=" * 79)
 
@@ -353,6 +367,7 @@ logger.set_func_logger = set_func_logger
 logger.rule = rule
 logger.print = print
 logger.log_file: str
+logger.log_store: LogStore
 
 logger.set_file_logger()
 logger.hr("Start", level=0)
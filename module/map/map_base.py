@@ -3,8 +3,9 @@ import copy
 from module.base.utils import location2node, node2location
 from module.logger import logger
 from module.map.map_grids import SelectedGrids
+from module.map.map_path import MapPathFinder
 from module.map.utils import *
-from module.map_detection.grid_info import GridInfo
+from module.map_detection.grid_info import GridInfo, GridState
 
 
 class CampaignMap:
@@ -12,6 +13,8 @@ class CampaignMap:
         self.name = name
         self.grid_class = GridInfo
         self.grids = {}
+        # Version of grids in this map, see GridInfo.state_version
+        self.grid_state = GridState()
         self._shape = (0, 0)
         self._map_data = ""
         self._map_data_loop = ""
@@ -35,6 +38,8 @@ class CampaignMap:
         self.poor_map_data = False
         self.camera_sight = (-3, -1, 3, 2)
         self.grid_connection = {}
+        self._path_finder = None
+        self._all_grids = None
 
     def __iter__(self):
         return iter(self.grids.values())
@@ -70,6 +75,7 @@ class CampaignMap:
         for y in range(self._shape[1] + 1):
             for x in range(self._shape[0] + 1):
                 grid = self.grid_class()
+                grid.grid_state = self.grid_state
                 grid.location = (x, y)
                 self.grids[(x, y)] = grid
 
@@ -302,6 +308,8 @@ class CampaignMap:
                 self[start].is_portal = False
                 self[start].portal_link = None
 
+        # Connections changed, re-build path finder on next use
+        self._path_finder = None
         return True
 
     def show(self):
@@ -528,6 +536,16 @@ class CampaignMap:
             )
             logger.info(text)
 
+    @property
+    def path_finder(self):
+        """
+        Returns:
+            MapPathFinder: Built from `grid_connection`, cached until `grid_connection_initial()` is called again.
+        """
+        if self._path_finder is None:
+            self._path_finder = MapPathFinder(self.grid_connection)
+        return self._path_finder
+
     def find_path_initial(self, location, has_ambush=True, has_enemy=True):
         """
         Args:
@@ -537,35 +555,17 @@ class CampaignMap:
         """
         location = location_ensure(location)
         ambush_cost = 10 if has_ambush else 1
-        for grid in self:
-            grid.cost = 9999
-            grid.connection = None
-        start = self[location]
-        start.cost = 0
-        visited = [start]
-        visited = set(visited)
-
-        while 1:
-            new = visited.copy()
-            for grid in visited:
-                for arr in self.grid_connection[grid.location]:
-                    arr = self[arr]
-                    if arr.is_land or arr.is_mechanism_block:
-                        continue
-                    cost = ambush_cost if arr.may_ambush else 1
-                    cost += grid.cost
-
-                    if cost < arr.cost:
-                        arr.cost = cost
-                        arr.connection = grid.location
-                    elif cost == arr.cost:
-                        if abs(arr.location[0] - grid.location[0]) == 1:
-                            arr.connection = grid.location
-                    if arr.is_sea or not has_enemy:
-                        new.add(arr)
-            if len(new) == len(visited):
-                break
-            visited = new
+        finder = self.path_finder
+        grids = [self.grids[loca] for loca in finder.locations]
+        passable = tuple(not (grid.is_land or grid.is_mechanism_block) for grid in grids)
+        expandable = tuple(grid.is_sea or not has_enemy for grid in grids)
+        step_cost = tuple(ambush_cost if grid.may_ambush else 1 for grid in grids)
+        costs, previous = finder.solve(location, passable=passable, expandable=expandable, step_cost=step_cost)
+
+        locations = finder.locations
+        for grid, cost, prev in zip(grids, costs, previous):
+            grid.cost = cost
+            grid.connection = locations[prev] if prev >= 0 else None
 
         # self.show_cost()
         # self.show_connection()
@@ -794,6 +794,18 @@ class CampaignMap:
                     logger.info(f"Predict {location2node(upper.location)} to be enemy")
                     upper.__setattr__("is_enemy", True)
 
+    @property
+    def all_grids(self):
+        """
+        Returns:
+            SelectedGrids: All grids, re-created when any grid changes,
+                so its column cache is shared among `select()` calls on an unchanged map.
+        """
+        key = (id(self.grids), self.grid_state.version)
+        if self._all_grids is None or self._all_grids[0] != key:
+            self._all_grids = (key, SelectedGrids(list(self.grids.values())))
+        return self._all_grids[1]
+
     def select(self, **kwargs):
         """
         Args:
@@ -802,16 +814,7 @@ class CampaignMap:
         Returns:
             SelectedGrids:
         """
-        result = []
-        for grid in self:
-            flag = True
-            for k, v in kwargs.items():
-                if grid.__getattribute__(k) != v:
-                    flag = False
-            if flag:
-                result.append(grid)
-
-        return SelectedGrids(result)
+        return self.all_grids.select_equal(**kwargs)
 
     def to_selected(self, grids):
         """
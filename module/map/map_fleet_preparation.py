@@ -1,5 +1,4 @@
 import numpy as np
-from scipy import signal
 
 from module.base.button import Button
 from module.base.timer import Timer
@@ -125,7 +124,7 @@ class FleetOperator:
         image = color_similarity_2d(self.main.image_crop(area, copy=False), color=(249, 199, 0))
         height = cv2.reduce(image, 1, cv2.REDUCE_AVG).flatten()
         parameters = {"height": 180, "distance": 5}
-        peaks, _ = signal.find_peaks(height, **parameters)
+        peaks, _ = find_peaks(height, **parameters)
         lines = len(peaks)
         # logger.attr('Light_orange_line', lines)
         return lines > 0
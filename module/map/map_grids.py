@@ -1,11 +1,133 @@
 import operator
 import typing as t
 
+import numpy as np
+
+from module.map_detection.grid_info import GridState
+
+# Attribute types that can be stored in a typed numpy column
+_NUMERIC_TYPES = {bool: np.bool_, int: np.int64, float: np.float64}
+
+
+def _not_equal(value, other, strict=True):
+    """
+    Whether a grid attribute doesn't match the expected value, the same as `SelectedGrids.select()`.
+    """
+    if strict and type(value) != type(other):
+        return True
+    return value != other
+
+
+class GridColumns:
+    """
+    Columnar cache of grid attributes, for vectorized queries on SelectedGrids.
+
+    Values of each attribute are read once and stored as a numpy column,
+    columns are dropped when any grid changes, see `GridInfo.state_version`.
+    """
+
+    def __init__(self, grids, state, version):
+        """
+        Args:
+            grids (list): Grids sharing the same `grid_state`.
+            state (GridState): `GridInfo.grid_state` of all grids.
+            version (int): `state.version` when columns are built.
+        """
+        self.grids = grids
+        self.size = len(grids)
+        self.state = state
+        self.version = version
+        # Key: attribute name. Value: list of values
+        self.values: t.Dict[str, list] = {}
+        # Key: attribute name. Value: typed numpy column, or None if values are not all bool, int or float
+        self.arrays: t.Dict[str, t.Optional[np.ndarray]] = {}
+        self.types: t.Dict[str, t.Optional[type]] = {}
+        self._location: t.Optional[np.ndarray] = None
+
+    def column(self, attr):
+        """
+        Args:
+            attr (str): Attribute name.
+
+        Returns:
+            list: Values of each grid.
+        """
+        try:
+            return self.values[attr]
+        except KeyError:
+            pass
+
+        values = [grid.__getattribute__(attr) for grid in self.grids]
+        array, typ = None, None
+        if values:
+            typ = type(values[0])
+            if typ in _NUMERIC_TYPES and all(type(value) is typ for value in values):
+                try:
+                    array = np.array(values, dtype=_NUMERIC_TYPES[typ])
+                except OverflowError:
+                    pass
+            if array is None:
+                typ = None
+
+        self.values[attr] = values
+        self.arrays[attr] = array
+        self.types[attr] = typ
+        return values
+
+    def match(self, attr, value, strict=True):
+        """
+        Args:
+            attr (str): Attribute name.
+            value: Expected value.
+            strict (bool): True to match types as well, as `SelectedGrids.select()` does.
+                False to compare values by `!=` only, as `CampaignMap.select()` does.
+
+        Returns:
+            np.ndarray: Boolean mask of matched grids.
+        """
+        values = self.column(attr)
+        array = self.arrays[attr]
+        if array is not None and type(value) in _NUMERIC_TYPES:
+            if strict and type(value) is not self.types[attr]:
+                return np.zeros(self.size, dtype=bool)
+            try:
+                return array == value
+            except OverflowError:
+                pass
+
+        return np.fromiter(
+            (not _not_equal(v, value, strict=strict) for v in values), dtype=bool, count=self.size)
+
+    def mask(self, kwargs, strict=True):
+        """
+        Args:
+            kwargs (dict): Attributes of Grid.
+            strict (bool):
+
+        Returns:
+            np.ndarray: Boolean mask of grids matching all attributes.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for k, v in kwargs.items():
+            mask &= self.match(k, v, strict=strict)
+        return mask
+
+    @property
+    def location(self):
+        """
+        Returns:
+            np.ndarray: Shape (n, 2), grid locations.
+        """
+        if self._location is None:
+            self._location = np.array(self.column('location')).reshape(-1, 2)
+        return self._location
+
 
 class SelectedGrids:
     def __init__(self, grids):
         self.grids = grids
         self.indexes: dict[tuple, SelectedGrids] = {}
+        self._columns: t.Optional[GridColumns] = None
 
     def __iter__(self):
         return iter(self.grids)
@@ -64,6 +186,45 @@ class SelectedGrids:
         """
         return len(self.grids)
 
+    @property
+    def columns(self):
+        """
+        Returns:
+            GridColumns: Column cache of current grid states,
+                or None if grids don't share the same `grid_state` so changes can't be known.
+        """
+        grids = self.grids
+        if not grids:
+            return None
+        state = getattr(grids[0], 'grid_state', None)
+        if not isinstance(state, GridState):
+            return None
+        version = state.version
+
+        columns = self._columns
+        if columns is not None and columns.state is state and columns.version == version \
+                and columns.size == len(grids):
+            return columns
+        # A grid leaving `grid_state` updates it, so checking once on build is enough
+        if not all(getattr(grid, 'grid_state', None) is state for grid in grids):
+            return None
+        columns = GridColumns(grids, state, version)
+        self._columns = columns
+        return columns
+
+    def _select(self, kwargs, strict=True):
+        if not kwargs:
+            return SelectedGrids(list(self.grids))
+        columns = self.columns
+        if columns is None:
+            return SelectedGrids([
+                grid for grid in self.grids
+                if not any(_not_equal(grid.__getattribute__(k), v, strict=strict) for k, v in kwargs.items())
+            ])
+
+        grids = self.grids
+        return SelectedGrids([grids[i] for i in np.flatnonzero(columns.mask(kwargs, strict=strict))])
+
     def select(self, **kwargs):
         """
         Args:
@@ -72,16 +233,34 @@ class SelectedGrids:
         Returns:
             SelectedGrids:
         """
+        return self._select(kwargs, strict=True)
+
+    def select_equal(self, **kwargs):
+        """
+        Another `select()` method, but compares values only, so `1` matches `True`.
+
+        Args:
+            **kwargs: Attributes of Grid.
+
+        Returns:
+            SelectedGrids:
+        """
+        return self._select(kwargs, strict=False)
+
+    def select_count(self, **kwargs):
+        """
+        Equivalent to `select(**kwargs).count` without creating new SelectedGrids.
 
-        def matched(obj):
-            flag = True
-            for k, v in kwargs.items():
-                obj_v = obj.__getattribute__(k)
-                if type(obj_v) != type(v) or obj_v != v:
-                    flag = False
-            return flag
+        Args:
+            **kwargs: Attributes of Grid.
 
-        return SelectedGrids([grid for grid in self.grids if matched(grid)])
+        Returns:
+            int:
+        """
+        columns = self.columns
+        if columns is None:
+            return self.select(**kwargs).count
+        return int(np.count_nonzero(columns.mask(kwargs)))
 
     def create_index(self, *attrs):
         indexes = {}
@@ -112,15 +291,25 @@ class SelectedGrids:
             SelectedGrids:
         """
         right.create_index(*on_attr)
+        indexes = right.indexes
+        get_key = operator.attrgetter(*on_attr)
+        get_value = operator.attrgetter(*set_attr)
+        single_key = len(on_attr) == 1
+        single_value = len(set_attr) == 1
+        defaults = (default,) * len(set_attr)
         for grid in self:
-            attr_value = tuple([grid.__getattribute__(attr) for attr in on_attr])
-            right_grid = right.indexed_select(*attr_value).first_or_none()
-            if right_grid is not None:
-                for attr in set_attr:
-                    grid.__setattr__(attr, right_grid.__getattribute__(attr))
+            key = get_key(grid)
+            if single_key:
+                key = (key,)
+            right_grids = indexes.get(key)
+            if right_grids is not None:
+                values = get_value(right_grids.grids[0])
+                if single_value:
+                    values = (values,)
             else:
-                for attr in set_attr:
-                    grid.__setattr__(attr, default)
+                values = defaults
+            for attr, value in zip(set_attr, values):
+                grid.__setattr__(attr, value)
 
         return self
 
@@ -271,14 +460,17 @@ class SelectedGrids:
         Returns:
             SelectedGrids:
         """
-        import numpy as np
-
         if not self:
             return self
-        location = np.array(self.location)
+        columns = self.columns
+        if columns is not None:
+            location = columns.location
+        else:
+            location = np.array(self.location)
         diff = np.sum(np.abs(location - camera), axis=1)
         # grids = [x for _, x in sorted(zip(diff, self.grids))]
-        grids = tuple(np.array(self.grids)[np.argsort(diff)])
+        grids = self.grids
+        grids = tuple(grids[i] for i in np.argsort(diff))
         return SelectedGrids(grids)
 
     def sort_by_clock_degree(self, center=(0, 0), start=(0, 1), clockwise=True):
@@ -291,8 +483,6 @@ class SelectedGrids:
         Returns:
             SelectedGrids:
         """
-        import numpy as np
-
         if not self:
             return self
         vector = np.subtract(self.location, center)
@@ -329,7 +519,7 @@ class RoadGrids:
         """
         grids = []
         for block in self.grids:
-            if block.count == block.select(is_enemy=True).count:
+            if block.count == block.select_count(is_enemy=True):
                 grids += block.grids
         return SelectedGrids(grids)
 
@@ -344,7 +534,7 @@ class RoadGrids:
                 continue
             if any([grid.is_cleared for grid in block]):
                 continue
-            if block.count - block.select(is_enemy=True).count == 1:
+            if block.count - block.select_count(is_enemy=True) == 1:
                 grids += block.select(is_enemy=True).grids
         return SelectedGrids(grids)
 
@@ -359,7 +549,7 @@ class RoadGrids:
                 continue
             if any([grid.is_cleared for grid in block]):
                 continue
-            if block.select(is_enemy=True).count >= 1:
+            if block.select_count(is_enemy=True) >= 1:
                 grids += block.select(is_enemy=True).grids
         return SelectedGrids(grids)
 
@@ -0,0 +1,87 @@
+import heapq
+from collections import OrderedDict
+
+
+class MapPathFinder:
+    """
+    Dijkstra shortest path on campaign maps.
+
+    Adjacency is built once from `CampaignMap.grid_connection`,
+    results are cached by start and grid states,
+    so solving again on an unchanged map costs nothing.
+    """
+
+    def __init__(self, grid_connection, cache_size=16):
+        """
+        Args:
+            grid_connection (dict[tuple, set[tuple]]): Key: grid location, value: connected grid locations.
+            cache_size (int): Max number of results to keep.
+        """
+        self.locations = sorted(grid_connection.keys())
+        self.index = {location: i for i, location in enumerate(self.locations)}
+        self.neighbors = []
+        self.horizontal = []
+        for location in self.locations:
+            neighbors = [link for link in sorted(grid_connection[location]) if link in self.index]
+            self.neighbors.append([self.index[link] for link in neighbors])
+            # Prefer horizontal moves when costs are equal
+            self.horizontal.append([abs(link[0] - location[0]) == 1 for link in neighbors])
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.locations)
+
+    def solve(self, start, passable, expandable, step_cost):
+        """
+        Args:
+            start (tuple): Start location.
+            passable (tuple[bool]): If fleet can enter each grid, ordered as `self.locations`.
+            expandable (tuple[bool]): If fleet can move through each grid.
+                Start grid is always expandable.
+            step_cost (tuple[int]): Cost to enter each grid.
+
+        Returns:
+            tuple[list[int], list[int]]: Cost of each grid, 9999 if unreachable.
+                Index of previous grid on path, -1 if none.
+        """
+        key = (start, passable, expandable, step_cost)
+        try:
+            result = self._cache[key]
+            self._cache.move_to_end(key)
+            return result
+        except KeyError:
+            pass
+
+        result = self._dijkstra(self.index[start], passable, expandable, step_cost)
+        self._cache[key] = result
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _dijkstra(self, start, passable, expandable, step_cost):
+        n = len(self.locations)
+        costs = [9999] * n
+        previous = [-1] * n
+        done = [False] * n
+        costs[start] = 0
+        queue = [(0, start)]
+        while queue:
+            cost, node = heapq.heappop(queue)
+            if done[node]:
+                continue
+            done[node] = True
+            if node != start and not expandable[node]:
+                continue
+            for link, horizontal in zip(self.neighbors[node], self.horizontal[node]):
+                if not passable[link]:
+                    continue
+                new = cost + step_cost[link]
+                if new < costs[link]:
+                    costs[link] = new
+                    previous[link] = node
+                    heapq.heappush(queue, (new, link))
+                elif new == costs[link] and horizontal and link != start:
+                    previous[link] = node
+
+        return costs, previous
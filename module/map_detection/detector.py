@@ -54,3 +54,11 @@ class MapDetector:
         self.lower_edge = bool(self.backend.lower_edge)
         self.upper_edge = bool(self.backend.upper_edge)
         self.generate = self.backend.generate
+
+    def expect_swipe(self, vector):
+        """
+        Args:
+            vector (tuple, np.ndarray): Expected camera movement in grids, (x, y).
+        """
+        if isinstance(self.backend, Homography):
+            self.backend.expect_swipe(vector)
@@ -1,6 +1,33 @@
+from itertools import count
+
 from module.base.utils import location2node
 
 
+_MISSING = object()
+# Values of these types are compared by `==` to tell if an attribute changed
+_SCALAR_TYPES = frozenset([bool, int, float, str, tuple, type(None)])
+# Versions are drawn from a counter, so they stay unique when grids are predicted on threads
+_STATE_COUNTER = count(1)
+_setattr = object.__setattr__
+
+
+class GridState:
+    """
+    Version of grid attributes, shared by a group of grids, usually all grids of a CampaignMap.
+    It changes when any attribute of any grid in the group changes,
+    so SelectedGrids of these grids know when to drop their column caches,
+    and grids of other maps are not affected.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self):
+        self.version = next(_STATE_COUNTER)
+
+    def update(self):
+        self.version = next(_STATE_COUNTER)
+
+
 class GridInfo:
     """
     Class that gather basic information of a grid in map_v1.
@@ -75,6 +102,40 @@ class GridInfo:
 
     location = None
 
+    # Grids not attached to a map share this state.
+    # CampaignMap sets its own, so changes on other grids don't drop its caches.
+    grid_state = GridState()
+
+    @property
+    def state_version(self):
+        """
+        Returns:
+            int: Changed when any attribute of any grid in the same `grid_state` changes.
+        """
+        return self.grid_state.version
+
+    def __setattr__(self, key, value):
+        old = self.__dict__.get(key, _MISSING)
+        if old is _MISSING:
+            # Setting a class default on the instance doesn't change anything
+            old = getattr(type(self), key, _MISSING)
+        if old is value:
+            _setattr(self, key, value)
+            return
+        typ = type(value)
+        if typ is type(old) and typ in _SCALAR_TYPES and old == value:
+            _setattr(self, key, value)
+            return
+        self.grid_state.version = next(_STATE_COUNTER)
+        _setattr(self, key, value)
+        if key == "grid_state":
+            # Joined another group
+            value.update()
+
+    def __delattr__(self, item):
+        self.grid_state.update()
+        object.__delattr__(self, item)
+
     def decode(self, text):
         text = text.upper()
         dic = {
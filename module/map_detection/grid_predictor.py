@@ -42,6 +42,12 @@ class GridPredictor:
         )
         self.homo_invt = cv2.invert(self.homo_data)[1]
 
+        # Resized crops of current image, see relative_crop()
+        self._crop_image = None
+        self._crop_cache = {}
+        # Results of predict_enemy_genre_batch(), (image, {template name: bool})
+        self._enemy_genre_matched = None
+
     def screen2grid(self, points):
         """
         Args:
@@ -119,12 +125,24 @@ class GridPredictor:
 
         Returns:
             np.ndarray: Shape (height, width, channel).
+                Resized crops are cached until image changes, don't modify them in place.
         """
+        if shape is not None:
+            if self._crop_image is not self.image:
+                self._crop_image = self.image
+                self._crop_cache = {}
+            key = (tuple(area), tuple(shape))
+            try:
+                return self._crop_cache[key]
+            except KeyError:
+                pass
+
         area = self._image_center + np.array(area) * self._image_a
         image = crop(self.image, area=np.rint(area).astype(int), copy=False)
         if shape is not None:
             # Follow the default re-sampling filter in pillow, which is BICUBIC.
             image = cv2.resize(image, shape, interpolation=cv2.INTER_CUBIC)
+            self._crop_cache[key] = image
         return image
 
     def relative_rgb_count(self, area, color, shape=(50, 50), threshold=221):
@@ -155,8 +173,8 @@ class GridPredictor:
         Returns:
             int: Number of matched pixels.
         """
-        image = self.relative_crop(area, shape=shape)
-        cv2.cvtColor(image, cv2.COLOR_RGB2HSV, dst=image)
+        # Don't set `dst`, crop is cached
+        image = cv2.cvtColor(self.relative_crop(area, shape=shape), cv2.COLOR_RGB2HSV)
         lower = (h[0] / 2, s[0] * 2.55, v[0] * 2.55)
         upper = (h[1] / 2 + 1, s[1] * 2.55 + 1, v[1] * 2.55 + 1)
         # Don't set `dst`, output image is (50, 50) but `image` is (50, 50, 3)
@@ -202,9 +220,16 @@ class GridPredictor:
                 if TEMPLATE_ENEMY_BOSS.match(image, similarity=0.7):
                     return "Siren_Siren"
 
+        matched = None
+        if self._enemy_genre_matched is not None and self._enemy_genre_matched[0] is self.image:
+            matched = self._enemy_genre_matched[1]
         image_dic = {}
         scaling_dic = self.config.MAP_ENEMY_GENRE_DETECTION_SCALING
         for name, template in self.template_enemy_genre.items():
+            if matched is not None and name in matched:
+                if matched[name]:
+                    return name
+                continue
             if template is None:
                 logger.warning(f"Enemy detection template not found: {name}")
                 logger.warning(
@@ -226,6 +251,52 @@ class GridPredictor:
 
         return None
 
+    @classmethod
+    def predict_enemy_genre_batch(cls, grids):
+        """
+        Match enemy genre templates on all grids at once, results are used in `predict_enemy_genre()`.
+        Crops of all grids are stacked, so each template is matched in one call instead of one call per grid.
+
+        Args:
+            grids (list[GridPredictor]): Grids having the same config and image.
+        """
+        if not grids:
+            return
+        templates = grids[0].template_enemy_genre
+        if None in templates.values():
+            # Let predict_enemy_genre() raise the error
+            return
+
+        config = grids[0].config
+        scaling_dic = config.MAP_ENEMY_GENRE_DETECTION_SCALING
+        stacks = {}
+        matched = [{} for _ in grids]
+        for name, template in templates.items():
+            short_name = name[6:] if name.startswith("Siren_") else name
+            scaling = scaling_dic.get(short_name, 1)
+            scaling = (scaling,) if not isinstance(scaling, tuple) else scaling
+            result = np.zeros(len(grids), dtype=bool)
+            for scale in scaling:
+                if scale not in stacks:
+                    shape = tuple(np.round(np.array((60, 60)) * scale).astype(int))
+                    stacks[scale] = np.stack(
+                        [rgb2gray(grid.relative_crop((-0.5, -1, 0.5, 0), shape=shape)) for grid in grids]
+                    )
+
+                res = template.match_stacked(stacks[scale], similarity=config.MAP_ENEMY_GENRE_SIMILARITY)
+                if res is None:
+                    # Template larger than crop, leave it to predict_enemy_genre()
+                    result = None
+                    break
+                result |= res
+
+            if result is not None:
+                for dic, res in zip(matched, result):
+                    dic[name] = bool(res)
+
+        for grid, dic in zip(grids, matched):
+            grid._enemy_genre_matched = (grid.image, dic)
+
     def predict_boss(self):
         if self.enemy_genre == "Siren_Siren":
             return False
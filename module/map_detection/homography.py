@@ -55,6 +55,9 @@ class Homography:
 
     map_inner: np.ndarray
     _map_edge_count: tuple
+    # homo_loca of last successful detection, and the expected camera movement since then, in grids.
+    _track_loca: np.ndarray = None
+    _track_vector: np.ndarray = None
 
     def __init__(self, config):
         """
@@ -127,8 +130,8 @@ class Homography:
             src_pts (list[tuple]): [upper-left, upper-right, bottom-left, bottom-right]
             overflow (bool): True if get full transformed image, false if get valid area only.
         """
-        self.homo_storage = (size, [(x, y) for x, y in np.round(src_pts, 3)])
-        logger.attr("homo_storage", self.homo_storage)
+        homo_storage = (size, [(x, y) for x, y in np.round(src_pts, 3)])
+        logger.attr("homo_storage", homo_storage)
 
         # Generate perspective data
         src_pts = np.array(src_pts) - self.config.DETECTING_AREA[:2]
@@ -148,10 +151,36 @@ class Homography:
             size = np.ceil(inner[2:] - inner[:2]).astype(int)
         homo = cv2.getPerspectiveTransform(area.astype(np.float32), transformed.astype(np.float32))
 
-        self.homo_data = homo
-        self.homo_invt = cv2.invert(homo)[1]
-        self.homo_size = tuple(size.tolist())
+        self.load_homography(homo_storage, homo, cv2.invert(homo)[1], tuple(size.tolist()))
+
+    def load_homography(self, homo_storage, homo_data, homo_invt, homo_size):
+        """
+        Set homography calculated by find_homography(), such as the one restored from disk.
+        Free tile tracking of previous homography is dropped.
+
+        Args:
+            homo_storage (tuple): ((x, y), [upper-left, upper-right, bottom-left, bottom-right])
+            homo_data (np.ndarray):
+            homo_invt (np.ndarray):
+            homo_size (tuple): (x, y)
+        """
+        size, src_pts = homo_storage
+        self.homo_storage = (size, [(x, y) for x, y in np.round(src_pts, 3)])
+        self.homo_data = homo_data
+        self.homo_invt = homo_invt
+        self.homo_size = homo_size
         self.homo_loaded = True
+        self._track_loca = None
+        self._track_vector = None
+
+    def expect_swipe(self, vector):
+        """
+        Call this after swiping the map, the next detect() will search free tiles around the expected position first.
+
+        Args:
+            vector (tuple, np.ndarray): Expected camera movement in grids, (x, y).
+        """
+        self._track_vector = np.array(vector, dtype=float)
 
     def detect(self, image):
         """
@@ -178,20 +207,11 @@ class Homography:
         # Image.fromarray(image_edge, mode='L').show()
 
         # Find free tile
-        if self.search_tile_center(
-            image_edge,
-            threshold_good=self.config.HOMO_CENTER_GOOD_THRESHOLD,
-            threshold=self.config.HOMO_CENTER_THRESHOLD,
-        ):
-            pass
-        elif self.search_tile_corner(image_edge, threshold=self.config.HOMO_CORNER_THRESHOLD):
-            pass
-        elif self.search_tile_rectangle(image_edge, threshold=self.config.HOMO_RECTANGLE_THRESHOLD):
-            pass
-        else:
-            raise MapDetectionError("Failed to find a free tile")
+        self.search_tile(image_edge)
 
         self.homo_loca %= self.config.HOMO_TILE
+        self._track_loca = self.homo_loca.copy()
+        self._track_vector = None
 
         # Detect map edges
         self.lower_edge, self.upper_edge, self.left_edge, self.right_edge = False, False, False, False
@@ -220,6 +240,90 @@ class Homography:
             )
         )
 
+    def search_tile(self, image):
+        """
+        Search for free tiles, tracking from the last detection first, then on the entire image.
+
+        Args:
+            image (np.ndarray): Monochrome image.
+
+        Raises:
+            MapDetectionError: If failed to find a free tile.
+        """
+        if self.search_tile_track(
+            image,
+            threshold=self.config.HOMO_CENTER_GOOD_THRESHOLD,
+            radius=self.config.HOMO_TRACK_RADIUS,
+        ):
+            pass
+        elif self.search_tile_center(
+            image,
+            threshold_good=self.config.HOMO_CENTER_GOOD_THRESHOLD,
+            threshold=self.config.HOMO_CENTER_THRESHOLD,
+        ):
+            pass
+        elif self.search_tile_corner(image, threshold=self.config.HOMO_CORNER_THRESHOLD):
+            pass
+        elif self.search_tile_rectangle(image, threshold=self.config.HOMO_RECTANGLE_THRESHOLD):
+            pass
+        else:
+            raise MapDetectionError("Failed to find a free tile")
+
+    def search_tile_track(self, image, threshold=0.9, radius=15):
+        """
+        Search for the center of empty tile, around the expected positions only.
+        Camera swipes translate the view on sea surface,
+        so tiles are at the previous position moved by the swipe, or stay still if swipe didn't take effect.
+        This is much faster than searching the entire image, but accepts good matches only.
+
+        Args:
+            image (np.ndarray): Monochrome image.
+            threshold (float):
+            radius (int): Search distance from the expected positions, in pixel.
+
+        Returns:
+            bool: If success.
+        """
+        if not radius or self._track_loca is None:
+            return False
+
+        tile = np.array(self.config.HOMO_TILE)
+        expected = [self._track_loca]
+        if self._track_vector is not None:
+            # Lattice moves to the opposite direction of camera
+            expected.insert(0, self._track_loca - self._track_vector * tile)
+        # Upper-left of the first search window.
+        # Positions are the same modulo tile if swiped by whole grids, search them once.
+        origins = []
+        for point in expected:
+            origin = tuple(np.round(point + self.config.HOMO_CENTER_OFFSET - radius).astype(int) % tile)
+            if origin not in origins:
+                origins.append(origin)
+        template = ASSETS.tile_center_image
+        t_h, t_w = template.shape[:2]
+        h, w = image.shape[:2]
+        similarity, loca = 0, None
+        for x0, y0 in origins:
+            for y in range(y0, h - t_h - 2 * radius + 1, tile[1]):
+                for x in range(x0, w - t_w - 2 * radius + 1, tile[0]):
+                    window = image[y:y + t_h + 2 * radius, x:x + t_w + 2 * radius]
+                    result = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+                    _, sim, _, (dx, dy) = cv2.minMaxLoc(result)
+                    if sim > similarity:
+                        similarity, loca = sim, (x + dx, y + dy)
+            if similarity > threshold:
+                break
+
+        if similarity > threshold:
+            self.homo_loca = np.array(loca) - self.config.HOMO_CENTER_OFFSET
+            self.map_inner = np.array(loca)
+            message = "good match"
+        else:
+            message = "bad match"
+
+        logger.attr_align("tile_track", f"{float2str(similarity)} ({message})")
+        return message != "bad match"
+
     def search_tile_center(self, image, threshold_good=0.9, threshold=0.8, encourage=1.0):
         """
         Search for the center of empty tile.
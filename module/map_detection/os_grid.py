@@ -219,6 +219,11 @@ class OSGridPredictor(GridPredictor):
         "LoggingTower": TEMPLATE_LoggingTowerUpper,
     }
 
+    @classmethod
+    def predict_enemy_genre_batch(cls, grids):
+        # OS has its own enemy templates, `template_enemy_genre` is not used
+        pass
+
     def predict_enemy_genre(self):
         image = rgb2gray(self.relative_crop((-0.5, -1, 0.5, 0), shape=(60, 60)))
         for name, template in self._os_template_enemy.items():
@@ -50,6 +50,15 @@ class Perspective:
     vanish_point: tuple
     distant_point: tuple
     map_inner: np.ndarray
+    # Results of last successful load, (search range, result, score)
+    # Perspective doesn't change when camera moves on sea surface, so they are good initial guesses.
+    _vanish_point_prev = None
+    _distant_point_prev = None
+
+    # Number of grid points on each axis in optimize.brute(), same as its default
+    BRUTE_NS = 20
+    # Max increase of score to accept the warm started search, in log10 of distance per line
+    WARM_START_TOLERANCE = 0.5
 
     def __init__(self, config):
         """
@@ -119,8 +128,20 @@ class Perspective:
 
         # Calculate perspective
         self.crossings = self.horizontal.cross(self.vertical)
-        self.vanish_point = optimize.brute(self._vanish_point_value, self.config.VANISH_POINT_RANGE)
-        distance_point_x = optimize.brute(self._distant_point_value, self.config.DISTANCE_POINT_X_RANGE)[0]
+        self.vanish_point, vanish_point_score = self._solve(
+            self._vanish_point_value,
+            self.config.VANISH_POINT_RANGE,
+            self._vanish_point_prev,
+            size=len(self.vertical),
+            guess=self._vanish_point_lstsq(),
+        )
+        distant_point, distant_point_score = self._solve(
+            self._distant_point_value,
+            self.config.DISTANCE_POINT_X_RANGE,
+            self._distant_point_prev,
+            size=len(self.crossings) - 1,
+        )
+        distance_point_x = distant_point[0]
         self.distant_point = (distance_point_x, self.vanish_point[1])
         logger.attr_align("vanish_point", point2str(*self.vanish_point, length=5))
         logger.attr_align("distant_point", point2str(*self.distant_point, length=5))
@@ -150,6 +171,12 @@ class Perspective:
         # print(self.vertical)
         # print(self.left_edge, self.right_edge)
 
+        # Keep results for next load, after all detections succeeded
+        self._vanish_point_prev = (
+            self.config.VANISH_POINT_RANGE, np.array(self.vanish_point), vanish_point_score)
+        self._distant_point_prev = (
+            self.config.DISTANCE_POINT_X_RANGE, np.array(self.distant_point[:1]), distant_point_score)
+
         # Log
         time_cost = round(time.time() - start_time, 3)
         logger.info(
@@ -283,6 +310,62 @@ class Perspective:
         image.show()
         # image.save('123.png')
 
+    def _solve(self, func, ranges, prev, size, guess=None):
+        """
+        Minimize `func` within `ranges`.
+        Local search starting from the previous result and the given guess.
+        Result is accepted if it's within one grid step of brute search from the previous result,
+        and its score is not worse than the previous score by `WARM_START_TOLERANCE`.
+        A local search starting at a wrong place stops at a local minimum made by a few wrong lines,
+        which scores much worse than a point where most lines meet.
+        Otherwise, perspective changed or first run, fallback to brute search over the entire range.
+
+        Args:
+            func (callable): Function to minimize.
+            ranges (tuple[tuple]): Search range of each dimension, such as ((540, 740), (-3000, -1000)).
+            prev (tuple): Previous (ranges, result, score), or None.
+            size (int): Number of terms summed in `func`, to compare scores between different number of lines.
+            guess (np.ndarray): Additional initial guess.
+
+        Returns:
+            np.ndarray: Result with shape (n,).
+            float: Score, value of `func` per term.
+        """
+        size = max(size, 1)
+        lower, upper = np.array(ranges, dtype=float).T
+        step = (upper - lower) / (self.BRUTE_NS - 1)
+        if prev is not None and prev[0] == ranges:
+            last, last_score = prev[1], prev[2]
+            starts = [last]
+            if guess is not None and np.all(guess >= lower) and np.all(guess <= upper):
+                starts.append(guess)
+            best, best_value = None, None
+            for start in starts:
+                result, value = optimize.fmin(func, start, full_output=True, disp=False)[:2]
+                if best_value is None or value < best_value:
+                    best, best_value = result, value
+            score = best_value / size
+            if np.all(np.abs(best - last) <= step) and score <= last_score + self.WARM_START_TOLERANCE:
+                return best, score
+
+        result = np.atleast_1d(optimize.brute(func, ranges, Ns=self.BRUTE_NS))
+        return result, func(result) / size
+
+    def _vanish_point_lstsq(self):
+        """
+        Least squares intersection of vertical lines.
+
+        Returns:
+            np.ndarray: (x, y), or None if not enough lines.
+        """
+        if len(self.vertical) < 2:
+            return None
+        a = np.stack([self.vertical.cos, self.vertical.sin], axis=1)
+        point, _, rank, _ = np.linalg.lstsq(a, self.vertical.rho, rcond=None)
+        if rank < 2:
+            return None
+        return point
+
     def _vanish_point_value(self, point):
         """Value that measures how close a point to the perspective vanish point. The smaller the better.
         Use log10 to encourage a group of coincident lines and discourage wrong lines.
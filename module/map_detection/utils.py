@@ -1,7 +1,11 @@
+import time
+from functools import wraps
+
 import numpy as np
 from scipy import optimize
 
 from module.base.utils import area_pad
+from module.device.method.pool import WORKER_POOL
 
 
 class Points:
@@ -393,3 +397,88 @@ def fit_points(points, mod, encourage=1):
     area = np.append(-mod - 10, mod + 10)
     result = optimize.brute(cal_distance, ((area[0], area[2]), (area[1], area[3])))
     return result % mod
+
+
+def _timed_predictor(func, name, timing):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timing[name] = timing.get(name, 0.) + time.perf_counter() - start
+
+    return wrapper
+
+
+def _predict_chunk(grids, timing):
+    """
+    Args:
+        grids (list): Grids to predict.
+        timing (dict | None): Dict to accumulate time cost of each predictor into.
+            None to predict without timing.
+    """
+    if timing is None:
+        for grid in grids:
+            grid.predict()
+        return
+
+    for grid in grids:
+        # Shadow `predict_*` methods on instance, `predict()` will call the timed ones
+        names = [name for name in dir(type(grid)) if name.startswith('predict_') and callable(getattr(grid, name))]
+        for name in names:
+            setattr(grid, name, _timed_predictor(getattr(grid, name), name, timing))
+        try:
+            _timed_predictor(grid.predict, 'predict', timing)()
+        finally:
+            for name in names:
+                delattr(grid, name)
+
+
+def predict_grids(grids, threads=1, timing=False):
+    """
+    Call `predict()` on each grid, on threads if `threads` > 1.
+
+    OpenCV releases GIL, so crop, resize and template matching of different grids run in parallel.
+    Each grid only writes attributes of its own, results are the same as predicting one by one.
+    Grids are dealt in turns to keep jobs balanced, if any job raises,
+    the error of the first job is raised after all jobs finished.
+
+    Args:
+        grids (Iterable): Objects having `predict()`.
+        threads (int): Number of jobs to split into.
+        timing (bool): True to measure time cost of each `predict_*` method.
+
+    Returns:
+        dict[str, float]: Total time cost of each predictor in seconds, summed over all grids.
+            Key 'predict' is the total time of `predict()`.
+            Empty if timing disabled.
+    """
+    grids = list(grids)
+    threads = max(min(threads, len(grids)), 1)
+
+    if threads == 1:
+        timing_list = [{} if timing else None]
+        _predict_chunk(grids, timing_list[0])
+    else:
+        timing_list = [{} if timing else None for _ in range(threads)]
+        jobs = [
+            WORKER_POOL.start_thread_soon(_predict_chunk, grids[index::threads], timing_list[index])
+            for index in range(threads)
+        ]
+        error = None
+        for job in jobs:
+            try:
+                job.get()
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+
+    result = {}
+    if timing:
+        for chunk_timing in timing_list:
+            for name, cost in chunk_timing.items():
+                result[name] = result.get(name, 0.) + cost
+    return result
@@ -102,9 +102,16 @@ class View(MapDetector):
         Predict grid info.
         """
         start_time = time.time()
-        for grid in self:
-            grid.predict()
+        self.grid_class.predict_enemy_genre_batch(list(self))
+        batch_cost = time.time() - start_time
+        timing = predict_grids(
+            self, threads=self.config.MAP_GRID_PREDICT_THREADS, timing=self.config.MAP_GRID_PREDICT_TIMING
+        )
+        if timing:
+            timing["predict_enemy_genre_batch"] = batch_cost
         logger.attr_align("predict", len(self.grids.keys()), front=float2str(time.time() - start_time) + "s")
+        for name, cost in sorted(timing.items(), key=lambda item: -item[1]):
+            logger.attr_align(name, float2str(cost) + "s")
 
     def update(self, image):
         """
@@ -0,0 +1,317 @@
+"""
+OCR backends with PaddleOCR interface compatibility.
+
+Backends are loaded lazily on first use instead of on import,
+so tasks that import `module.ocr.ocr` but don't do OCR won't pay the model loading.
+"""
+import threading
+
+from module.logger import logger
+
+
+def load_paddleocr():
+    """
+    Returns:
+        PaddleOCR: PaddleOCR 2.x, or PaddleOCR 3.x with its `predict()` wrapped as `ocr()`
+
+    Raises:
+        ImportError: If paddleocr not installed
+    """
+    from paddleocr import PaddleOCR
+
+    # Check if we have the newer PaddleOCR 3.x with predict method
+    try:
+        # Try PaddleOCR 3.x initialization (no use_gpu parameter)
+        model = PaddleOCR(lang='en')
+        has_predict = hasattr(model, 'predict')
+    except Exception:
+        # Fallback to PaddleOCR 2.x initialization
+        model = PaddleOCR(use_angle_cls=True, lang='en', show_log=False, use_gpu=False)
+        has_predict = False
+
+    if not has_predict:
+        # PaddleOCR 2.x - use original ocr() method
+        logger.info('Using PaddleOCR 2.x backend.')
+        return model
+
+    # PaddleOCR 3.x with new API
+    # Wrap the predict method to match the old ocr() interface
+    def format_result(res_dict):
+        # Convert new format to old format
+        formatted_result = []
+        texts = res_dict.get('rec_texts', [])
+        scores = res_dict.get('rec_scores', [])
+        polys = res_dict.get('rec_polys', [])
+
+        # Match the old ocr() output format: list of [bbox, (text, score)]
+        for i in range(len(texts)):
+            if i < len(polys) and i < len(scores):
+                bbox = polys[i].tolist() if hasattr(polys[i], 'tolist') else polys[i]
+                formatted_result.append([bbox, (texts[i], scores[i])])
+
+        return formatted_result if formatted_result else None
+
+    def ocr_wrapper(images, cls=True):
+        if not isinstance(images, list):
+            images = [images]
+        if not images:
+            return []
+
+        # predict() accepts a list and batches recognition internally,
+        # one call for all images is much faster than one call for each.
+        predict_results = list(model.predict(images))
+        if len(predict_results) == len(images):
+            return [format_result(res_dict) if res_dict else None for res_dict in predict_results]
+
+        # Unexpected output, predict one by one
+        results = []
+        for img in images:
+            predict_results = model.predict(img)
+            if predict_results and len(predict_results) > 0:
+                results.append(format_result(predict_results[0]))
+            else:
+                results.append(None)
+
+        return results
+
+    # Replace ocr method with wrapper
+    model.ocr = ocr_wrapper
+    # Add close method for compatibility
+    if not hasattr(model, 'close'):
+        model.close = lambda: None
+    logger.info('Using PaddleOCR 3.x with compatibility wrapper.')
+    return model
+
+
+class PaddleOCRCompatWrapper:
+    """EasyOCR wrapper that mimics PaddleOCR interface for ALAS compatibility."""
+
+    def __init__(self):
+        import easyocr
+
+        self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        self.name = 'EasyOCR-PaddleOCR-Compat'
+
+    def ocr(self, images, cls=True, **kwargs):
+        """
+        OCR with PaddleOCR-compatible interface.
+
+        Args:
+            images: Single image or list of images (numpy arrays)
+            cls: Angle classification (ignored for EasyOCR compatibility)
+
+        Returns:
+            List in PaddleOCR format: [result_per_image, ...]
+            Each result_per_image: [[[x1,y1],[x2,y2],[x3,y3],[x4,y4]], (text, confidence)]
+        """
+        # Handle single image
+        if not isinstance(images, list):
+            images = [images]
+
+        if len(images) > 1:
+            results = self.ocr_batched(images)
+            if results is not None:
+                return results
+
+        results = []
+        for image in images:
+            try:
+                # EasyOCR returns: [[[x1,y1],[x2,y2],[x3,y3],[x4,y4]], text, confidence]
+                easyocr_results = self.reader.readtext(image, detail=1)
+
+                # Convert to PaddleOCR format: [[[box]], (text, confidence)]
+                paddleocr_format = []
+                for detection in easyocr_results:
+                    box, text, confidence = detection
+                    paddleocr_format.append([box, (text, confidence)])
+
+                results.append(paddleocr_format if paddleocr_format else None)
+            except Exception as e:
+                logger.warning(f"EasyOCR processing failed: {e}")
+                results.append(None)
+
+        return results
+
+    def ocr_batched(self, images):
+        """
+        Pad images into the same size and recognize them in one batch.
+
+        Args:
+            images (list[np.ndarray]):
+
+        Returns:
+            list: The same as ocr(), or None if failed.
+        """
+        import numpy as np
+
+        height = max(image.shape[0] for image in images)
+        width = max(image.shape[1] for image in images)
+        padded = []
+        for image in images:
+            # Pre-processed images have white background, pad with white
+            shape = (height, width) + image.shape[2:]
+            background = np.full(shape, 255, dtype=image.dtype)
+            background[:image.shape[0], :image.shape[1]] = image
+            padded.append(background)
+
+        try:
+            batched_results = self.reader.readtext_batched(padded, detail=1)
+        except Exception as e:
+            logger.warning(f"EasyOCR batch processing failed: {e}")
+            return None
+        if len(batched_results) != len(images):
+            return None
+
+        results = []
+        for easyocr_results in batched_results:
+            paddleocr_format = [[box, (text, confidence)] for box, text, confidence in easyocr_results]
+            results.append(paddleocr_format if paddleocr_format else None)
+        return results
+
+    def close(self):
+        """Close method for compatibility with PaddleOCR interface."""
+        pass
+
+
+def load_easyocr():
+    model = PaddleOCRCompatWrapper()
+    logger.info('Using EasyOCR with PaddleOCR compatibility wrapper.')
+    return model
+
+
+class MinimalPaddleOCR:
+    """Minimal OCR that returns PaddleOCR-compatible empty results"""
+
+    def ocr(self, images, cls=True, **kwargs):
+        if not isinstance(images, list):
+            images = [images]
+        return [None] * len(images)  # PaddleOCR returns None for no text found
+
+    def close(self):
+        pass
+
+
+def load_minimal():
+    logger.warning('No OCR backend available - using minimal PaddleOCR-compatible fallback.')
+    return MinimalPaddleOCR()
+
+
+class OcrBackend:
+    """
+    A lazy proxy of OCR backend, having the same `ocr()` and `close()` interface as PaddleOCR.
+
+    Backends in `registry` are tried in order on first use,
+    the first one that can be imported is used.
+
+    Examples:
+        # Load models at background while emulator is connecting
+        OCR_MODEL.prewarm()
+        # Load models, or wait prewarm to finish
+        OCR_MODEL.ocr([image])
+        # Unload models, they will be loaded again on next use
+        OCR_MODEL.release()
+    """
+    # Key: backend name, value: function that returns a backend instance, or raises ImportError
+    registry = {
+        'paddleocr': load_paddleocr,
+        'easyocr': load_easyocr,
+        'minimal': load_minimal,
+    }
+
+    def __init__(self):
+        self._model = None
+        self._name = ''
+        self._lock = threading.Lock()
+        self._prewarm_thread: threading.Thread = None
+
+    @classmethod
+    def register(cls, name, loader, first=False):
+        """
+        Args:
+            name (str):
+            loader (callable): Function that returns a backend instance, or raises ImportError
+            first (bool): True to try this backend before others
+        """
+        if first:
+            cls.registry = {name: loader, **{k: v for k, v in cls.registry.items() if k != name}}
+        else:
+            cls.registry[name] = loader
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    @property
+    def name(self):
+        """
+        Returns:
+            str: Name of the loaded backend, or empty string if not loaded
+        """
+        return self._name
+
+    @property
+    def model(self):
+        """
+        Load backend on first access.
+        Thread safe, calls during loading will wait for it.
+        """
+        model = self._model
+        if model is not None:
+            return model
+        with self._lock:
+            if self._model is not None:
+                return self._model
+            for name, loader in self.registry.items():
+                try:
+                    model = loader()
+                except ImportError as e:
+                    logger.info(f'OCR backend {name} not available: {e}')
+                    continue
+                self._name = name
+                self._model = model
+                return model
+
+        # All failed, shouldn't happen since minimal backend doesn't import anything
+        raise ImportError('No OCR backend available')
+
+    def prewarm(self):
+        """
+        Load backend in a background thread, does nothing if loaded or loading.
+        """
+        if self.loaded:
+            return
+        thread = self._prewarm_thread
+        if thread is not None and thread.is_alive():
+            return
+
+        def prewarm_worker():
+            try:
+                _ = self.model
+            except Exception as e:
+                logger.warning(f'OCR backend prewarm failed: {e}')
+
+        logger.info('OCR backend prewarm')
+        thread = threading.Thread(target=prewarm_worker, name='OcrPrewarm', daemon=True)
+        self._prewarm_thread = thread
+        thread.start()
+
+    def release(self):
+        """
+        Unload backend, it will be loaded again on next use.
+        """
+        with self._lock:
+            if self._model is None:
+                return
+            logger.info(f'Release OCR backend: {self._name}')
+            try:
+                self._model.close()
+            except AttributeError:
+                pass
+            self._model = None
+            self._name = ''
+
+    def ocr(self, images, cls=True, **kwargs):
+        return self.model.ocr(images, cls=cls, **kwargs)
+
+    def close(self):
+        self.release()
@@ -0,0 +1,110 @@
+"""
+Content-addressed cache of OCR results.
+
+Many OCR reads (oil/coin counters, commission durations, stage names) read pixel-identical crops
+frame after frame, results are cached by the hash of the pre-processed crop and OCR config.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def image_digest(image):
+    """
+    Args:
+        image (np.ndarray):
+
+    Returns:
+        bytes: 16 bytes digest of image content and shape
+    """
+    image = np.ascontiguousarray(image)
+    digest = hashlib.blake2b(image.data, digest_size=16)
+    digest.update(str((image.shape, image.dtype.str)).encode())
+    return digest.digest()
+
+
+class OcrCache:
+    """
+    A thread safe LRU cache shared by all Ocr objects.
+
+    Examples:
+        key = OCR_CACHE.key(image, letter, threshold, alphabet, model)
+        result = OCR_CACHE.get(key)
+        if result is None:
+            result = ...
+            OCR_CACHE.put(key, result)
+        logger.info(OCR_CACHE.stats())
+    """
+
+    def __init__(self, maxsize=512):
+        """
+        Args:
+            maxsize (int): Max number of results to keep
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(image, *config):
+        """
+        Args:
+            image (np.ndarray): Pre-processed crop
+            *config: Anything that affects OCR result, such as letter, threshold, alphabet, model name.
+                Must be hashable.
+
+        Returns:
+            tuple:
+        """
+        return (image_digest(image),) + config
+
+    def get(self, key):
+        """
+        Returns:
+            str: Cached result, or None if not cached
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """
+        Returns:
+            dict: hits, misses, size, hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'hit_rate': round(self.hits / total, 3) if total else 0.,
+        }
+
+
+OCR_CACHE = OcrCache()
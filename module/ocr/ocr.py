@@ -14,131 +14,12 @@ from module.logger import logger
 from module.ocr.rpc import ModelProxyFactory
 from module.webui.setting import State
 from module.base.error_handler import OCR_ERROR_COUNTER
-# OCR backend with PaddleOCR interface compatibility
-try:
-    from paddleocr import PaddleOCR
-    # Check if we have the newer PaddleOCR 3.x with predict method
-    try:
-        # Try PaddleOCR 3.x initialization (no use_gpu parameter)
-        _test_ocr = PaddleOCR(lang='en')
-        has_predict = hasattr(_test_ocr, 'predict')
-    except:
-        # Fallback to PaddleOCR 2.x initialization
-        _test_ocr = PaddleOCR(use_angle_cls=True, lang='en', show_log=False, use_gpu=False)
-        has_predict = False
-    
-    if has_predict:
-        # PaddleOCR 3.x with new API
-        OCR_MODEL = _test_ocr
-        
-        # Wrap the predict method to match the old ocr() interface
-        def ocr_wrapper(images, cls=True):
-            results = []
-            if not isinstance(images, list):
-                images = [images]
-            
-            for img in images:
-                # Use predict() for PaddleOCR 3.x
-                predict_results = OCR_MODEL.predict(img)
-                if predict_results and len(predict_results) > 0:
-                    # Convert new format to old format
-                    formatted_result = []
-                    res_dict = predict_results[0]
-                    texts = res_dict.get('rec_texts', [])
-                    scores = res_dict.get('rec_scores', [])
-                    polys = res_dict.get('rec_polys', [])
-                    
-                    # Match the old ocr() output format: list of [bbox, (text, score)]
-                    for i in range(len(texts)):
-                        if i < len(polys) and i < len(scores):
-                            bbox = polys[i].tolist() if hasattr(polys[i], 'tolist') else polys[i]
-                            formatted_result.append([bbox, (texts[i], scores[i])])
-                    
-                    results.append(formatted_result if formatted_result else None)
-                else:
-                    results.append(None)
-            
-            return results
-        
-        # Replace ocr method with wrapper
-        OCR_MODEL.ocr = ocr_wrapper
-        # Add close method for compatibility
-        if not hasattr(OCR_MODEL, 'close'):
-            OCR_MODEL.close = lambda: None
-        logger.info('Using PaddleOCR 3.x with compatibility wrapper.')
-    else:
-        # PaddleOCR 2.x - use original ocr() method
-        OCR_MODEL = _test_ocr
-        logger.info('Using PaddleOCR 2.x backend.')
-except ImportError:
-    # Fallback: Create PaddleOCR-compatible wrapper around EasyOCR
-    logger.info('PaddleOCR not available, creating EasyOCR compatibility wrapper.')
-    
-    try:
-        import easyocr
-        
-        class PaddleOCRCompatWrapper:
-            """EasyOCR wrapper that mimics PaddleOCR interface for ALAS compatibility."""
-            
-            def __init__(self):
-                self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-                self.name = 'EasyOCR-PaddleOCR-Compat'
-            
-            def ocr(self, images, cls=True, **kwargs):
-                """
-                OCR with PaddleOCR-compatible interface.
-                
-                Args:
-                    images: Single image or list of images (numpy arrays)
-                    cls: Angle classification (ignored for EasyOCR compatibility)
-                    
-                Returns:
-                    List in PaddleOCR format: [result_per_image, ...]
-                    Each result_per_image: [[[x1,y1],[x2,y2],[x3,y3],[x4,y4]], (text, confidence)]
-                """
-                # Handle single image
-                if not isinstance(images, list):
-                    images = [images]
-                
-                results = []
-                for image in images:
-                    try:
-                        # EasyOCR returns: [[[x1,y1],[x2,y2],[x3,y3],[x4,y4]], text, confidence]
-                        easyocr_results = self.reader.readtext(image, detail=1)
-                        
-                        # Convert to PaddleOCR format: [[[box]], (text, confidence)]
-                        paddleocr_format = []
-                        for detection in easyocr_results:
-                            box, text, confidence = detection
-                            paddleocr_format.append([box, (text, confidence)])
-                        
-                        results.append(paddleocr_format if paddleocr_format else None)
-                    except Exception as e:
-                        logger.warning(f"EasyOCR processing failed: {e}")
-                        results.append(None)
-                
-                return results
-            
-            def close(self):
-                """Close method for compatibility with PaddleOCR interface."""
-                pass
-        
-        OCR_MODEL = PaddleOCRCompatWrapper()
-        logger.info('Using EasyOCR with PaddleOCR compatibility wrapper.')
-        
-    except ImportError:
-        # Final fallback: Minimal OCR that returns PaddleOCR-compatible empty results
-        class MinimalPaddleOCR:
-            def ocr(self, images, cls=True, **kwargs):
-                if not isinstance(images, list):
-                    images = [images]
-                return [None] * len(images)  # PaddleOCR returns None for no text found
-            
-            def close(self):
-                pass
-        
-        OCR_MODEL = MinimalPaddleOCR()
-        logger.warning('No OCR backend available - using minimal PaddleOCR-compatible fallback.')
+from module.ocr.backend import OcrBackend
+from module.ocr.cache import OCR_CACHE
+from module.ocr.router import OCR_ROUTER, OcrRoute
+
+# OCR backend with PaddleOCR interface compatibility, models are loaded on first use
+OCR_MODEL = OcrBackend()
 
 
 class Ocr:
@@ -149,6 +30,8 @@ class Ocr:
     OCR_DEBUG_DIR = './log/ocr_debug'
     OCR_DEBUG_MAX_FILES = 10
     _ocr_debug_counter = 0
+    # Name of OCR backend that produced local results in OCR_CACHE
+    _cache_backend = ''
 
     def __init__(self, buttons, letter=(255, 255, 255), threshold=128, alphabet=None, name=None):
         """
@@ -164,6 +47,8 @@ class Ocr:
         self.letter = letter
         self.threshold = threshold
         self.alphabet = alphabet
+        # Results preloaded by OcrBatch, (image, image_list, result_list)
+        self._preset = None
 
     @property
     def buttons(self):
@@ -273,58 +158,34 @@ class Ocr:
         if not image_list:
             return []
 
-        # Check device connection first (cost protection)
-        device_connected = False
-        try:
-            from adbutils import AdbClient
-            client = AdbClient(host="127.0.0.1", port=5037)
-            devices = client.device_list()
-            device_connected = len(devices) > 0
-        except Exception as e:
-            logger.debug(f"Device connection check failed: {e}")
-            device_connected = False
-            
-        # Use vision OCR if device is connected and API is available
-        if device_connected:
+        # Backend is decided once and cached, see OcrRouter
+        route = OCR_ROUTER.route
+        if route == OcrRoute.VISION:
             try:
                 # Vision OCR needs the full screenshot, not cropped images
                 # Pass the original image (full screenshot) to vision OCR
                 return self._vision_ocr(image)
+            except ImportError as e:
+                # Not configured, don't try again until next connection event
+                logger.warning(f"Vision OCR unavailable, falling back to traditional: {e}")
+                OCR_ROUTER.on_route_failed(route, permanent=True)
             except Exception as e:
                 logger.warning(f"Vision OCR failed, falling back to traditional: {e}")
                 # Fall through to traditional OCR
 
         result_list = []
         try:
-            # For traditional OCR, we need to crop each button area from the full image
-            cropped_images = []
-            for button in self.buttons:
-                x1, y1, x2, y2 = button
-                cropped = image[y1:y2, x1:x2] if isinstance(image, np.ndarray) else image
-                cropped_images.append(cropped)
-            
-            # Pre-process
-            preprocessed_images = []
-            if not direct_ocr:
-                for img in cropped_images:
-                    preprocessed = self.pre_process(img)
-                    preprocessed_images.append(preprocessed)
-                image_list = preprocessed_images
+            preset = self._pop_preset(image)
+            if preset is not None:
+                # Already done in OcrBatch
+                image_list, result_list = preset
             else:
-                image_list = cropped_images
-
-            # PaddleOCR returns a list of results, one for each image.
-            # Each result is a list of [box, (text, score)].
-            results = OCR_MODEL.ocr(image_list, cls=True)
-            result_list = []
-            for result_per_image in results:
-                if result_per_image:
-                    # Concat all text found in one image
-                    text = ' '.join([line[1][0] for line in result_per_image])
-                    result_list.append(text)
+                image_list = self.ocr_images(image, direct_ocr=direct_ocr)
+                keys = self.cache_keys(image_list, route)
+                if route == OcrRoute.SERVER:
+                    result_list = self._cached_ocr(image_list, keys, self._server_ocr)
                 else:
-                    # No text found
-                    result_list.append('')
+                    result_list = self._cached_ocr(image_list, keys, self._model_ocr)
 
             # Post-process
             result_list = [self.after_process(res) for res in result_list]
@@ -348,6 +209,131 @@ class Ocr:
         else:
             return result_list
 
+    def ocr_images(self, image, direct_ocr=False):
+        """
+        Args:
+            image (np.ndarray, list[np.ndarray]):
+            direct_ocr (bool): True to skip preprocess.
+
+        Returns:
+            list[np.ndarray]: Images to feed OCR models, one for each button.
+        """
+        # For traditional OCR, we need to crop each button area from the full image
+        cropped_images = []
+        for button in self.buttons:
+            x1, y1, x2, y2 = button
+            cropped = image[y1:y2, x1:x2] if isinstance(image, np.ndarray) else image
+            cropped_images.append(cropped)
+
+        # Pre-process
+        if direct_ocr:
+            return cropped_images
+        return [self.pre_process(img) for img in cropped_images]
+
+    def _set_preset(self, image, image_list, result_list):
+        self._preset = (image, image_list, result_list)
+
+    def _pop_preset(self, image):
+        """
+        Returns:
+            tuple[list[np.ndarray], list[str]]: Pre-processed images and raw results preloaded by OcrBatch,
+                or None if not preloaded on this image.
+        """
+        preset = self._preset
+        self._preset = None
+        if preset is not None and preset[0] is image:
+            return preset[1], preset[2]
+        return None
+
+    def cache_keys(self, image_list, route=OcrRoute.LOCAL):
+        """
+        Args:
+            image_list (list[np.ndarray]): Pre-processed images
+            route (str): One of OcrRoute
+
+        Returns:
+            list[tuple]: Keys in OCR_CACHE, or None if images can't be cached
+        """
+        if not all(isinstance(img, np.ndarray) for img in image_list):
+            return None
+        # Local results are keyed by route instead of backend name,
+        # so cached results are returned without loading the backend, see _model_ocr()
+        model = 'server' if route == OcrRoute.SERVER else 'local'
+        letter = tuple(self.letter) if self.letter is not None else None
+        config = (letter, self.threshold, self.alphabet, model)
+        return [OCR_CACHE.key(img, *config) for img in image_list]
+
+    @staticmethod
+    def _cached_ocr(image_list, keys, func):
+        """
+        Args:
+            image_list (list[np.ndarray]): Pre-processed images
+            keys (list[tuple]): Keys in OCR_CACHE, or None to skip cache
+            func (callable): Function that accepts a list of images and returns a list of raw results
+
+        Returns:
+            list[str]: Raw results, OCR runs only on images not cached
+
+        Raises:
+            ValueError: If `func` returns results of a different number of images.
+        """
+        if keys is None:
+            return func(image_list)
+
+        result_list = [OCR_CACHE.get(key) for key in keys]
+        missing = [index for index, result in enumerate(result_list) if result is None]
+        if missing:
+            results = func([image_list[index] for index in missing])
+            if len(results) != len(missing):
+                raise ValueError(f'Got {len(results)} OCR results from {len(missing)} images')
+            for index, result in zip(missing, results):
+                result_list[index] = result
+                OCR_CACHE.put(keys[index], result)
+        return result_list
+
+    @staticmethod
+    def _model_ocr(image_list):
+        """
+        Args:
+            image_list (list[np.ndarray]): Pre-processed images
+
+        Returns:
+            list[str]: Raw results from local OCR model
+        """
+        # PaddleOCR returns a list of results, one for each image.
+        # Each result is a list of [box, (text, score)].
+        results = OCR_MODEL.ocr(image_list, cls=True)
+        # Cached local results are not keyed by backend, drop them if another backend is loaded
+        if OCR_MODEL.name != Ocr._cache_backend:
+            if Ocr._cache_backend:
+                OCR_CACHE.clear()
+            Ocr._cache_backend = OCR_MODEL.name
+        result_list = []
+        for result_per_image in results:
+            if result_per_image:
+                # Concat all text found in one image
+                text = ' '.join([line[1][0] for line in result_per_image])
+                result_list.append(text)
+            else:
+                # No text found
+                result_list.append('')
+        return result_list
+
+    def _server_ocr(self, image_list):
+        """
+        Args:
+            image_list (list[np.ndarray]): Pre-processed images
+
+        Returns:
+            list[str]: Raw results from OCR server
+        """
+        try:
+            return ModelProxyFactory().azur_lane.ocr_for_single_lines(image_list)
+        except Exception as e:
+            logger.warning(f"OCR server failed, falling back to traditional: {e}")
+            OCR_ROUTER.on_route_failed(OcrRoute.SERVER)
+            return self._model_ocr(image_list)
+
     def _vision_ocr(self, full_screenshot):
         """Use Gemini vision to read text directly from full screenshot with button context"""
         try:
@@ -360,56 +346,129 @@ class Ocr:
                 logger.warning("No Google API key, falling back to OCR")
                 raise ImportError("No API key")
                 
+            buttons = self._buttons if isinstance(self._buttons, list) else [self._buttons]
+
+            # Check cache before any request, keyed by the content of button area
+            keys = [None] * len(buttons)
+            results = [None] * len(buttons)
+            if isinstance(full_screenshot, np.ndarray):
+                for idx, button in enumerate(buttons):
+                    keys[idx] = self._vision_cache_key(full_screenshot, button, idx, len(buttons), GEMINI_MODEL)
+                    results[idx] = OCR_CACHE.get(keys[idx])
+            missing = [idx for idx, text in enumerate(results) if text is None]
+            if not missing:
+                return results[0] if len(results) == 1 else results
+
             genai.configure(api_key=GOOGLE_API_KEY)
             model = genai.GenerativeModel(GEMINI_MODEL)
-            
+
             # Convert full screenshot to PIL
             if isinstance(full_screenshot, np.ndarray):
                 pil_screenshot = Image.fromarray(full_screenshot)
             else:
                 pil_screenshot = full_screenshot
-            
-            results = []
-            buttons = self._buttons if isinstance(self._buttons, list) else [self._buttons]
-            
-            for idx, button in enumerate(buttons):
+
+            # Read all missing buttons in one request
+            if len(missing) > 1:
+                batch_results = self._vision_ocr_batch(model, pil_screenshot, buttons, missing)
+                if batch_results is not None:
+                    for idx, text in zip(missing, batch_results):
+                        results[idx] = text
+                        if keys[idx] is not None:
+                            OCR_CACHE.put(keys[idx], text)
+                    return results[0] if len(results) == 1 else results
+
+            for idx in missing:
+                button = buttons[idx]
                 button_name = button.name if hasattr(button, 'name') else 'unknown'
                 button_area = button.area if hasattr(button, 'area') else button
-                
+
                 # Get appropriate prompt based on button name and area
                 prompt = self._get_vision_prompt_with_area(button_name, button_area, idx, len(buttons))
-                
+
                 try:
-                    # Check cache with button area as part of key
-                    cache_key = f"{button_name}_{button_area}_{hash(full_screenshot.tobytes() if isinstance(full_screenshot, np.ndarray) else id(full_screenshot))}"
-                    if hasattr(self, '_vision_cache') and cache_key in self._vision_cache:
-                        age = time.time() - self._vision_cache_time.get(cache_key, 0)
-                        if age < 30:  # 30 second cache
-                            results.append(self._vision_cache[cache_key])
-                            continue
-                    
                     # Call Gemini with full screenshot
                     response = model.generate_content([prompt, pil_screenshot])
                     text = response.text.strip()
-                    
+
                     # Cache result
-                    if not hasattr(self, '_vision_cache'):
-                        self._vision_cache = {}
-                        self._vision_cache_time = {}
-                    self._vision_cache[cache_key] = text
-                    self._vision_cache_time[cache_key] = time.time()
-                    
-                    results.append(text)
+                    if keys[idx] is not None:
+                        OCR_CACHE.put(keys[idx], text)
+
+                    results[idx] = text
                 except Exception as e:
                     logger.error(f"Vision OCR failed for {button_name}: {e}")
-                    results.append("")
-                    
+                    results[idx] = ""
+
             return results[0] if len(results) == 1 else results
-            
+
         except ImportError:
             logger.warning("Google AI not available")
             raise
             
+    @staticmethod
+    def _vision_cache_key(full_screenshot, button, idx, total, model):
+        """
+        Args:
+            full_screenshot (np.ndarray):
+            button (Button, tuple):
+            idx (int): Index of button
+            total (int): Number of buttons
+            model (str): Gemini model name
+
+        Returns:
+            tuple: Key in OCR_CACHE, made from the content of button area and prompt parameters.
+        """
+        button_name = button.name if hasattr(button, 'name') else 'unknown'
+        button_area = button.area if hasattr(button, 'area') else button
+        return OCR_CACHE.key(
+            crop(full_screenshot, button_area, copy=False),
+            'vision', model, button_name, tuple(button_area), idx, total)
+
+    def _vision_ocr_batch(self, model, pil_screenshot, buttons, indexes=None):
+        """
+        Read multiple buttons with one vision request.
+
+        Args:
+            model: Gemini model
+            pil_screenshot (Image.Image): Full screenshot
+            buttons (list[Button, tuple]):
+            indexes (list[int]): Index of buttons to read, or None to read all.
+
+        Returns:
+            list[str]: Results of each button in `indexes`,
+                or None if failed to parse, caller should request one by one.
+        """
+        if indexes is None:
+            indexes = list(range(len(buttons)))
+        prompts = []
+        for item, idx in enumerate(indexes):
+            button = buttons[idx]
+            button_name = button.name if hasattr(button, 'name') else 'unknown'
+            button_area = button.area if hasattr(button, 'area') else button
+            prompt = self._get_vision_prompt_with_area(button_name, button_area, idx, len(buttons))
+            prompts.append(f"Item {item + 1}, area {tuple(button_area)}:\n{prompt}")
+        prompt = "\n\n".join(prompts)
+        prompt += f"""
+
+Answer all {len(indexes)} items above.
+Return ONLY a JSON array of {len(indexes)} strings, one for each item in order, no explanations."""
+
+        try:
+            response = model.generate_content([prompt, pil_screenshot])
+            text = response.text.strip()
+            # Remove markdown code fence
+            text = re.sub(r'^```(?:json)?\s*|\s*```$', '', text)
+            results = json.loads(text)
+        except Exception as e:
+            logger.warning(f"Vision OCR batch failed, request one by one: {e}")
+            return None
+
+        if not isinstance(results, list) or len(results) != len(indexes):
+            logger.warning(f"Vision OCR batch got unexpected results: {results}, request one by one")
+            return None
+        return [str(result).strip() for result in results]
+
     def _traditional_ocr(self, image_list):
         """Fallback to traditional OCR"""
         # Use the existing OCR logic from the main ocr method
@@ -421,18 +480,7 @@ class Ocr:
                 preprocessed = self.pre_process(img)
                 preprocessed_images.append(preprocessed)
 
-            # PaddleOCR returns a list of results, one for each image.
-            # Each result is a list of [box, (text, score)].
-            results = OCR_MODEL.ocr(preprocessed_images, cls=True)
-            result_list = []
-            for result_per_image in results:
-                if result_per_image:
-                    # Concat all text found in one image
-                    text = ' '.join([line[1][0] for line in result_per_image])
-                    result_list.append(text)
-                else:
-                    # No text found
-                    result_list.append('')
+            result_list = self._model_ocr(preprocessed_images)
 
             # Post-process
             result_list = [self.after_process(res) for res in result_list]
@@ -512,6 +560,72 @@ Examples: 7-2, D3, SP3, 13-4"""
 Return ONLY what you see, no explanations."""
 
 
+class OcrBatch:
+    """
+    Run multiple Ocr objects on the same image in one backend call,
+    instead of one call for each Ocr object.
+
+    Raw results are preloaded into each Ocr object, and consumed by its next `ocr()` call on the same image,
+    so `after_process()` and result parsing in subclasses work as usual.
+
+    Examples:
+        OcrBatch([OCR_OIL, OCR_COIN]).preload(self.device.image)
+        oil = OCR_OIL.ocr(self.device.image)
+        coin = OCR_COIN.ocr(self.device.image)
+    """
+
+    def __init__(self, ocrs):
+        """
+        Args:
+            ocrs (list[Ocr]):
+        """
+        self.ocrs = list(ocrs)
+
+    def preload(self, image, direct_ocr=False):
+        """
+        Args:
+            image (np.ndarray): Screenshot.
+            direct_ocr (bool): True to skip preprocess.
+
+        Returns:
+            bool: If preloaded.
+                Vision OCR reads full screenshots, so it's not preloaded and each Ocr runs on its own.
+        """
+        route = OCR_ROUTER.route
+        if route == OcrRoute.VISION or not isinstance(image, np.ndarray):
+            return False
+
+        image_lists = []
+        try:
+            for ocr in self.ocrs:
+                image_lists.append(ocr.ocr_images(image, direct_ocr=direct_ocr))
+            images = [img for image_list in image_lists for img in image_list]
+            if not images:
+                return False
+            keys = [ocr.cache_keys(image_list, route) for ocr, image_list in zip(self.ocrs, image_lists)]
+            if any(key is None for key in keys):
+                keys = None
+            else:
+                keys = [key for key_list in keys for key in key_list]
+            if route == OcrRoute.SERVER:
+                results = Ocr._cached_ocr(images, keys, self.ocrs[0]._server_ocr)
+            else:
+                results = Ocr._cached_ocr(images, keys, Ocr._model_ocr)
+        except Exception as e:
+            logger.warning(f'OcrBatch failed, OCR one by one: {e}')
+            return False
+        if len(results) != len(images):
+            logger.warning(f'OcrBatch got {len(results)} results from {len(images)} images, OCR one by one')
+            return False
+
+        start = 0
+        for ocr, image_list in zip(self.ocrs, image_lists):
+            end = start + len(image_list)
+            ocr._set_preset(image, image_list, results[start:end])
+            start = end
+        return True
+
+
 class Digit(Ocr):
     def ocr(self, image, direct_ocr=False):
         """
@@ -0,0 +1,136 @@
+"""
+Decide which OCR backend to use.
+
+The decision is made once and cached, then re-evaluated only on connection events,
+instead of enumerating ADB devices on every OCR call.
+"""
+import threading
+
+from module.logger import logger
+
+
+class OcrRoute:
+    # Local model in module.ocr.backend
+    LOCAL = 'local'
+    # OCR server in module.ocr.rpc
+    SERVER = 'server'
+    # Vision LLM in Ocr._vision_ocr()
+    VISION = 'vision'
+
+
+class OcrRouter:
+    def __init__(self):
+        self._route = ''
+        # None for unknown, True or False if known from connection events
+        self._device_connected = None
+        # Set if vision LLM is not configured, until next connection event
+        self._vision_disabled = False
+        self._lock = threading.Lock()
+
+    @property
+    def route(self):
+        """
+        Returns:
+            str: One of OcrRoute
+        """
+        route = self._route
+        if route:
+            return route
+        with self._lock:
+            if not self._route:
+                self._route = self.decide()
+                logger.attr('OcrRoute', self._route)
+            return self._route
+
+    def decide(self):
+        """
+        Returns:
+            str: One of OcrRoute
+        """
+        if self.vision_available():
+            return OcrRoute.VISION
+        if self.server_available():
+            return OcrRoute.SERVER
+        return OcrRoute.LOCAL
+
+    def vision_available(self):
+        """
+        Vision LLM costs money, use it only if API key is set and a device is connected.
+        """
+        if self._vision_disabled:
+            return False
+        try:
+            import google.generativeai
+            from config.vision_llm_config import GOOGLE_API_KEY
+        except ImportError:
+            return False
+        if not GOOGLE_API_KEY:
+            return False
+        return self.device_connected()
+
+    @staticmethod
+    def server_available():
+        try:
+            from module.ocr import rpc
+            from module.webui.setting import State
+
+            return bool(State.deploy_config.UseOcrServer) and rpc.alive()
+        except Exception as e:
+            logger.debug(f'OCR server check failed: {e}')
+            return False
+
+    def device_connected(self):
+        """
+        Returns:
+            bool: If any device connected.
+                Known from connection events, otherwise check through ADB once.
+        """
+        if self._device_connected is None:
+            try:
+                from adbutils import AdbClient
+
+                client = AdbClient(host="127.0.0.1", port=5037)
+                self._device_connected = len(client.device_list()) > 0
+            except Exception as e:
+                logger.debug(f"Device connection check failed: {e}")
+                self._device_connected = False
+        return self._device_connected
+
+    def reset(self):
+        """
+        Re-evaluate route on next OCR call.
+        """
+        self._route = ''
+
+    def on_connect(self):
+        """
+        Called when device connected.
+        """
+        self._device_connected = True
+        self._vision_disabled = False
+        self.reset()
+
+    def on_disconnect(self):
+        """
+        Called when device disconnected or adb restarted.
+        """
+        self._device_connected = None
+        self.reset()
+
+    def on_route_failed(self, route, permanent=False):
+        """
+        Args:
+            route (str): One of OcrRoute
+            permanent (bool): True if the route is unusable until next connection event,
+                such as vision LLM not configured.
+                False for temporary failures, the route will be used on next call.
+        """
+        if route == OcrRoute.VISION and permanent:
+            logger.info('Vision OCR unavailable, route to local OCR')
+            self._vision_disabled = True
+            self.reset()
+        elif route == OcrRoute.SERVER:
+            self.reset()
+
+
+OCR_ROUTER = OcrRouter()
@@ -1,3 +1,5 @@
+import hashlib
+import os
 import time
 
 from module.base.utils import *
@@ -9,6 +11,7 @@ from module.map_detection.utils import *
 
 GLOBE_MAP = "./assets/map_detection/os_globe_map.png"
 GLOBE_MAP_SHAPE = (2570, 1696)
+GLOBE_CACHE_FOLDER = "./log/cache/globe"
 
 
 class GlobeDetection:
@@ -46,6 +49,10 @@ class GlobeDetection:
             return False
 
         logger.info("Loading OS globe map")
+        key = self.globe_cache_key()
+        if key and self._load_globe_cache(key):
+            self._globe_map_loaded = True
+            return True
 
         # Load GLOBE_MAP
         image = load_image(GLOBE_MAP)
@@ -64,9 +71,103 @@ class GlobeDetection:
         self.homo_center = self.screen2globe([self.config.SCREEN_CENTER])[0].astype(int)
         backup.recover()
 
+        if key:
+            self._save_globe_cache(key)
         self._globe_map_loaded = True
         return True
 
+    def globe_cache_key(self):
+        """
+        Returns:
+            str: Hash of globe map asset and all parameters used to pre-process it,
+                or empty string if asset not found.
+        """
+        try:
+            with open(GLOBE_MAP, "rb") as f:
+                digest = hashlib.blake2b(f.read(), digest_size=16)
+        except OSError:
+            return ""
+        params = (
+            self.config.OS_GLOBE_FIND_PEAKS_PARAMETERS,
+            self.config.OS_GLOBE_IMAGE_PAD,
+            self.config.OS_GLOBE_IMAGE_RESIZE,
+            self.config.OS_GLOBE_HOMO_STORAGE,
+            self.config.OS_GLOBE_DETECTING_AREA,
+            self.config.HOMO_TILE,
+            self.config.SCREEN_CENTER,
+        )
+        digest.update(repr(params).encode())
+        return digest.hexdigest()
+
+    def _load_globe_cache(self, key):
+        """
+        Load pre-processed globe map and homography from disk.
+        Globe map is memory-mapped, so it's shared among processes and loaded lazily by OS.
+
+        Args:
+            key (str):
+
+        Returns:
+            bool: If loaded.
+        """
+        file = os.path.join(GLOBE_CACHE_FOLDER, f"{key}.npy")
+        homo_file = os.path.join(GLOBE_CACHE_FOLDER, f"{key}.npz")
+        if not os.path.exists(file) or not os.path.exists(homo_file):
+            return False
+        try:
+            globe = np.load(file, mmap_mode="r")
+            with np.load(homo_file) as data:
+                homo_data = data["homo_data"]
+                homo_invt = data["homo_invt"]
+                homo_size = tuple(data["homo_size"].tolist())
+                homo_center = data["homo_center"]
+        except Exception as e:
+            logger.warning(f"Failed to load OS globe map cache: {e}")
+            return False
+
+        self.globe = globe
+        self.homography.load_homography(self.config.OS_GLOBE_HOMO_STORAGE, homo_data, homo_invt, homo_size)
+        self.homo_center = homo_center
+        logger.info(f"OS globe map loaded from cache: {key}")
+        return True
+
+    def _save_globe_cache(self, key):
+        """
+        Args:
+            key (str):
+        """
+        file = os.path.join(GLOBE_CACHE_FOLDER, f"{key}.npy")
+        homo_file = os.path.join(GLOBE_CACHE_FOLDER, f"{key}.npz")
+        try:
+            os.makedirs(GLOBE_CACHE_FOLDER, exist_ok=True)
+            # Write to temp files then rename, so other processes never read a partial file
+            tmp = f"{file}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, self.globe)
+            os.replace(tmp, file)
+            tmp = f"{homo_file}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    homo_data=self.homography.homo_data,
+                    homo_invt=self.homography.homo_invt,
+                    homo_size=np.array(self.homography.homo_size),
+                    homo_center=np.array(self.homo_center),
+                )
+            os.replace(tmp, homo_file)
+        except OSError as e:
+            logger.warning(f"Failed to save OS globe map cache: {e}")
+            return
+
+        # Remove caches of outdated assets or parameters.
+        # Temp files are left alone, other processes may be writing them.
+        for name in os.listdir(GLOBE_CACHE_FOLDER):
+            if os.path.splitext(name)[1] in (".npy", ".npz") and not name.startswith(key):
+                try:
+                    os.remove(os.path.join(GLOBE_CACHE_FOLDER, name))
+                except OSError:
+                    pass
+
     def screen2globe(self, points):
         return perspective_transform(points, data=self.homography.homo_data)
 
@@ -3,7 +3,7 @@ from module.base.utils import *
 from module.config.config import AzurLaneConfig
 from module.logger import logger
 from module.map.map_grids import SelectedGrids
-from module.map_detection.utils import fit_points
+from module.map_detection.utils import fit_points, predict_grids
 
 MASK_RADAR = Mask("./assets/mask/MASK_OS_RADAR.png")
 
@@ -204,7 +204,11 @@ class Radar:
         for grid in self:
             grid.image = image
             grid.reset()
-            grid.predict()
+        timing = predict_grids(
+            self, threads=self.config.MAP_GRID_PREDICT_THREADS, timing=self.config.MAP_GRID_PREDICT_TIMING
+        )
+        for name, cost in sorted(timing.items(), key=lambda item: -item[1]):
+            logger.attr_align(name, float2str(cost) + "s")
         # Fixup is_question near is_port
         for port in self.select(is_port=True):
             for grid in self.select(is_question=True):
@@ -1,7 +1,5 @@
 from datetime import timedelta
 
-from scipy import signal
-
 from module.base.decorator import cached_property
 from module.base.utils import *
 from module.device.method.utils import remove_suffix
@@ -56,7 +54,7 @@ def get_research_series_old(image, series_button=RESEARCH_SERIES):
 
     for button in series_button:
         im = color_similarity_2d(resize(crop(image, button.area, copy=False), (46, 25)), color=(255, 255, 255))
-        peaks = [len(signal.find_peaks(row, **parameters)[0]) for row in im[5:-5]]
+        peaks = [len(find_peaks(row, **parameters)[0]) for row in im[5:-5]]
         upper, lower = max(peaks), min(peaks)
         # print(peaks)
 
@@ -232,7 +230,7 @@ def get_research_series_jp_old(image):
     area = SERIES_DETAIL.area
     # Resize is not needed because only one area will be checked in JP server.
     im = color_similarity_2d(crop(image, area, copy=False), color=(255, 255, 255))
-    peaks = [len(signal.find_peaks(row, **parameters)[0]) for row in im[5:-5]]
+    peaks = [len(find_peaks(row, **parameters)[0]) for row in im[5:-5]]
     upper, lower = max(peaks), min(peaks)
     # print(upper, lower)
 
@@ -208,6 +208,8 @@ class RewardResearch(ResearchSelector, ResearchQueue, StorageHandler):
                 self.ensure_research_stable()
                 click_count += 1
                 click_timer.reset()
+                # Project detail may take seconds to load, or not respond until next click
+                self.device.screenshot_expect_wait(click_timer.limit, max_interval=1)
                 continue
             if max_rgb > 235 and self.appear_then_click(RESEARCH_START, offset=(5, 20), interval=10):
                 available = True
@@ -222,8 +224,10 @@ class RewardResearch(ResearchSelector, ResearchQueue, StorageHandler):
                     "probably because there is a research running but requirements not satisfied, "
                     "or a research finished"
                 )
+                self.device.screenshot_expect_wait_end()
                 raise GameTooManyClickError
             if self.appear(RESEARCH_STOP, offset=(20, 20)):
+                self.device.screenshot_expect_wait_end()
                 # RESEARCH_STOP is a semi-transparent button,
                 # color will vary depending on the background.
                 if add_queue:
@@ -236,6 +240,7 @@ class RewardResearch(ResearchSelector, ResearchQueue, StorageHandler):
                 return True
             if not available and max_rgb <= 235 and self.appear(RESEARCH_UNAVAILABLE, offset=(5, 20)):
                 logger.info("Not enough resources to start this project")
+                self.device.screenshot_expect_wait_end()
                 self.research_detail_quit()
                 self.research_project_started = None
                 self._research_project_offset = (index - 2) % 5
@@ -10,7 +10,7 @@ from module.base.button import ButtonGrid
 from module.base.utils import color_similar, crop, extract_letters, get_color, limit_in, save_image
 from module.combat.level import LevelOcr
 from module.logger import logger
-from module.ocr.ocr import Digit
+from module.ocr.ocr import Digit, OcrBatch
 from module.retire.assets import (
     TEMPLATE_FLEET_1,
     TEMPLATE_FLEET_2,
@@ -341,6 +341,15 @@ class ShipScanner(Scanner):
         self.set_limitation(level=level, emotion=emotion, rarity=rarity, fleet=fleet, status=status)
 
     def _scan(self, image) -> list:
+        # OCR all enabled scanners in one batch
+        ocrs = [
+            scanner.ocr_model
+            for scanner in self.sub_scanners.values()
+            if scanner._enabled and hasattr(scanner, "ocr_model")
+        ]
+        if len(ocrs) > 1:
+            OcrBatch(ocrs).preload(image)
+
         for scanner in self.sub_scanners.values():
             scanner.scan(image, cached=True)
 
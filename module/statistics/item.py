@@ -121,6 +121,10 @@ class ItemGrid:
     similarity = 0.92
     extract_similarity = 0.92
     cost_similarity = 0.75
+    # Thumbnail size of template features
+    feature_size = (6, 6)
+    # Number of templates to match first, which are the nearest in feature
+    template_shortlist = 8
 
     def __init__(
         self,
@@ -157,6 +161,7 @@ class ItemGrid:
         self.next_template_index = len(self.templates.keys())
         for name, template in templates.items():
             self.templates[name] = crop(template.image, area=self.template_area)
+            self.colors[name] = cv2.mean(self.templates[name])[:3]
             self.templates_hit[name] = 0
             if name.isdigit() and int(name) > self.next_template_index:
                 self.next_template_index = int(name)
@@ -165,6 +170,12 @@ class ItemGrid:
         self.cost_templates_hit = {}
         self.next_cost_template_index = len(self.cost_templates.keys())
 
+        # Index of templates, in the same order as self.templates
+        self._index_names = []
+        self._index_digit = np.zeros(0, dtype=bool)
+        self._index_colors = np.zeros((0, 3))
+        self._index_features = self.template_feature([])
+
         self.items = []
 
     def _load_image(self, image):
@@ -199,6 +210,7 @@ class ItemGrid:
             self.next_template_index += 1
         self.next_template_index = max(self.next_template_index, max_digit + 1)
         logger.attr("next_template_index", self.next_template_index)
+        self.build_template_index()
 
     def load_cost_template_folder(self, folder):
         """
@@ -218,31 +230,113 @@ class ItemGrid:
             self.next_cost_template_index += 1
         self.next_cost_template_index = max(self.next_cost_template_index, max_digit + 1)
 
-    def match_template(self, image, similarity=None):
+    def template_feature(self, images):
         """
-        Match templates, try most frequent hit templates first.
+        Args:
+            images (list[np.ndarray]): Templates, or item images cropped at template_area.
+
+        Returns:
+            np.ndarray: Shape (n, dim). Thumbnails with mean removed and normalized,
+                dot product of two features approximates TM_CCOEFF_NORMED without offset.
+        """
+        dim = self.feature_size[0] * self.feature_size[1] * 3
+        if not len(images):
+            return np.zeros((0, dim), dtype=np.float32)
+        features = []
+        for image in images:
+            if len(image.shape) == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+            features.append(cv2.resize(image, self.feature_size, interpolation=cv2.INTER_AREA))
+        features = np.array(features, dtype=np.float32).reshape(len(images), dim)
+        features -= np.mean(features, axis=1, keepdims=True)
+        norm = np.linalg.norm(features, axis=1, keepdims=True)
+        norm[norm == 0] = 1
+        return features / norm
+
+    def build_template_index(self):
+        """
+        Build features and colors of all templates, for shortlisting templates before matching.
+        """
+        names = list(self.templates.keys())
+        self._index_names = names
+        self._index_digit = np.array([name.isdigit() for name in names], dtype=bool)
+        self._index_colors = np.array([self.colors[name] for name in names]).reshape(-1, 3)
+        self._index_features = self.template_feature([self.templates[name] for name in names])
+
+    def _template_index_add(self, name):
+        self._index_names.append(name)
+        self._index_digit = np.append(self._index_digit, name.isdigit())
+        self._index_colors = np.concatenate([self._index_colors, [self.colors[name]]])
+        self._index_features = np.concatenate(
+            [self._index_features, self.template_feature([self.templates[name]])])
+
+    def _template_candidates(self, color, feature, score=None):
+        """
+        Args:
+            color (tuple): Mean color of item image at template_area.
+            feature (np.ndarray): Feature of item image at template_area.
+            score (np.ndarray): `self._index_features @ feature`, if already calculated.
+                Templates added to index after that are scored here.
+
+        Returns:
+            list[str]: Names of templates in similar color.
+                Templates nearest in feature first, then the others,
+                each of them are in the order of most frequent hit and known templates first.
+        """
+        if len(self._index_names) != len(self.templates):
+            self.build_template_index()
+        names = self._index_names
+        if not names:
+            return []
+
+        # Match frequently hit templates first
+        order = np.argsort([self.templates_hit[name] for name in names])[::-1]
+        # Match known templates first
+        digit = self._index_digit[order]
+        order = np.concatenate([order[~digit], order[digit]])
+        # Same as color_similar(threshold=30) on each template
+        diff = np.subtract(color, self._index_colors[order])
+        tolerance = np.max(np.maximum(diff, 0), axis=1) - np.min(np.minimum(diff, 0), axis=1)
+        order = order[tolerance <= 30]
+
+        if len(order) > self.template_shortlist:
+            if score is None:
+                score = self._index_features[order] @ feature
+            else:
+                if len(score) < len(names):
+                    score = np.concatenate([score, self._index_features[len(score):] @ feature])
+                score = score[order]
+            nearest = np.zeros(len(order), dtype=bool)
+            nearest[np.argpartition(-score, self.template_shortlist)[:self.template_shortlist]] = True
+            order = np.concatenate([order[nearest], order[~nearest]])
+
+        return [names[index] for index in order]
+
+    def match_template(self, image, similarity=None, feature=None, score=None):
+        """
+        Match templates, try the nearest templates in feature first, then the most frequent hit ones.
 
         Args:
             image (np.ndarray):
             similarity (float):
+            feature (np.ndarray): Feature of image at template_area, if already calculated.
+            score (np.ndarray): Feature scores of templates in index, if already calculated.
 
         Returns:
             str: Template name.
         """
         if similarity is None:
             similarity = self.similarity
-        color = cv2.mean(crop(image, self.template_area))[:3]
-        # Match frequently hit templates first
-        names = np.array(list(self.templates.keys()))[np.argsort(list(self.templates_hit.values()))][::-1]
-        # Match known templates first
-        names = [name for name in names if not name.isdigit()] + [name for name in names if name.isdigit()]
-        for name in names:
-            if color_similar(color1=color, color2=self.colors[name], threshold=30):
-                res = cv2.matchTemplate(image, self.templates[name], cv2.TM_CCOEFF_NORMED)
-                _, sim, _, _ = cv2.minMaxLoc(res)
-                if sim > similarity:
-                    self.templates_hit[name] += 1
-                    return name
+        area_image = crop(image, self.template_area)
+        color = cv2.mean(area_image)[:3]
+        if feature is None:
+            feature = self.template_feature([area_image])[0]
+        for name in self._template_candidates(color, feature, score=score):
+            res = cv2.matchTemplate(image, self.templates[name], cv2.TM_CCOEFF_NORMED)
+            _, sim, _, _ = cv2.minMaxLoc(res)
+            if sim > similarity:
+                self.templates_hit[name] += 1
+                return name
 
         self.next_template_index += 1
         name = str(self.next_template_index)
@@ -251,8 +345,31 @@ class ItemGrid:
         self.colors[name] = cv2.mean(image)[:3]
         self.templates[name] = image
         self.templates_hit[name] = self.templates_hit.get(name, 0) + 1
+        self._template_index_add(name)
         return name
 
+    def match_templates(self, images, similarity=None):
+        """
+        Match templates on all item images.
+        Features of all images and their scores against all templates are calculated in one pass,
+        templates created during matching are scored when needed.
+
+        Args:
+            images (list[np.ndarray]):
+            similarity (float):
+
+        Returns:
+            list[str]: Template names.
+        """
+        if len(self._index_names) != len(self.templates):
+            self.build_template_index()
+        features = self.template_feature([crop(image, self.template_area) for image in images])
+        scores = features @ self._index_features.T
+        return [
+            self.match_template(image, similarity=similarity, feature=feature, score=score)
+            for image, feature, score in zip(images, features, scores)
+        ]
+
     def extract_template(self, image, folder=None):
         """
         Args:
@@ -265,8 +382,8 @@ class ItemGrid:
         self._load_image(image)
         prev = set(self.templates.keys())
         new = {}
-        for item in self.items:
-            name = self.match_template(item.image, similarity=self.extract_similarity)
+        names = self.match_templates([item.image for item in self.items], similarity=self.extract_similarity)
+        for item, name in zip(self.items, names):
             if name not in prev:
                 new[name] = item.image
                 # Rollback changes
@@ -355,7 +472,7 @@ class ItemGrid:
             for item, a in zip(self.items, amount_list):
                 item.amount = a
         if name:
-            name_list = [self.match_template(item.image) for item in self.items]
+            name_list = self.match_templates([item.image for item in self.items])
             for item, n in zip(self.items, name_list):
                 item.name = n
         if cost:
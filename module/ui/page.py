@@ -1,5 +1,6 @@
 import traceback
 
+from module.base.button_batch import ButtonBatch
 from module.coalition.assets import *
 from module.event_hospital.assets import HOSIPITAL_CHECK
 from module.freebies.assets import MAIL_ENTER
@@ -13,6 +14,16 @@ class Page:
     # Key: str, page name like "page_main"
     # Value: Page, page instance
     all_pages = {}
+    # ButtonBatch of all check buttons, built on first use
+    _check_button_batch = None
+    # Key: Page, destination. Value: dict of {page: next page on the shortest route to destination}
+    # Page graph is static, so routes of all pairs are built once on first use
+    _route_table = None
+    # Key: Page. Value: set of pages linked from or linking to it
+    _neighbour_table = None
+    # Pages whose check button color differs less than this are candidates of the current page.
+    # Loose because check buttons may move within the offset of template matching.
+    CANDIDATE_THRESHOLD = 30
 
     @classmethod
     def clear_connection(cls):
@@ -22,27 +33,97 @@ class Page:
     @classmethod
     def init_connection(cls, destination):
         """
-        Initialize an A* path finding among pages.
+        Set `parent` of each page to the next page on the shortest route to destination.
 
         Args:
             destination (Page):
         """
         cls.clear_connection()
+        for page, parent in cls.route_table().get(destination, {}).items():
+            page.parent = parent
 
-        visited = [destination]
-        visited = set(visited)
-        while 1:
-            new = visited.copy()
-            for page in visited:
-                for link in cls.iter_pages():
-                    if link in visited:
-                        continue
-                    if page in link.links:
-                        link.parent = page
-                        new.add(link)
-            if len(new) == len(visited):
-                break
-            visited = new
+    @classmethod
+    def route_table(cls):
+        """
+        Breadth-first search from each destination backwards, on the links of all pages.
+
+        Returns:
+            dict[Page, dict[Page, Page]]: Key: destination, value: {page: next page}.
+                Pages unable to reach destination are not included.
+        """
+        if cls._route_table is None:
+            pages = list(cls.iter_pages())
+            # Pages linking to each page
+            sources = {page: [] for page in pages}
+            for page in pages:
+                for link in page.links:
+                    if link in sources:
+                        sources[link].append(page)
+
+            table = {}
+            for destination in pages:
+                route = {}
+                visited = {destination}
+                frontier = [destination]
+                while frontier:
+                    new = []
+                    for page in frontier:
+                        for source in sources[page]:
+                            if source in visited:
+                                continue
+                            visited.add(source)
+                            route[source] = page
+                            new.append(source)
+                    frontier = new
+                table[destination] = route
+
+            cls._neighbour_table = {page: set(page.links).union(sources[page]) for page in pages}
+            cls._route_table = table
+        return cls._route_table
+
+    @classmethod
+    def neighbours(cls, page):
+        """
+        Returns:
+            set[Page]: Pages linked from or linking to the given page.
+        """
+        cls.route_table()
+        return cls._neighbour_table.get(page, set())
+
+    @classmethod
+    def sort_by_likelihood(cls, pages, color_diff, last=None):
+        """
+        Sort pages by how likely they are the current page.
+
+        Candidates, pages whose check button color is within CANDIDATE_THRESHOLD, come first, ordered by:
+        the last known page, its neighbours, then other candidates.
+        Other pages follow, ordered by color difference.
+        Pages of the same priority keep their order in `pages`,
+        so the result depends on current screenshot and `last` only.
+
+        Args:
+            pages (Iterable[Page]):
+            color_diff (callable): Function that receives a Page and returns its color difference.
+            last (Page): Last known page, or None.
+
+        Returns:
+            list[Page]:
+        """
+        neighbours = cls.neighbours(last) if last is not None else set()
+
+        def key(page):
+            diff = color_diff(page)
+            if diff > cls.CANDIDATE_THRESHOLD:
+                return 1, diff
+            if last is not None and page == last:
+                return 0, 0
+            elif page in neighbours:
+                return 0, 1
+            else:
+                return 0, 2
+
+        # Sort is stable
+        return sorted(pages, key=key)
 
     @classmethod
     def iter_pages(cls):
@@ -53,6 +134,17 @@ class Page:
         for page in cls.all_pages.values():
             yield page.check_button
 
+    @classmethod
+    def check_button_batch(cls):
+        """
+        Returns:
+            ButtonBatch: Check buttons of all pages.
+        """
+        if cls._check_button_batch is None:
+            buttons = [button for button in cls.iter_check_buttons() if button is not None]
+            cls._check_button_batch = ButtonBatch(buttons, name="PAGE_CHECK")
+        return cls._check_button_batch
+
     def __init__(self, check_button):
         self.check_button = check_button
         self.links = {}
@@ -60,6 +152,8 @@ class Page:
         self.name = text[: text.find("=")].strip()
         self.parent = None
         Page.all_pages[self.name] = self
+        Page._check_button_batch = None
+        Page._route_table = None
 
     def __eq__(self, other):
         return self.name == other.name
@@ -72,6 +166,7 @@ class Page:
 
     def link(self, button, destination):
         self.links[destination] = button
+        Page._route_table = None
 
 
 """
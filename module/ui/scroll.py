@@ -1,10 +1,9 @@
 import numpy as np
-from scipy import signal
 
 from module.base.base import ModuleBase
 from module.base.button import Button
 from module.base.timer import Timer
-from module.base.utils import color_similarity_2d, random_rectangle_point, rgb2gray
+from module.base.utils import color_similarity_2d, find_peaks, random_rectangle_point, rgb2gray
 from module.logger import logger
 
 
@@ -236,7 +235,7 @@ class AdaptiveScroll(Scroll):
             "width": 2,
         }
         parameters.update(self.parameters)
-        peaks, _ = signal.find_peaks(image, **parameters)
+        peaks, _ = find_peaks(image, **parameters)
         peaks //= wlen
 
         self.length = len(peaks)
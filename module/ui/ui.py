@@ -153,6 +153,76 @@ class UI(InfoHandler):
         else:
             return self.appear(check_button, offset=offset)
 
+    def ui_page_color_diff(self):
+        """
+        Returns:
+            callable: Function that receives a Page and returns color difference of its check button
+                on current screenshot.
+        """
+        diff = Page.check_button_batch().color_diff(self.device.image)
+        inf = float("inf")
+
+        def color_diff(page):
+            value = diff.get(page.check_button, inf)
+            # ui_page_appear(page_main) also accepts page_main_white
+            if page == page_main:
+                value = min(value, diff.get(page_main_white.check_button, inf))
+            return value
+
+        return color_diff
+
+    def ui_pages_appear(self, pages, offset=(30, 30)):
+        """
+        Batched `ui_page_appear()`, check buttons are matched in one `appear_batch()` call.
+
+        Args:
+            pages (list[Page]):
+            offset:
+
+        Returns:
+            list[Page]: Pages appear on current screenshot, in the given order.
+        """
+
+        def batched(page):
+            # page_main has its own offset and accepts page_main_white
+            return page != page_main and isinstance(page.check_button, Button)
+
+        buttons = [page.check_button for page in pages if batched(page)]
+        result = self.appear_batch(buttons, offset=offset) if buttons else {}
+        return [
+            page for page in pages
+            if (result[page.check_button] if batched(page) else self.ui_page_appear(page=page, offset=offset))
+        ]
+
+    def ui_match_page(self):
+        """
+        Returns:
+            Page: Known page appears on current screenshot, or None.
+                If several pages appear, the one defined first is returned,
+                the same as testing pages in definition order.
+                Candidates are tested first, see Page.sort_by_likelihood(),
+                so template matching usually ends in a few tries.
+        """
+        color_diff = self.ui_page_color_diff()
+        # Definition order
+        pages = [page for page in Page.iter_pages() if page.check_button is not None]
+        order = {page: index for index, page in enumerate(pages)}
+        pages = Page.sort_by_likelihood(pages, color_diff, last=getattr(self, "ui_current", None))
+
+        for index, page in enumerate(pages):
+            if not self.ui_page_appear(page=page):
+                continue
+            # Pages defined before it and not tested yet may appear too,
+            # color difference doesn't rule them out, check buttons may move within offset.
+            earlier = sorted([other for other in pages[index + 1:] if order[other] < order[page]], key=order.get)
+            if earlier:
+                appear = self.ui_pages_appear(earlier)
+                if appear:
+                    return appear[0]
+            return page
+
+        return None
+
     def ui_get_current_page(self, skip_first_screenshot=True):
         """
         Args:
@@ -189,13 +259,11 @@ class UI(InfoHandler):
                 break
 
             # Known pages
-            for page in Page.iter_pages():
-                if page.check_button is None:
-                    continue
-                if self.ui_page_appear(page=page):
-                    logger.attr("UI", page.name)
-                    self.ui_current = page
-                    return page
+            page = self.ui_match_page()
+            if page is not None:
+                logger.attr("UI", page.name)
+                self.ui_current = page
+                return page
 
             # Unknown page but able to handle
             logger.info("Unknown ui page")
@@ -253,6 +321,7 @@ class UI(InfoHandler):
             # Destination page
             if self.ui_page_appear(page=destination, offset=offset):
                 logger.info(f"Page arrive: {destination}")
+                self.ui_current = destination
                 break
 
             # Other pages
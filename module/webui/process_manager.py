@@ -37,6 +37,11 @@ class ProcessManager:
         self.renderables: list[ConsoleRenderable] = []
         self.renderables_max_length = 400
         self.renderables_reduce_length = 80
+        # Sequence number of the next renderable, counted since manager created
+        self.renderables_seq = 0
+        self._renderables_lock = threading.Lock()
+        # Last renderable and its plain text, used in `state`
+        self._last_text = (None, "")
         self._process: Process = None
         self._process_locks: dict[str, threading.Lock] = {}
         self.thd_log_queue_handler: threading.Thread = None
@@ -73,11 +78,12 @@ class ProcessManager:
         with lock:
             if self.alive:
                 self._process.kill()
-                self.renderables.append(f"[{self.config_name}] exited. Reason: Manual stop\n")
+                self.append_renderable(f"[{self.config_name}] exited. Reason: Manual stop\n")
             if self.thd_log_queue_handler is not None:
                 self.thd_log_queue_handler.join(timeout=1)
                 if self.thd_log_queue_handler.is_alive():
                     logger.warning("Log queue handler thread does not stop within 1 seconds")
+        self.release_rendered_log()
         logger.info(f"[{self.config_name}] exited")
 
     def _thread_log_queue_handler(self) -> None:
@@ -86,10 +92,38 @@ class ProcessManager:
                 log = self._renderable_queue.get(timeout=1)
             except queue.Empty:
                 continue
-            self.renderables.append(log)
+            self.append_renderable(log)
+        self.release_rendered_log()
+        logger.info("End of log queue handler loop")
+
+    def release_rendered_log(self) -> None:
+        """
+        Release HTML rendered from renderables, shared by web UI sessions.
+        """
+        from module.webui.widgets import RenderedLog
+
+        RenderedLog.evict(self)
+
+    def append_renderable(self, renderable: ConsoleRenderable) -> None:
+        with self._renderables_lock:
+            self.renderables.append(renderable)
+            self.renderables_seq += 1
             if len(self.renderables) > self.renderables_max_length:
                 self.renderables = self.renderables[self.renderables_reduce_length :]
-        logger.info("End of log queue handler loop")
+
+    def renderables_since(self, seq: int) -> tuple[int, list[ConsoleRenderable]]:
+        """
+        Args:
+            seq: Sequence number of the first renderable wanted.
+
+        Returns:
+            Sequence number of the first returned renderable, and renderables from it.
+            If renderables from `seq` are already dropped, return from the oldest one kept.
+        """
+        with self._renderables_lock:
+            first = self.renderables_seq - len(self.renderables)
+            start = max(seq, first)
+            return start, self.renderables[start - first :]
 
     @property
     def alive(self) -> bool:
@@ -105,10 +139,13 @@ class ProcessManager:
         elif len(self.renderables) == 0:
             return 2
         else:
-            console = Console(no_color=True)
-            with console.capture() as capture:
-                console.print(self.renderables[-1])
-            s = capture.get().strip()
+            last = self.renderables[-1]
+            if self._last_text[0] is not last:
+                console = Console(no_color=True)
+                with console.capture() as capture:
+                    console.print(last)
+                self._last_text = (last, capture.get().strip())
+            s = self._last_text[1]
             if s.endswith("Reason: Manual stop"):
                 return 2
             elif s.endswith("Reason: Finish"):
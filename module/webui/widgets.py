@@ -3,6 +3,7 @@ import json
 import pywebio.pin
 import random
 import string
+import threading
 from typing import Any, Dict, List, Optional, TYPE_CHECKING, Union
 from collections.abc import Callable, Generator
 
@@ -70,6 +71,102 @@ class ScrollableCode:
         self.keep_bottom = b
 
 
+class RenderedLog:
+    """
+    HTML of the log records of a ProcessManager.
+    Each record is rendered once and shared by all browser sessions having the same theme and width,
+    sessions fetch the records they haven't received by sequence number.
+    """
+
+    # Key: (config_name, terminal theme id, width)
+    _instances: dict[tuple, "RenderedLog"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, pm: ProcessManager, terminal_theme, width: int) -> None:
+        self.pm = pm
+        self.terminal_theme = terminal_theme
+        self.console = HTMLConsole(
+            force_terminal=False,
+            force_interactive=False,
+            width=width,
+            color_system="truecolor",
+            markup=False,
+            record=True,
+            safe_box=False,
+            highlighter=Highlighter(),
+            theme=WEB_THEME,
+        )
+        # Rendered records, self.html[0] has sequence number self.first_seq
+        self.html: list[str] = []
+        self.first_seq = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def get(cls, pm: ProcessManager, terminal_theme, width: int) -> "RenderedLog":
+        key = (pm.config_name, id(terminal_theme), width)
+        with cls._instances_lock:
+            instance = cls._instances.get(key)
+            if instance is None or instance.pm is not pm:
+                instance = cls(pm, terminal_theme, width)
+                cls._instances[key] = instance
+            return instance
+
+    @classmethod
+    def evict(cls, pm: ProcessManager) -> None:
+        """
+        Drop rendered logs of a ProcessManager, called when it stops.
+        Sessions still showing its log get a new instance, which renders the records kept in `pm` again.
+        """
+        with cls._instances_lock:
+            for key, instance in list(cls._instances.items()):
+                if instance.pm is pm:
+                    del cls._instances[key]
+
+    @property
+    def next_seq(self) -> int:
+        return self.first_seq + len(self.html)
+
+    def render(self, renderable: ConsoleRenderable) -> str:
+        with self.console.capture():
+            self.console.print(renderable)
+
+        html = self.console.export_html(
+            theme=self.terminal_theme,
+            clear=True,
+            code_format=LOG_CODE_FORMAT,
+            inline_styles=True,
+        )
+        # print(html)
+        return html
+
+    def _update(self) -> None:
+        start, renderables = self.pm.renderables_since(self.next_seq)
+        if start > self.next_seq:
+            # Records dropped before being rendered
+            self.html = []
+            self.first_seq = start
+        self.html.extend(map(self.render, renderables))
+        # Keep the same length as ProcessManager.renderables
+        while len(self.html) > self.pm.renderables_max_length:
+            self.html = self.html[self.pm.renderables_reduce_length :]
+            self.first_seq += self.pm.renderables_reduce_length
+
+    def since(self, seq: int | None) -> tuple[int, str]:
+        """
+        Args:
+            seq: Sequence number of the first record wanted, None for all records kept.
+
+        Returns:
+            Sequence number of the next record, and HTML of records from `seq`.
+            If records from `seq` are already dropped, return from the oldest one kept.
+        """
+        with self.lock:
+            self._update()
+            if seq is None or seq < self.first_seq:
+                seq = self.first_seq
+            return self.next_seq, "".join(self.html[seq - self.first_seq :])
+
+
 class RichLog:
     last_display_time: dict
 
@@ -192,21 +289,23 @@ class RichLog:
         yield
         try:
             while True:
-                last_idx = len(pm.renderables)
-                html = "".join(map(self.render, pm.renderables[:]))
+                # Records are rendered in RenderedLog and shared with other sessions,
+                # this session only sends what it hasn't sent.
+                rendered = RenderedLog.get(pm, self.terminal_theme, self.console.width)
+                seq, html = rendered.since(None)
                 self.reset()
                 self.extend(html)
-                counter = last_idx
+                counter = seq - rendered.first_seq
                 while counter < pm.renderables_max_length * 2:
                     yield
-                    idx = len(pm.renderables)
-                    if idx < last_idx:
-                        last_idx -= pm.renderables_reduce_length
-                    if idx != last_idx:
-                        html = "".join(map(self.render, pm.renderables[last_idx:idx]))
+                    last_seq = seq
+                    # Get again, instance is dropped when pm stops.
+                    # Sequence numbers are counted by pm, so they continue on the new instance.
+                    rendered = RenderedLog.get(pm, self.terminal_theme, self.console.width)
+                    seq, html = rendered.since(seq)
+                    if html:
                         self.extend(html)
-                        counter += idx - last_idx
-                        last_idx = idx
+                        counter += seq - last_seq
         except SessionException:
             pass
 
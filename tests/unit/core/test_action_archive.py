@@ -0,0 +1,225 @@
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from module.base.frame import image_thumbnail
+from module.device.action_archive import ActionArchive, read_archive
+from module.device.device import Device
+
+CREATED = 1600000000.
+SHAPE = (720, 1280, 3)
+
+
+BACKGROUND = np.random.default_rng(0).integers(0, 256, SHAPE, dtype=np.uint8)
+
+
+def screen(box=None):
+    """
+    A noisy background that doesn't compress, with a white box like a popup.
+    """
+    image = BACKGROUND.copy()
+    if box is not None:
+        x1, y1, x2, y2 = box
+        image[y1:y2, x1:x2] = 255
+    return image
+
+
+def segments(folder):
+    return sorted(str(file)[:-4] for file in folder.glob('*/*.idx'))
+
+
+def test_kinds(tmp_path):
+    archive = ActionArchive(folder=str(tmp_path), keyframe_interval=2)
+    images = [
+        screen(),
+        # Small change, delta of the keyframe
+        screen(box=(100, 100, 200, 200)),
+        # Unchanged, nothing written
+        screen(box=(100, 100, 200, 200)),
+        screen(box=(300, 100, 400, 200)),
+        # Over keyframe interval
+        screen(box=(500, 100, 600, 200)),
+        # Whole screen changed, delta doesn't help
+        255 - BACKGROUND,
+    ]
+    for i, image in enumerate(images):
+        archive.write(image, CREATED + i, action='click', button=f'BUTTON_{i}')
+    archive.close()
+
+    result = list(read_archive(segments(tmp_path)[0]))
+    assert [entry['kind'] for entry, _ in result] == ['key', 'delta', 'dup', 'delta', 'key', 'key']
+    # Duplicate refers to the last written frame, deltas refer to the keyframe
+    assert result[2][0]['ref'] == 1
+    assert result[3][0]['ref'] == 0
+    assert [entry['button'] for entry, _ in result] == [f'BUTTON_{i}' for i in range(6)]
+    for (_, image), expected in zip(result, images):
+        assert np.array_equal(image, expected)
+
+
+def test_shape_changed(tmp_path):
+    archive = ActionArchive(folder=str(tmp_path))
+    small = np.zeros((360, 640, 3), dtype=np.uint8)
+    archive.write(screen(), CREATED)
+    archive.write(small, CREATED + 1)
+    archive.close()
+
+    result = list(read_archive(segments(tmp_path)[0]))
+    assert [entry['kind'] for entry, _ in result] == ['key', 'key']
+    assert result[1][1].shape == small.shape
+
+
+def test_new_segment_every_hour(tmp_path):
+    archive = ActionArchive(folder=str(tmp_path))
+    archive.write(screen(), CREATED)
+    # Same image in the next hour is a new keyframe, not a duplicate across segments
+    archive.write(screen(), CREATED + 3600)
+    archive.close()
+
+    prefixes = segments(tmp_path)
+    assert len(prefixes) == 2
+    for prefix in prefixes:
+        [(entry, image)] = list(read_archive(prefix))
+        assert entry['kind'] == 'key'
+        assert entry['ref'] == 0
+        assert np.array_equal(image, screen())
+
+
+def test_two_writers(tmp_path):
+    """
+    Two instances archiving the same hour must not interleave entries in one segment.
+    """
+    archives = [ActionArchive(folder=str(tmp_path)) for _ in range(2)]
+    images = [
+        [screen(box=(i * 50, 100, i * 50 + 40, 200)) for i in range(10)],
+        [screen(box=(100, i * 50, 200, i * 50 + 40)) for i in range(10)],
+    ]
+
+    def write(archive, frames):
+        for i, image in enumerate(frames):
+            archive.write(image, CREATED + i)
+
+    threads = [threading.Thread(target=write, args=(a, f)) for a, f in zip(archives, images)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for archive in archives:
+        archive.close()
+
+    prefixes = segments(tmp_path)
+    assert len(prefixes) == 2
+    results = [[image for _, image in read_archive(prefix)] for prefix in prefixes]
+    # Each segment holds all frames of one writer, in order
+    results.sort(key=lambda frames: np.array_equal(frames[1], images[1][1]))
+    for frames, expected in zip(results, images):
+        assert len(frames) == len(expected)
+        for image, e in zip(frames, expected):
+            assert np.array_equal(image, e)
+
+
+def test_reopen_does_not_append(tmp_path):
+    archive = ActionArchive(folder=str(tmp_path))
+    archive.write(screen(), CREATED)
+    archive.close()
+    # Another instance started later in the same hour
+    archive = ActionArchive(folder=str(tmp_path))
+    archive.write(screen(box=(0, 0, 10, 10)), CREATED + 1)
+    archive.close()
+
+    prefixes = segments(tmp_path)
+    assert [os.path.basename(prefix)[3:] for prefix in prefixes] == ['alas', 'alas_1']
+    for prefix in prefixes:
+        assert len(list(read_archive(prefix))) == 1
+
+
+def test_partial_index_line(tmp_path):
+    """
+    A process killed during writing may leave half an index line.
+    """
+    archive = ActionArchive(folder=str(tmp_path))
+    archive.write(screen(), CREATED)
+    archive.write(screen(box=(0, 0, 10, 10)), CREATED + 1)
+    archive.close()
+    prefix = segments(tmp_path)[0]
+    with open(f'{prefix}.idx', 'ab') as f:
+        f.write(json.dumps({'time': CREATED + 2})[:10].encode())
+
+    assert len(list(read_archive(prefix))) == 2
+
+
+def test_worker(tmp_path):
+    archive = ActionArchive(folder=str(tmp_path), drop=False)
+    for i in range(5):
+        archive.put(screen(box=(i * 10, 0, i * 10 + 10, 10)), action='swipe', button=f'B{i}')
+    archive.stop()
+
+    result = list(read_archive(segments(tmp_path)[0]))
+    assert [entry['button'] for entry, _ in result] == [f'B{i}' for i in range(5)]
+    assert archive._file is None
+
+
+def test_drop_when_busy(tmp_path):
+    archive = ActionArchive(folder=str(tmp_path), queue_size=1, drop=True)
+    # Worker not started, queue is never consumed
+    archive._thread = object()
+    image = np.zeros(SHAPE, dtype=np.uint8)
+    assert archive.put(image)
+    assert not archive.put(image)
+    assert archive.dropped == 1
+
+
+def test_put_copies_image(tmp_path):
+    archive = ActionArchive(folder=str(tmp_path), queue_size=1)
+    archive._thread = object()
+    image = screen()
+    archive.put(image)
+    # Screenshot buffer may be reused by the next screenshot
+    image[:] = 0
+    queued = archive._queue.get_nowait()[0]
+    assert np.array_equal(queued, screen())
+
+
+@pytest.mark.parametrize('name', ['alas', 'alas2'])
+def test_name(tmp_path, name):
+    archive = ActionArchive(folder=str(tmp_path), name=name)
+    archive.write(screen(), CREATED)
+    archive.close()
+    assert segments(tmp_path)[0].endswith(f'_{name}')
+
+
+def test_small_change_not_dup(tmp_path):
+    """
+    A few pixels changed, such as a digit, may keep the same thumbnail. It's still archived.
+    """
+    archive = ActionArchive(folder=str(tmp_path))
+    image = screen()
+    changed = image.copy()
+    changed[300:302, 600:602] ^= 0x01
+    assert np.array_equal(image_thumbnail(image), image_thumbnail(changed))
+    archive.write(image, CREATED)
+    archive.write(changed, CREATED + 1)
+    archive.write(changed.copy(), CREATED + 2)
+    archive.close()
+
+    result = list(read_archive(segments(tmp_path)[0]))
+    assert [entry['kind'] for entry, _ in result] == ['key', 'delta', 'dup']
+    assert np.array_equal(result[1][1], changed)
+    assert np.array_equal(result[2][1], changed)
+
+
+def test_stop_on_release(tmp_path):
+    archive = ActionArchive(folder=str(tmp_path), drop=False)
+    archive.put(screen(), action='click')
+    device = SimpleNamespace(config=SimpleNamespace(Emulator_ScreenshotMethod='ADB'), _action_archive=archive)
+    Device.release_during_wait(device)
+    assert archive._thread is None
+    assert archive._file is None
+    assert len(list(read_archive(segments(tmp_path)[0]))) == 1
+    # Worker starts again on the next action
+    assert archive.put(screen(box=(0, 0, 10, 10)))
+    archive.stop()
+    assert len(segments(tmp_path)) == 2
@@ -0,0 +1,162 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+import module.base.button as button_module
+import module.base.template as template_module
+from module.base.asset_bundle import AssetBundle, compile_bundle
+from module.base.button import Button
+from module.base.template import Template
+from module.base.utils import save_image
+
+AREA = (10, 20, 110, 70)
+
+
+@pytest.fixture
+def source(tmp_path):
+    y, x = np.indices((720, 1280))
+    image = np.stack([x % 256, y % 256, (x + y) % 256], axis=2).astype(np.uint8)
+    file = str(tmp_path / 'BUTTON.png')
+    save_image(image, file)
+    return file
+
+
+def decode(file, area):
+    button = Button(area=area, color=(), button=area, file=file)
+    button.ensure_template()
+    button.ensure_binary_template()
+    button.ensure_luma_template()
+    return {'image': button.image, 'binary': button.image_binary, 'luma': button.image_luma}
+
+
+@pytest.fixture
+def bundle(source, tmp_path):
+    file = str(tmp_path / 'assets.bundle')
+    compile_bundle([(source, AREA, decode(source, AREA))], file=file)
+    return AssetBundle(file=file)
+
+
+def test_duplicated_entries(source, tmp_path):
+    file = str(tmp_path / 'assets.bundle')
+    items = [(source, area, decode(source, area)) for area in [AREA, (500, 300, 600, 400), AREA]]
+    assert compile_bundle(items, file=file) == 2
+    bundle = AssetBundle(file=file)
+    assert bundle.get(source, (500, 300, 600, 400)) is not None
+    # Area not compiled, and the whole image of a Template
+    assert bundle.get(source, (0, 0, 10, 10)) is None
+    assert bundle.get(source) is None
+
+
+def test_read_only(bundle, source):
+    bundled = bundle.get(source, AREA)
+    for name in ['image', 'binary', 'luma']:
+        assert not bundled[name].flags.writeable
+        with pytest.raises(ValueError):
+            bundled[name][0, 0] = 0
+
+
+def test_touched_source(bundle, source):
+    """
+    Modify time changes on git checkout, content is the same.
+    """
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert bundle.get(source, AREA) is not None
+
+
+def test_source_changed(bundle, source):
+    save_image(np.zeros((720, 1280, 3), dtype=np.uint8), source)
+    assert bundle.get(source, AREA) is None
+
+
+def test_source_deleted(bundle, source):
+    os.remove(source)
+    assert bundle.get(source, AREA) is None
+
+
+@pytest.mark.parametrize('content', [b'', b'\x10\x00\x00\x00\x00\x00\x00\x00{"sources":', b'\xff' * 100])
+def test_broken_bundle(tmp_path, source, content):
+    file = tmp_path / 'assets.bundle'
+    file.write_bytes(content)
+    assert AssetBundle(file=str(file)).get(source, AREA) is None
+
+
+def test_no_bundle(source, tmp_path):
+    assert AssetBundle(file=str(tmp_path / 'not_exist.bundle')).get(source, AREA) is None
+
+
+def test_disabled(bundle, source):
+    bundle.enabled = False
+    assert bundle.get(source, AREA) is None
+
+
+def test_recompiled_while_reading(bundle, source):
+    """
+    Bundle is replaced, not written in place, views from the old one stay valid.
+    """
+    old = bundle.get(source, AREA)['image']
+    expected = old.copy()
+    compile_bundle([(source, (0, 0, 50, 50), decode(source, (0, 0, 50, 50)))], file=bundle.file)
+    assert np.array_equal(old, expected)
+    # New entries are seen after reload
+    assert bundle.get(source, (0, 0, 50, 50)) is None
+    bundle.release()
+    assert bundle.get(source, (0, 0, 50, 50)) is not None
+    assert bundle.get(source, AREA) is None
+
+
+def test_gif(tmp_path, source):
+    frames = [np.full((10, 10, 3), i * 50, dtype=np.uint8) for i in range(3)]
+    arrays = {'image': frames, 'binary': [f[:, :, 0] for f in frames], 'luma': [f[:, :, 1] for f in frames]}
+    file = str(tmp_path / 'assets.bundle')
+    compile_bundle([(source, None, arrays)], file=file)
+    bundled = AssetBundle(file=file).get(source)
+    assert len(bundled['image']) == 3
+    for frame, expected in zip(bundled['image'], frames):
+        assert np.array_equal(frame, expected)
+
+
+def test_concurrent_load(bundle, source):
+    results = []
+
+    def get():
+        results.append(bundle.get(source, AREA))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result is not None for result in results)
+    assert all(np.shares_memory(result['image'], results[0]['image']) for result in results)
+
+
+def test_button_uses_bundle(bundle, source, monkeypatch):
+    monkeypatch.setattr(button_module, 'ASSET_BUNDLE', bundle)
+    button = Button(area=AREA, color=(), button=AREA, file=source)
+    button.ensure_template()
+    assert not button.image.flags.writeable
+    assert np.array_equal(button.image, decode(source, AREA)['image'])
+
+
+def test_template_pre_process_not_bundled(tmp_path, source, monkeypatch):
+    """
+    Bundle stores images before pre_process(), subclasses overriding it decode from source.
+    """
+    file = str(tmp_path / 'assets.bundle')
+    template = Template(file=source)
+    arrays = {'image': template.image, 'binary': template.image_binary, 'luma': template.image_luma}
+    compile_bundle([(source, None, arrays)], file=file)
+    bundle = AssetBundle(file=file)
+    monkeypatch.setattr(template_module, 'ASSET_BUNDLE', bundle)
+    assert not Template(file=source).image.flags.writeable
+
+    class Inverted(Template):
+        def pre_process(self, image):
+            return 255 - image
+
+    image = Inverted(file=source).image
+    assert image.flags.writeable
+    assert np.array_equal(image, 255 - template.image)
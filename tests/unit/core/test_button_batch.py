@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+import module.config.server as server
+from module.base.button import Button
+from module.base.button_batch import ButtonBatch, get_colors
+from module.base.utils import color_similarity, get_color
+
+RED = (200, 30, 30)
+BLUE = (30, 30, 200)
+
+
+def screenshot(color=RED, area=(100, 100, 200, 150)):
+    image = np.full((720, 1280, 3), 64, dtype=np.uint8)
+    x1, y1, x2, y2 = area
+    image[y1:y2, x1:x2] = color
+    return image
+
+
+class CountButton(Button):
+    """
+    Button that records template matching instead of doing it.
+    """
+
+    def __init__(self, area, color, name, matched=False):
+        super().__init__(area=area, color=color, button=area, name=name)
+        self.matched = matched
+        self.match_count = 0
+
+    def match(self, image, offset=30, similarity=0.85):
+        self.match_count += 1
+        return self.matched
+
+
+class FakeTemplate:
+    def __init__(self, name, matched=False):
+        self.name = name
+        self.matched = matched
+        self.match_count = 0
+
+    def match(self, image, similarity=0.85):
+        self.match_count += 1
+        return self.matched
+
+
+class TestGetColors:
+    @pytest.mark.parametrize('area', [
+        # Partly out of image, padded with black
+        (-10, -10, 10, 10),
+        (1270, 700, 1290, 730),
+        # Entirely out of image
+        (1300, 0, 1310, 10),
+        # Single pixel on the edge of colored area
+        (199, 149, 200, 150),
+    ])
+    def test_area_edge_cases(self, area):
+        image = screenshot()
+        [color] = get_colors(image, [area])
+        np.testing.assert_allclose(color, get_color(image, area), atol=1e-6)
+
+    def test_empty_area(self):
+        [color] = get_colors(screenshot(), [(100, 100, 100, 150)])
+        assert color.tolist() == [0, 0, 0]
+
+
+class TestColorDiff:
+    def test_same_threshold_as_button(self):
+        """
+        Colors exactly on the threshold appear, the same as Button.appear_on().
+        """
+        image = screenshot(color=(210, 30, 30))
+        button = Button(area=(100, 100, 200, 150), color=RED, button=(100, 100, 200, 150), name='RED')
+        diff = ButtonBatch([button]).color_diff(image)
+        assert diff[button] == color_similarity(get_color(image, button.area), RED) == 10
+        assert ButtonBatch([button]).appear_on(image, threshold=10)[button] == button.appear_on(image, threshold=10)
+        assert not ButtonBatch([button]).appear_on(image, threshold=9)[button]
+
+    def test_new_screenshot(self):
+        button = Button(area=(100, 100, 200, 150), color=RED, button=(100, 100, 200, 150), name='RED')
+        batch = ButtonBatch([button])
+        assert batch.appear_on(screenshot(RED))[button]
+        assert not batch.appear_on(screenshot(BLUE))[button]
+
+    def test_empty(self):
+        batch = ButtonBatch([FakeTemplate('TEMPLATE')])
+        assert batch.color_diff(screenshot()) == {}
+        assert ButtonBatch([]).match_first(screenshot()) is None
+
+    def test_server_changed(self, monkeypatch):
+        """
+        Areas are parsed again after switching server.
+        """
+        button = Button(
+            area={'cn': (100, 100, 200, 150), 'en': (300, 300, 400, 350)},
+            color=RED, button=(100, 100, 200, 150), name='SERVER_BUTTON')
+        batch = ButtonBatch([button])
+        monkeypatch.setattr(server, 'server', 'cn')
+        assert batch.appear_on(screenshot())[button]
+
+        monkeypatch.setattr(server, 'server', 'en')
+        button.resource_release()
+        assert not batch.appear_on(screenshot())[button]
+        assert batch.appear_on(screenshot(area=(300, 300, 400, 350)))[button]
+
+
+class TestMatch:
+    def test_prefilter_skips_template_matching(self):
+        red = CountButton((100, 100, 200, 150), RED, 'RED', matched=True)
+        blue = CountButton((100, 100, 200, 150), BLUE, 'BLUE', matched=True)
+        template = FakeTemplate('TEMPLATE', matched=True)
+        result = ButtonBatch([red, blue, template]).match(screenshot(), prefilter=30)
+        assert result == {red: True, blue: False, template: True}
+        assert (red.match_count, blue.match_count, template.match_count) == (1, 0, 1)
+
+    def test_no_prefilter(self):
+        blue = CountButton((100, 100, 200, 150), BLUE, 'BLUE', matched=True)
+        assert ButtonBatch([blue]).match(screenshot()) == {blue: True}
+
+    def test_match_first_by_color(self):
+        template = FakeTemplate('TEMPLATE', matched=True)
+        blue = CountButton((100, 100, 200, 150), BLUE, 'BLUE', matched=True)
+        red = CountButton((100, 100, 200, 150), RED, 'RED', matched=True)
+        batch = ButtonBatch([template, blue, red])
+        assert batch.match_first(screenshot()) is red
+        assert (red.match_count, blue.match_count, template.match_count) == (1, 0, 0)
+
+    def test_iter_by_color_stable(self):
+        """
+        Buttons with the same color keep their order, buttons without color come last.
+        """
+        template = FakeTemplate('TEMPLATE')
+        first = CountButton((100, 100, 200, 150), RED, 'FIRST')
+        second = CountButton((100, 100, 200, 150), RED, 'SECOND')
+        blue = CountButton((100, 100, 200, 150), BLUE, 'BLUE')
+        result = list(ButtonBatch([template, blue, first, second]).iter_by_color(screenshot()))
+        assert result == [first, second, blue, template]
@@ -0,0 +1,108 @@
+"""
+Tests for delayed config writes, AzurLaneConfig.save_later(), flush() and ConfigWatcher.is_synced()
+"""
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+
+import pytest
+
+from module.config.config import AzurLaneConfig
+from module.config.deep import deep_get
+from module.config.utils import filepath_config
+
+CONFIG_NAME = 'pytest_config_save'
+
+
+def read_raw(keys):
+    with open(filepath_config(CONFIG_NAME), encoding='utf-8') as f:
+        data = json.load(f)
+    for key in keys.split('.'):
+        data = data[key]
+    return data
+
+
+@pytest.fixture
+def config():
+    file = filepath_config(CONFIG_NAME)
+    shutil.copy(filepath_config('template'), file)
+    config = AzurLaneConfig(CONFIG_NAME, task='Commission')
+    # Long enough that the timer never fires during a test, unless a test shortens it
+    config.SAVE_DELAY = 60
+    yield config
+    config._cancel_save_timer()
+    if os.path.exists(file):
+        os.remove(file)
+
+
+def test_save_later_is_visible_but_not_written(config):
+    config.Commission_PresetFilter = 'chip'
+    config.Commission_DoMajorCommission = True
+    assert config.Commission_PresetFilter == 'chip'
+    assert config._save_timer is not None
+    assert read_raw('Commission.Commission.PresetFilter') != 'chip'
+    # Writes of this object only, the file is still in sync
+    assert config.is_synced()
+
+    config.flush()
+    assert config._save_timer is None
+    assert not config.modified
+    assert read_raw('Commission.Commission.PresetFilter') == 'chip'
+    assert read_raw('Commission.Commission.DoMajorCommission') is True
+
+
+def test_save_later_timer(config):
+    config.SAVE_DELAY = 0.05
+    config.Commission_PresetFilter = 'chip'
+    timer = config._save_timer
+    timer.join(timeout=5)
+    assert not timer.is_alive()
+    assert config._save_timer is None
+    assert read_raw('Commission.Commission.PresetFilter') == 'chip'
+
+
+def test_flush_without_modification(config):
+    mtime = os.stat(filepath_config(CONFIG_NAME)).st_mtime_ns
+    config.flush()
+    assert os.stat(filepath_config(CONFIG_NAME)).st_mtime_ns == mtime
+
+
+def test_is_synced_modified_by_others(config):
+    assert config.is_synced()
+    other = AzurLaneConfig(CONFIG_NAME, task='Commission')
+    other.Commission_DoMajorCommission = True
+    other.flush()
+    assert not config.is_synced()
+
+    # Pending modification of this object is merged with the file modified by others
+    config.Commission_PresetFilter = 'chip'
+    config.flush()
+    assert config.is_synced()
+    assert config.Commission_DoMajorCommission is True
+    assert read_raw('Commission.Commission.PresetFilter') == 'chip'
+    assert read_raw('Commission.Commission.DoMajorCommission') is True
+
+
+def test_task_delay_survives_recreate(config):
+    from alas import AzurLaneAutoScript
+    script = AzurLaneAutoScript(CONFIG_NAME)
+    script.config.SAVE_DELAY = 60
+    # Within 24h, further delays are limited by config override
+    target = datetime.now().replace(microsecond=0) + timedelta(hours=2)
+    script.config.task_delay(target=target, task='Restart')
+    # Delayed write, still pending when config is re-created
+    script.config.cross_set('Commission.Commission.PresetFilter', 'chip')
+    script.config_reload()
+
+    assert deep_get(script.config.data, keys='Restart.Scheduler.NextRun') == target
+    assert deep_get(script.config.data, keys='Commission.Commission.PresetFilter') == 'chip'
+    assert not script.config.modified
+
+
+def test_deepcopy_gets_own_lock(config):
+    import copy
+    config.Commission_PresetFilter = 'chip'
+    copied = copy.deepcopy(config)
+    assert copied._save_lock is not config._save_lock
+    assert copied._save_timer is None
@@ -0,0 +1,48 @@
+"""
+Tests for per-screenshot caches of derived images.
+"""
+import numpy as np
+
+from module.base.frame import THUMBNAIL_SIZE, Frame, image_binary, image_thumbnail
+from module.base.utils import crop, rgb2luma
+
+
+def _screenshot(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(720, 1280, 3), dtype=np.uint8)
+
+
+class TestFrame:
+    def test_reuse_frame_of_same_image(self):
+        image = _screenshot()
+        assert Frame.get(image) is Frame.get(image)
+
+    def test_new_screenshot_invalidates(self):
+        frame = Frame.get(_screenshot(0))
+        assert Frame.get(_screenshot(1)) is not frame
+
+    def test_crops_are_cached(self):
+        frame = Frame.get(_screenshot())
+        area = (100, 100, 200, 150)
+        assert frame.crop_binary(area) is frame.crop_binary(np.array(area))
+
+    def test_same_as_direct_conversion(self):
+        image = _screenshot()
+        frame = Frame.get(image)
+        area = (-10, 690, 300, 730)
+        np.testing.assert_array_equal(frame.crop_luma(area), rgb2luma(crop(image, area)))
+        np.testing.assert_array_equal(frame.crop_binary(area), image_binary(crop(image, area)))
+
+
+class TestThumbnail:
+    def test_shape(self):
+        thumbnail = image_thumbnail(_screenshot())
+        assert thumbnail.shape == (THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0])
+
+    def test_local_change(self):
+        image = _screenshot()
+        changed = image.copy()
+        changed[100:120, 200:220] = 0
+        diff = np.abs(image_thumbnail(changed).astype(int) - image_thumbnail(image).astype(int))
+        ys, xs = np.nonzero(diff)
+        assert set(zip(ys.tolist(), xs.tolist())) == {(5, 10)}
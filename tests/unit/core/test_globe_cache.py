@@ -0,0 +1,119 @@
+import os
+
+import numpy as np
+import pytest
+
+import module.os.globe_detection as globe_detection
+from module.base.utils import save_image
+from module.config.config import AzurLaneConfig
+from module.config.config_manual import ManualConfig
+from module.os.globe_detection import GlobeDetection
+
+
+class Config(ManualConfig):
+    temporary = AzurLaneConfig.temporary
+
+
+@pytest.fixture
+def globe_map(tmp_path, monkeypatch):
+    """
+    Small globe map of grid lines, cache folder in tmp_path.
+    """
+    image = np.zeros((300, 400, 3), dtype=np.uint8)
+    image[::40, :] = (0, 200, 255)
+    image[:, ::40] = (0, 200, 255)
+    file = str(tmp_path / 'os_globe_map.png')
+    save_image(image, file)
+    monkeypatch.setattr(globe_detection, 'GLOBE_MAP', file)
+    monkeypatch.setattr(globe_detection, 'GLOBE_CACHE_FOLDER', str(tmp_path / 'cache'))
+    return file
+
+
+def cache_files():
+    return sorted(os.listdir(globe_detection.GLOBE_CACHE_FOLDER))
+
+
+def no_detection(monkeypatch):
+    def find_peaks(*args, **kwargs):
+        raise AssertionError('Globe map should be loaded from cache')
+
+    monkeypatch.setattr(GlobeDetection, 'find_peaks', find_peaks)
+
+
+def test_round_trip(globe_map, monkeypatch):
+    fresh = GlobeDetection(Config())
+    assert fresh.load_globe_map()
+    key = fresh.globe_cache_key()
+    assert cache_files() == [f'{key}.npy', f'{key}.npz']
+
+    no_detection(monkeypatch)
+    cached = GlobeDetection(Config())
+    assert cached.load_globe_map()
+    assert np.array_equal(cached.globe, fresh.globe)
+    assert not cached.globe.flags.writeable
+    assert np.array_equal(cached.homo_center, fresh.homo_center)
+    for name in ['homo_data', 'homo_invt']:
+        assert np.array_equal(getattr(cached.homography, name), getattr(fresh.homography, name))
+    assert cached.homography.homo_size == fresh.homography.homo_size
+    # Same rounded form as find_homography()
+    assert cached.homography.homo_storage == fresh.homography.homo_storage
+    assert cached.homography.homo_loaded
+
+
+def test_cache_hit_drops_tracking(globe_map, monkeypatch):
+    GlobeDetection(Config()).load_globe_map()
+    no_detection(monkeypatch)
+    globe = GlobeDetection(Config())
+    globe.homography._track_loca = np.array([10, 20])
+    globe.homography.expect_swipe((1, 0))
+    globe.load_globe_map()
+    assert globe.homography._track_loca is None
+    assert globe.homography._track_vector is None
+
+
+def test_stale_key(globe_map):
+    old = GlobeDetection(Config())
+    old.load_globe_map()
+    old_key = old.globe_cache_key()
+    folder = globe_detection.GLOBE_CACHE_FOLDER
+    # Another process writing, and files not created by cache
+    for name in [f'{old_key}.npy.1234.tmp', 'abc.npz.99.tmp', 'readme.txt']:
+        with open(os.path.join(folder, name), 'wb') as f:
+            f.write(b'data')
+
+    config = Config()
+    config.OS_GLOBE_IMAGE_PAD = 100
+    new = GlobeDetection(config)
+    new_key = new.globe_cache_key()
+    assert new_key != old_key
+    new.load_globe_map()
+    assert new.globe.shape != old.globe.shape
+    assert cache_files() == sorted([
+        f'{new_key}.npy', f'{new_key}.npz', f'{old_key}.npy.1234.tmp', 'abc.npz.99.tmp', 'readme.txt'])
+
+
+def test_asset_changed(globe_map):
+    globe = GlobeDetection(Config())
+    key = globe.globe_cache_key()
+    image = np.zeros((300, 400, 3), dtype=np.uint8)
+    image[::30, :] = (0, 200, 255)
+    save_image(image, globe_map)
+    assert globe.globe_cache_key() != key
+
+
+def test_broken_cache(globe_map):
+    GlobeDetection(Config()).load_globe_map()
+    key = GlobeDetection(Config()).globe_cache_key()
+    with open(os.path.join(globe_detection.GLOBE_CACHE_FOLDER, f'{key}.npz'), 'wb') as f:
+        f.write(b'broken')
+
+    globe = GlobeDetection(Config())
+    assert globe.load_globe_map()
+    assert globe.globe is not None
+    # Written again
+    assert GlobeDetection(Config())._load_globe_cache(key)
+
+
+def test_no_asset(globe_map, monkeypatch):
+    monkeypatch.setattr(globe_detection, 'GLOBE_MAP', globe_map + '.missing')
+    assert GlobeDetection(Config()).globe_cache_key() == ''
@@ -0,0 +1,122 @@
+import cv2
+import numpy as np
+import pytest
+
+from module.config.config_manual import ManualConfig
+from module.exception import MapDetectionError
+from module.map_detection.homography import Homography
+from module.map_detection.utils_assets import ASSETS
+
+TILE = np.array(ManualConfig.HOMO_TILE)
+OFFSET = np.array(ManualConfig.HOMO_CENTER_OFFSET)
+# Size of perspective transformed image
+SIZE = (900, 600)
+
+
+def edge_image(homo_loca):
+    """
+    Edge image of free tiles, tile centers on the lattice of `homo_loca`.
+    """
+    image = np.zeros(SIZE[::-1], dtype=np.uint8)
+    template = ASSETS.tile_center_image
+    t_h, t_w = template.shape
+    x0, y0 = (np.array(homo_loca) + OFFSET) % TILE
+    for y in range(y0, SIZE[1] - t_h + 1, TILE[1]):
+        for x in range(x0, SIZE[0] - t_w + 1, TILE[0]):
+            image[y:y + t_h, x:x + t_w] = template
+    return image
+
+
+@pytest.fixture
+def homography():
+    return Homography(ManualConfig())
+
+
+def full_search(image):
+    homography = Homography(ManualConfig())
+    assert homography.search_tile_center(image)
+    return homography.homo_loca % TILE
+
+
+def test_no_track(homography):
+    assert not homography.search_tile_track(edge_image((30, 70)))
+
+
+@pytest.mark.parametrize('drift', [(0, 0), (5, -3), (-14, 14)])
+def test_track_same_as_full_search(homography, drift):
+    image = edge_image((30, 70))
+    homography._track_loca = np.array((30, 70)) + drift
+    assert homography.search_tile_track(image)
+    assert np.array_equal(homography.homo_loca % TILE, full_search(image))
+
+
+def test_track_swipe(homography):
+    """
+    Tiles move to the opposite direction of camera swipe.
+    """
+    homography._track_loca = np.array((30, 70))
+    homography.expect_swipe((0.5, 0))
+    image = edge_image((-40, 70))
+    assert homography.search_tile_track(image)
+    assert np.array_equal(homography.homo_loca % TILE, full_search(image))
+
+
+def test_swipe_not_taken(homography):
+    homography._track_loca = np.array((30, 70))
+    homography.expect_swipe((0.5, 0))
+    image = edge_image((30, 70))
+    assert homography.search_tile_track(image)
+    assert np.array_equal(homography.homo_loca % TILE, (30, 70))
+
+
+def test_track_failure_recovered(homography):
+    """
+    Tiles out of tracking radius, the full search finds them.
+    """
+    image = edge_image((30, 70))
+    homography._track_loca = np.array((30 + 60, 70))
+    assert not homography.search_tile_track(image)
+    homography.search_tile(image)
+    assert np.array_equal(homography.homo_loca % TILE, (30, 70))
+
+
+def test_no_tile(homography):
+    homography._track_loca = np.array((30, 70))
+    with pytest.raises(MapDetectionError):
+        homography.search_tile(np.zeros(SIZE[::-1], dtype=np.uint8))
+
+
+@pytest.mark.parametrize('vector', [(1, 0), (-2, 1), (0, 3)])
+def test_swipe_whole_grids(homography, monkeypatch, vector):
+    """
+    Swiping by whole grids gives the same position modulo tile, lattice is searched once.
+    """
+    calls = []
+    match = cv2.matchTemplate
+    monkeypatch.setattr(cv2, 'matchTemplate', lambda *args: calls.append(1) or match(*args))
+    image = edge_image((30, 70))
+
+    homography._track_loca = np.array((30, 70))
+    assert homography.search_tile_track(image)
+    windows = len(calls)
+    calls.clear()
+    homography._track_loca = np.array((30, 70))
+    homography.expect_swipe(vector)
+    assert homography.search_tile_track(image)
+    assert len(calls) == windows
+    assert np.array_equal(homography.homo_loca % TILE, (30, 70))
+
+
+def test_swipe_bad_match_searched_once(homography, monkeypatch):
+    calls = []
+    match = cv2.matchTemplate
+    monkeypatch.setattr(cv2, 'matchTemplate', lambda *args: calls.append(1) or match(*args))
+    image = np.zeros(SIZE[::-1], dtype=np.uint8)
+
+    homography._track_loca = np.array((30, 70))
+    assert not homography.search_tile_track(image)
+    windows = len(calls)
+    calls.clear()
+    homography.expect_swipe((1, 1))
+    assert not homography.search_tile_track(image)
+    assert len(calls) == windows
@@ -0,0 +1,163 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from module.statistics.item import ItemGrid
+
+# Same as default template_area of ItemGrid
+X1, Y1, X2, Y2 = (40, 21, 89, 70)
+
+
+def pattern(a, b, offset=0):
+    """
+    Returns:
+        np.ndarray: 49x49 RGB template, distinct for each (a, b), mean color about 125 + offset.
+    """
+    y, x = np.indices((Y2 - Y1, X2 - X1))
+    v = (x * a + y * b + x * y) % 251
+    image = np.stack([v, (v + 85) % 251, (v + 170) % 251], axis=2) + offset
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def item(template, shift=(0, 0)):
+    image = np.full((96, 96, 3), 128, dtype=np.uint8)
+    x, y = X1 + shift[0], Y1 + shift[1]
+    image[y:y + template.shape[0], x:x + template.shape[1]] = template
+    return image
+
+
+def make_grid(**templates):
+    grid = ItemGrid(None, {})
+    for name, template in templates.items():
+        grid.templates[name] = template
+        grid.colors[name] = tuple(float(c) for c in template.reshape(-1, 3).mean(axis=0))
+        grid.templates_hit[name] = 0
+    grid.build_template_index()
+    return grid
+
+
+@pytest.fixture
+def grid():
+    return make_grid(**{f'Item{i}': pattern(i + 3, 2 * i + 5) for i in range(20)})
+
+
+def test_match_known(grid):
+    images = [item(pattern(i + 3, 2 * i + 5)) for i in [0, 7, 19, 7]]
+    assert grid.match_templates(images) == ['Item0', 'Item7', 'Item19', 'Item7']
+    assert grid.templates_hit['Item7'] == 2
+    assert len(grid.templates) == 20
+
+
+@pytest.mark.parametrize('shortlist', [1, 8, 100])
+def test_outside_shortlist(grid, shortlist):
+    """
+    Item not at template_area has a different feature, it's still found after the shortlist.
+    """
+    grid.template_shortlist = shortlist
+    image = item(pattern(12, 23), shift=(5, 3))
+    assert grid.match_templates([image]) == ['Item9']
+
+
+def test_known_before_digit():
+    template = pattern(4, 7)
+    grid = make_grid(**{'3': template, 'Coins': template, '5': template})
+    assert grid.match_template(item(template)) == 'Coins'
+
+
+def test_frequent_hit_first():
+    template = pattern(4, 7)
+    grid = make_grid(**{'3': template, '5': template})
+    grid.templates_hit['5'] = 10
+    assert grid.match_template(item(template)) == '5'
+
+
+def test_color_filtered():
+    """
+    Templates in different colors are not matched, even if the pattern is the same.
+    """
+    grid = make_grid(Coins=pattern(4, 7, offset=60))
+    name = grid.match_template(item(pattern(4, 7)))
+    assert name != 'Coins'
+    assert name in grid.templates
+
+
+def test_new_template_in_batch(grid):
+    """
+    Duplicates of an unknown item in one batch resolve to the same new template.
+    """
+    image = item(pattern(50, 60))
+    names = grid.match_templates([image, image.copy(), item(pattern(3, 5))])
+    assert names[0] == names[1]
+    assert names[2] == 'Item0'
+    assert grid.templates_hit[names[0]] == 2
+    assert len(grid.templates) == 21
+    assert grid._index_names[-1] == names[0]
+    assert len(grid._index_features) == 21
+
+
+def test_templates_added_directly(grid):
+    """
+    Templates added without build_template_index(), index is built again.
+    """
+    template = pattern(31, 17)
+    grid.templates['Gems'] = template
+    grid.colors['Gems'] = tuple(float(c) for c in template.reshape(-1, 3).mean(axis=0))
+    grid.templates_hit['Gems'] = 0
+    assert grid.match_template(item(template)) == 'Gems'
+    assert len(grid._index_names) == 21
+
+
+def test_next_template_index():
+    templates = {'Coins': pattern(4, 7), '12': pattern(8, 9)}
+    grid = ItemGrid(None, {name: SimpleNamespace(image=item(t)) for name, t in templates.items()})
+    assert grid.match_template(item(pattern(8, 9))) == '12'
+    assert grid.match_template(item(pattern(50, 60))) == '13'
+
+
+def test_no_templates():
+    grid = ItemGrid(None, {})
+    assert grid.match_templates([]) == []
+    assert grid.match_templates([item(pattern(4, 7))]) == ['1']
+
+
+def test_feature_flat_and_gray(grid):
+    features = grid.template_feature([np.full((49, 49, 3), 200, dtype=np.uint8), pattern(4, 7)[:, :, 0]])
+    assert features.shape == (2, 108)
+    assert not np.isnan(features).any()
+    assert not features[0].any()
+    assert np.linalg.norm(features[1]) == pytest.approx(1, abs=1e-5)
+
+
+@pytest.mark.parametrize('shortlist', [1, 8])
+def test_batch_same_as_single(shortlist):
+    """
+    Scores calculated in batch give the same result as matching one by one,
+    including templates created in the middle of the batch.
+    """
+    images = [item(pattern(i + 3, 2 * i + 5)) for i in [0, 7, 19]]
+    images += [item(pattern(50, 60)), item(pattern(12, 23), shift=(5, 3)), item(pattern(50, 60))]
+    single = make_grid(**{f'Item{i}': pattern(i + 3, 2 * i + 5) for i in range(20)})
+    batch = make_grid(**{f'Item{i}': pattern(i + 3, 2 * i + 5) for i in range(20)})
+    single.template_shortlist = batch.template_shortlist = shortlist
+    names = batch.match_templates(images)
+    assert names == [single.match_template(image) for image in images]
+    assert names[3] == names[5]
+    assert batch.templates_hit == single.templates_hit
+
+
+def test_batch_scored_once(grid, monkeypatch):
+    """
+    Template features are scored in one product for the whole batch.
+    """
+    images = [item(pattern(i + 3, 2 * i + 5)) for i in range(5)]
+    calls = []
+    candidates = grid._template_candidates
+
+    def template_candidates(color, feature, score=None):
+        calls.append(score)
+        return candidates(color, feature, score=score)
+
+    monkeypatch.setattr(grid, '_template_candidates', template_candidates)
+    assert grid.match_templates(images) == [f'Item{i}' for i in range(5)]
+    assert all(score is not None and len(score) == 20 for score in calls)
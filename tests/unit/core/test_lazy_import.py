@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from module.base.utils import find_peaks
+
+ROOT = __file__.rsplit('tests', 1)[0]
+
+
+def imported_modules(module):
+    """
+    Import a module in a new process.
+
+    Returns:
+        set[str]: Names in sys.modules after import.
+    """
+    code = f'import sys; import {module}; print("\\n".join(sys.modules))'
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=120, check=True)
+    return set(result.stdout.splitlines())
+
+
+@pytest.mark.parametrize('module', ['module.ui.ui', 'module.handler.login', 'module.base.base'])
+def test_scipy_not_imported(module):
+    """
+    scipy takes about 1s to import, it should be imported on first use instead of on Alas start.
+    """
+    modules = imported_modules(module)
+    assert module in modules
+    assert 'scipy.signal' not in modules
+    assert 'scipy.optimize' not in modules
+    assert 'module.map_detection.utils' not in modules
+
+
+def test_find_peaks():
+    from scipy import signal
+    x = np.array([0, 3, 0, 1, 0, 5, 5, 0, 2, 0], dtype=float)
+    parameters = {'height': 2, 'distance': 2, 'width': (0, 5)}
+    peaks, properties = find_peaks(x, **parameters)
+    expected_peaks, expected_properties = signal.find_peaks(x, **parameters)
+    assert peaks.tolist() == expected_peaks.tolist() == [1, 5, 8]
+    assert properties.keys() == expected_properties.keys()
+    for key, value in properties.items():
+        assert np.array_equal(value, expected_properties[key])
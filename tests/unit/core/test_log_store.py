@@ -0,0 +1,166 @@
+import logging
+import os
+import threading
+
+import pytest
+
+from module.log_store import LogStore, LogStoreHandler
+
+
+@pytest.fixture
+def small_segments(monkeypatch):
+    monkeypatch.setattr(LogStore, 'SEGMENT_SIZE', 500)
+    monkeypatch.setattr(LogStore, 'INDEX_INTERVAL', 10)
+
+
+@pytest.fixture
+def store(tmp_path, small_segments):
+    store = LogStore(str(tmp_path / 'alas'))
+    yield store
+    store.close()
+
+
+def write_tasks(store, tasks, count=5, t=1000.):
+    for task in tasks:
+        store.append('INFO', f'{task} start', task=task, created=t)
+        for i in range(count):
+            t += 1
+            store.append('WARNING' if i == 2 else 'INFO', f'{task} message {i}', created=t)
+    return t
+
+
+def messages(records):
+    return [record['message'] for record in records]
+
+
+def test_empty(store):
+    assert store.tail(10) == []
+    assert store.since_task_start() == []
+    assert list(store.query(start=0)) == []
+    assert store.task_start() is None
+
+
+def test_record_larger_than_segment(store):
+    store.append('INFO', 'a' * 1000, created=1000.)
+    store.append('INFO', 'b', created=1001.)
+    assert store.segments == [0, 1]
+    assert messages(store.tail(2)) == ['a' * 1000, 'b']
+
+
+def test_special_characters(store):
+    """
+    New lines in messages are escaped, they don't split records.
+    """
+    store.append('INFO', 'line 1\nline 2', created=1000.)
+    store.append('INFO', '委托 完成', created=1001.)
+    assert messages(store.tail(2)) == ['line 1\nline 2', '委托 完成']
+
+
+def test_partial_line(store):
+    """
+    A process killed during writing may leave half a line in segment and index.
+    """
+    write_tasks(store, ['COMMISSION'])
+    store.close()
+    segment = store.segment_file(store.segments[-1])
+    with open(segment, 'ab') as f:
+        f.write(b'{"time": 2000.0, "lev')
+    with open(store.index_file, 'ab') as f:
+        f.write(b'[2000.0, 0')
+
+    reader = LogStore(store.prefix)
+    assert messages(reader.tail(1)) == ['COMMISSION message 4']
+    assert len(list(reader.iter_records())) == 6
+    assert len(reader.index) == len(store.index)
+
+
+def test_reopen_new_segment(store):
+    write_tasks(store, ['COMMISSION'], count=1)
+    store.close()
+    store = LogStore(store.prefix)
+    store.append('INFO', 'after restart', created=2000.)
+    store.close()
+    assert store.segments == [0, 1]
+    assert messages(store.tail(3)) == ['COMMISSION start', 'COMMISSION message 0', 'after restart']
+
+
+def test_missing_segment(store):
+    write_tasks(store, ['COMMISSION', 'RESEARCH'], count=10)
+    store.close()
+    assert len(store.segments) > 2
+    os.remove(store.segment_file(store.segments[0]))
+    reader = LogStore(store.prefix)
+    assert reader.tail(1)[0]['message'] == 'RESEARCH message 9'
+    assert 'COMMISSION start' not in messages(reader.iter_records())
+
+
+def test_since_task_start(store):
+    write_tasks(store, ['COMMISSION', 'RESEARCH', 'COMMISSION'])
+    assert messages(store.since_task_start())[0] == 'COMMISSION start'
+    assert len(store.since_task_start()) == 6
+    assert messages(store.since_task_start('RESEARCH'))[0] == 'RESEARCH start'
+    assert len(store.since_task_start('RESEARCH')) == 12
+    # Never started, all records
+    assert len(store.since_task_start('DAILY')) == 18
+
+
+def test_query_edges(store):
+    end = write_tasks(store, ['COMMISSION', 'RESEARCH'])
+    # Before the first mark
+    assert len(list(store.query(start=0))) == 12
+    assert list(store.query(start=end + 1)) == []
+    assert list(store.query(start=1003., end=1002.)) == []
+    assert list(store.query(task='DAILY')) == []
+    # Minimum level
+    store.append('ERROR', 'failed', created=end + 1)
+    assert messages(store.query(level='WARNING')) == ['COMMISSION message 2', 'RESEARCH message 2', 'failed']
+    assert messages(store.query(start=1003., end=1004.)) == ['COMMISSION message 2', 'COMMISSION message 3']
+
+
+def test_reader_follows_writer(store):
+    write_tasks(store, ['COMMISSION'])
+    reader = LogStore(store.prefix)
+    assert reader.tail(1)[0]['message'] == 'COMMISSION message 4'
+    write_tasks(store, ['RESEARCH'], t=2000.)
+    assert reader.tail(1)[0]['message'] == 'RESEARCH message 4'
+    assert reader.task_start() == store.task_start()
+
+
+def test_concurrent_append(store):
+    def write(name):
+        for i in range(50):
+            store.append('INFO', f'{name} {i}')
+
+    threads = [threading.Thread(target=write, args=(f'thread_{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    records = list(store.iter_records())
+    assert len(records) == 200
+    for i in range(4):
+        assert [m for m in messages(records) if m.startswith(f'thread_{i} ')] == [f'thread_{i} {j}' for j in range(50)]
+
+
+def test_handler_exception(store):
+    logger = logging.getLogger('test_log_store')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = LogStoreHandler(store)
+    logger.addHandler(handler)
+    try:
+        logger.info('task begins', extra={'task': 'COMMISSION'})
+        try:
+            raise ValueError('bad value')
+        except ValueError:
+            logger.exception('failed')
+    finally:
+        logger.removeHandler(handler)
+
+    record = store.tail(1)[0]
+    assert record['task'] == 'COMMISSION'
+    assert 'ValueError: bad value' in record['exc']
+    text = LogStore.format(record)
+    assert ' | ERROR | failed\n' in text
+    assert text.endswith('ValueError: bad value\n')
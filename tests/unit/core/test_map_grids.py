@@ -0,0 +1,192 @@
+import threading
+
+import pytest
+
+from module.map.map_base import CampaignMap
+from module.map.map_grids import SelectedGrids
+from module.map_detection.grid_info import GridInfo, GridState
+
+
+@pytest.fixture
+def grids():
+    grids = []
+    for x in range(9):
+        for y in range(6):
+            grid = GridInfo()
+            grid.location = (x, y)
+            grid.is_land = (x + y) % 5 == 0
+            if not grid.is_land and (x * y) % 3 == 1:
+                grid.is_enemy = True
+                grid.enemy_scale = x % 3 + 1
+                grid.enemy_genre = ['Light', 'Main', None][y % 3]
+            grids.append(grid)
+    return SelectedGrids(grids)
+
+
+def campaign_map():
+    campaign = CampaignMap()
+    campaign.shape = 'E4'
+    return campaign
+
+
+class TestSelect:
+    def test_strict_type(self, grids):
+        """
+        select() matches types as well, select_equal() doesn't, so `1` matches `True` only in the latter.
+        """
+        enemies = [grid for grid in grids if grid.is_enemy]
+        assert grids.select(is_enemy=True).grids == enemies
+        assert grids.select(is_enemy=1).count == 0
+        assert grids.select_equal(is_enemy=1).grids == enemies
+        assert grids.select(enemy_scale=2.0).count == 0
+        assert grids.select_equal(enemy_scale=2.0).grids == [grid for grid in enemies if grid.enemy_scale == 2]
+        assert grids.select_count(is_enemy=1) == 0
+
+    def test_mixed_types(self, grids):
+        """
+        Columns having str and None are compared one by one.
+        """
+        assert grids.columns.arrays.get('enemy_genre') is None
+        assert grids.select(enemy_genre=None).count == len([grid for grid in grids if grid.enemy_genre is None])
+        assert grids.select(enemy_genre='Light').location == [
+            grid.location for grid in grids if grid.enemy_genre == 'Light']
+
+    def test_int_overflow(self, grids):
+        assert grids.select(enemy_scale=2 ** 70).count == 0
+        grids[0].enemy_scale = 2 ** 70
+        assert grids.select(enemy_scale=2 ** 70).grids == [grids[0]]
+        assert grids.columns.arrays['enemy_scale'] is None
+
+    def test_no_kwargs(self, grids):
+        selected = grids.select()
+        assert selected.grids == grids.grids
+        assert selected.grids is not grids.grids
+
+    def test_grids_appended(self, grids):
+        """
+        Columns are built again if the grid list changed size.
+        """
+        assert grids.select(is_fleet=True).count == 0
+        grid = GridInfo()
+        grid.location = (9, 0)
+        grid.is_fleet = True
+        grids.grids.append(grid)
+        assert grids.select(is_fleet=True).grids == [grid]
+
+    def test_sliced_grids(self, grids):
+        part = grids[:6]
+        assert part.select(is_cleared=True).count == 0
+        grids[1].is_cleared = True
+        assert part.select(is_cleared=True).grids == [grids[1]]
+        assert grids.select(is_cleared=True).grids == [grids[1]]
+
+    def test_concurrent_change(self, grids):
+        """
+        Grids changed on another thread while selecting, selects after it see all changes.
+        """
+
+        def clear():
+            for grid in grids:
+                grid.is_cleared = True
+
+        thread = threading.Thread(target=clear)
+        thread.start()
+        while thread.is_alive():
+            grids.select(is_cleared=True)
+        thread.join()
+        assert grids.select(is_cleared=True).count == len(grids)
+
+    def test_invalidate_on_change(self, grids):
+        assert grids.select(is_cleared=True).count == 0
+        grids[0].is_cleared = True
+        assert grids.select(is_cleared=True).grids == [grids[0]]
+
+    def test_unchanged_keeps_cache(self, grids):
+        columns = grids.columns
+        grids[0].is_enemy = grids[0].is_enemy
+        grids[0].location = tuple(grids[0].location)
+        # Class default copied to the instance
+        grids[1].is_fleet = False
+        assert grids.columns is columns
+
+    def test_invalidate_on_delete(self, grids):
+        grids[0].is_cleared = True
+        assert grids.select(is_cleared=True).count == 1
+        del grids[0].is_cleared
+        assert grids.select(is_cleared=True).count == 0
+
+    def test_grid_leaves_state(self, grids):
+        """
+        A grid moved to another state still invalidates columns built with the old one.
+        """
+        assert grids.select(is_cleared=True).count == 0
+        grids[0].grid_state = GridState()
+        assert grids.columns is None
+        grids[0].is_cleared = True
+        assert grids.select(is_cleared=True).grids == [grids[0]]
+
+    def test_untracked_objects(self):
+        class Item:
+            def __init__(self, value):
+                self.value = value
+
+        items = SelectedGrids([Item(1), Item(2), Item(1)])
+        assert items.columns is None
+        assert items.select(value=1).count == 2
+
+
+class TestMapState:
+    def test_other_map_keeps_cache(self):
+        campaign, other = campaign_map(), campaign_map()
+        all_grids = campaign.all_grids
+        columns = all_grids.columns
+        other[(0, 0)].is_enemy = True
+        GridInfo().is_enemy = True
+        assert campaign.all_grids is all_grids
+        assert all_grids.columns is columns
+
+    def test_own_change_drops_cache(self):
+        campaign = campaign_map()
+        all_grids = campaign.all_grids
+        assert campaign.select(is_enemy=True).count == 0
+        campaign[(2, 1)].is_enemy = True
+        assert campaign.all_grids is not all_grids
+        assert campaign.select(is_enemy=True).location == [(2, 1)]
+
+    def test_reshape(self):
+        """
+        New grids of a reshaped map are in the same state, the old cache can't be returned.
+        """
+        campaign = campaign_map()
+        assert campaign.all_grids.count == 20
+        campaign.grids = {}
+        campaign.shape = 'B2'
+        assert campaign.all_grids.count == 4
+        assert all(grid.grid_state is campaign.grid_state for grid in campaign)
+
+    def test_mixed_states(self):
+        campaign, other = campaign_map(), campaign_map()
+        grids = SelectedGrids([campaign[(0, 0)], other[(0, 0)]])
+        assert grids.columns is None
+        other[(0, 0)].is_enemy = True
+        assert grids.select(is_enemy=True).grids == [other[(0, 0)]]
+
+
+def test_sort_by_camera_distance(grids):
+    result = grids.sort_by_camera_distance((4, 3))
+    distance = [abs(x - 4) + abs(y - 3) for x, y in result.location]
+    assert distance == sorted(distance)
+    assert sorted(result.location) == sorted(grids.location)
+
+
+def test_left_join(grids):
+    right = SelectedGrids([grid for grid in grids if grid.is_enemy])
+    left = SelectedGrids([GridInfo() for _ in grids])
+    for grid, src in zip(left, grids):
+        grid.location = src.location
+    left.left_join(right, on_attr=('location',), set_attr=('enemy_scale', 'enemy_genre'), default=0)
+    for grid, src in zip(left, grids):
+        if src.is_enemy:
+            assert (grid.enemy_scale, grid.enemy_genre) == (src.enemy_scale, src.enemy_genre)
+        else:
+            assert (grid.enemy_scale, grid.enemy_genre) == (0, 0)
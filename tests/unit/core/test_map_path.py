@@ -0,0 +1,189 @@
+"""
+Tests for Dijkstra path finder.
+
+The old CampaignMap.find_path_initial() stops when no more grids become reachable,
+so it may end before costs converge. Dijkstra costs equal the old ones without ambush,
+and are never higher with ambush.
+"""
+import pytest
+
+from module.map.map_base import CampaignMap
+from module.map.map_path import MapPathFinder
+from module.map.utils import location_ensure
+
+
+def find_path_initial_old(self, location, has_ambush=True, has_enemy=True):
+    """
+    CampaignMap.find_path_initial() before Dijkstra, copied as is.
+    """
+    location = location_ensure(location)
+    ambush_cost = 10 if has_ambush else 1
+    for grid in self:
+        grid.cost = 9999
+        grid.connection = None
+    start = self[location]
+    start.cost = 0
+    visited = [start]
+    visited = set(visited)
+
+    while 1:
+        new = visited.copy()
+        for grid in visited:
+            for arr in self.grid_connection[grid.location]:
+                arr = self[arr]
+                if arr.is_land or arr.is_mechanism_block:
+                    continue
+                cost = ambush_cost if arr.may_ambush else 1
+                cost += grid.cost
+
+                if cost < arr.cost:
+                    arr.cost = cost
+                    arr.connection = grid.location
+                elif cost == arr.cost:
+                    if abs(arr.location[0] - grid.location[0]) == 1:
+                        arr.connection = grid.location
+                if arr.is_sea or not has_enemy:
+                    new.add(arr)
+        if len(new) == len(visited):
+            break
+        visited = new
+
+
+def make_map(*rows):
+    """
+    Args:
+        *rows (str): Each letter is a grid,
+            `.` sea, `#` land, `E` enemy, `A` ambush, `M` mechanism block.
+
+    Returns:
+        CampaignMap:
+    """
+    campaign = CampaignMap()
+    campaign.shape = f'{chr(ord("A") + len(rows[0]) - 1)}{len(rows)}'
+    campaign.grid_connection_initial()
+    for y, row in enumerate(rows):
+        for x, letter in enumerate(row):
+            grid = campaign[(x, y)]
+            grid.is_land = letter == '#'
+            grid.is_enemy = letter == 'E'
+            grid.may_ambush = letter == 'A'
+            grid.is_mechanism_block = letter == 'M'
+    return campaign
+
+
+def costs_of(campaign, func=CampaignMap.find_path_initial, start=(0, 0), **kwargs):
+    func(campaign, start, **kwargs)
+    return {grid.location: grid.cost for grid in campaign}
+
+
+MAPS = {
+    'open': ['......', '......', '......'],
+    'island': ['..#...', '..#.#.', '....#.'],
+    'enemies': ['.E....', '.E.#E.', '...#..'],
+    'ambush': ['.AA...', '.A#.A.', '......'],
+    'enclosed': ['...#..', '..#.#.', '...#..'],
+    'mechanism': ['.M....', '.M.M..', '...M..'],
+}
+
+
+@pytest.mark.parametrize('rows', MAPS.values(), ids=MAPS.keys())
+def test_same_as_old_without_ambush(rows):
+    campaign = make_map(*rows)
+    for has_enemy in [True, False]:
+        old = costs_of(campaign, find_path_initial_old, has_ambush=False, has_enemy=has_enemy)
+        assert costs_of(campaign, has_ambush=False, has_enemy=has_enemy) == old
+
+
+@pytest.mark.parametrize('rows', MAPS.values(), ids=MAPS.keys())
+def test_not_higher_than_old(rows):
+    campaign = make_map(*rows)
+    old = costs_of(campaign, find_path_initial_old)
+    for location, cost in costs_of(campaign).items():
+        assert (cost >= 9999) == (old[location] >= 9999)
+        assert cost <= old[location]
+
+
+def test_old_stops_early():
+    """
+    Going around ambush grids needs more rounds than reaching all grids,
+    the old one stops before (2, 0) gets its lowest cost.
+    """
+    campaign = make_map('.A.', '.A.', '...')
+    assert costs_of(campaign, find_path_initial_old)[(2, 0)] == 11
+    assert costs_of(campaign)[(2, 0)] == 6
+    assert campaign._find_path((2, 0)) == [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0)]
+
+
+def test_enemy_not_expanded():
+    campaign = make_map('.E.', '##.', '...')
+    costs = costs_of(campaign)
+    # Enemy can be reached, but fleets stop there
+    assert costs[(1, 0)] == 1
+    assert costs[(2, 0)] == 9999
+    # Moving through enemies if they are ignored
+    assert costs_of(campaign, has_enemy=False)[(2, 0)] == 2
+
+
+def test_start_on_enemy():
+    campaign = make_map('E..', '...')
+    assert costs_of(campaign)[(2, 1)] == 3
+
+
+def test_unreachable():
+    campaign = make_map('.#.', '##.', '...')
+    campaign.find_path_initial((0, 0))
+    for location in [(2, 0), (2, 2)]:
+        assert campaign[location].cost == 9999
+        assert campaign[location].connection is None
+        assert campaign._find_path(location) is None
+
+
+def test_grid_changed():
+    """
+    Results are cached by grid states, changed grids are solved again.
+    """
+    campaign = make_map('...', '...')
+    assert costs_of(campaign)[(2, 0)] == 2
+    campaign[(1, 0)].is_land = True
+    assert costs_of(campaign)[(2, 0)] == 4
+    campaign[(1, 0)].is_land = False
+    assert costs_of(campaign)[(2, 0)] == 2
+
+
+def test_portal():
+    """
+    Portals change connections, path finder is built again.
+    """
+    campaign = make_map('..#..', '..#..')
+    assert costs_of(campaign)[(4, 0)] == 9999
+    campaign._portal_data = [((1, 0), (3, 1))]
+    campaign.grid_connection_initial(portal=True)
+    assert costs_of(campaign)[(4, 0)] == 4
+    campaign.grid_connection_initial(portal=False)
+    assert costs_of(campaign)[(4, 0)] == 9999
+
+
+def test_prefer_horizontal():
+    campaign = make_map('...', '...', '...')
+    campaign.find_path_initial((0, 0))
+    # (1, 1) can be reached from (0, 1) or (1, 0), horizontal move is the last one
+    assert campaign[(1, 1)].connection == (0, 1)
+
+
+def test_links_out_of_map():
+    finder = MapPathFinder({(0, 0): {(1, 0), (-1, 0)}, (1, 0): {(0, 0)}})
+    costs, previous = finder.solve((0, 0), (True, True), (True, True), (1, 1))
+    assert costs == [0, 1]
+    assert previous == [-1, 0]
+
+
+def test_cache():
+    campaign = make_map('....', '....')
+    finder = MapPathFinder(campaign.grid_connection, cache_size=2)
+    n = len(finder)
+    args = ((True,) * n, (True,) * n, (1,) * n)
+    result = finder.solve((0, 0), *args)
+    assert finder.solve((0, 0), *args) is result
+    finder.solve((1, 1), *args)
+    finder.solve((2, 1), *args)
+    assert finder.solve((0, 0), *args) is not result
@@ -0,0 +1,186 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import module.base.resource as resource
+from module.ocr.backend import OcrBackend
+from module.ocr.ocr import OCR_MODEL
+from module.ocr.router import OCR_ROUTER
+from module.webui.setting import State
+
+
+class FakeModel:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def ocr(self, images, cls=True):
+        return [[[None, (self.name, 1.)]] for _ in images]
+
+    def close(self):
+        self.closed = True
+
+
+class Loader:
+    def __init__(self, name, error=None, wait=None):
+        self.name = name
+        self.error = error
+        self.wait = wait
+        self.models = []
+
+    def __call__(self):
+        if self.wait is not None:
+            assert self.wait.wait(timeout=10)
+        if self.error is not None:
+            raise self.error
+        model = FakeModel(self.name)
+        self.models.append(model)
+        return model
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    def use(*loaders):
+        monkeypatch.setattr(OcrBackend, 'registry', {loader.name: loader for loader in loaders})
+
+    return use
+
+
+def test_lazy(registry):
+    loader = Loader('fake')
+    registry(loader)
+    backend = OcrBackend()
+    assert not backend.loaded
+    assert backend.name == ''
+    assert loader.models == []
+    assert backend.ocr(['image']) == [[[None, ('fake', 1.)]]]
+    assert backend.name == 'fake'
+    assert len(loader.models) == 1
+
+
+def test_skip_unavailable(registry):
+    registry(Loader('paddleocr', error=ImportError('no paddle')), Loader('easyocr'))
+    backend = OcrBackend()
+    assert backend.model.name == 'easyocr'
+    assert backend.name == 'easyocr'
+
+
+def test_none_available(registry):
+    registry(Loader('paddleocr', error=ImportError('no paddle')))
+    backend = OcrBackend()
+    with pytest.raises(ImportError):
+        backend.ocr(['image'])
+    assert not backend.loaded
+
+
+def test_load_error(registry):
+    """
+    Errors other than ImportError are raised, backend is not marked as loaded.
+    """
+    registry(Loader('paddleocr', error=RuntimeError('broken model')), Loader('easyocr'))
+    backend = OcrBackend()
+    with pytest.raises(RuntimeError):
+        _ = backend.model
+    assert not backend.loaded
+
+
+def test_register_first(monkeypatch):
+    monkeypatch.setattr(OcrBackend, 'registry', {'a': Loader('a'), 'b': Loader('b')})
+    OcrBackend.register('b', Loader('b'), first=True)
+    assert list(OcrBackend.registry) == ['b', 'a']
+    OcrBackend.register('c', Loader('c'))
+    assert list(OcrBackend.registry) == ['b', 'a', 'c']
+
+
+def test_concurrent_first_use(registry):
+    event = threading.Event()
+    loader = Loader('fake', wait=event)
+    registry(loader)
+    backend = OcrBackend()
+    models = []
+    threads = [threading.Thread(target=lambda: models.append(backend.model)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    event.set()
+    for thread in threads:
+        thread.join()
+    assert len(loader.models) == 1
+    assert all(model is loader.models[0] for model in models)
+
+
+def test_prewarm(registry):
+    event = threading.Event()
+    loader = Loader('fake', wait=event)
+    registry(loader)
+    backend = OcrBackend()
+    backend.prewarm()
+    thread = backend._prewarm_thread
+    assert thread.is_alive()
+    # Loading, not started again
+    backend.prewarm()
+    assert backend._prewarm_thread is thread
+    event.set()
+    # OCR waits for prewarm
+    assert backend.ocr(['image'])[0][0][1][0] == 'fake'
+    thread.join()
+    assert len(loader.models) == 1
+    # Loaded, nothing to do
+    backend.prewarm()
+    assert backend._prewarm_thread is thread
+
+
+def test_prewarm_failed(registry):
+    registry(Loader('fake', error=RuntimeError('broken model')))
+    backend = OcrBackend()
+    backend.prewarm()
+    backend._prewarm_thread.join()
+    assert not backend.loaded
+    # Failure is not remembered, tried again on next use
+    registry(Loader('fake'))
+    assert backend.model.name == 'fake'
+
+
+def test_release_reload(registry):
+    loader = Loader('fake')
+    registry(loader)
+    backend = OcrBackend()
+    backend.release()
+    first = backend.model
+    backend.release()
+    assert first.closed
+    assert not backend.loaded
+    assert backend.name == ''
+    second = backend.model
+    assert second is not first
+    assert len(loader.models) == 2
+
+
+def test_release_without_close(monkeypatch):
+    class Model:
+        def ocr(self, images, cls=True):
+            return [None for _ in images]
+
+    monkeypatch.setattr(OcrBackend, 'registry', {'fake': Model})
+    backend = OcrBackend()
+    assert backend.ocr(['image']) == [None]
+    backend.release()
+    assert not backend.loaded
+
+
+@pytest.mark.parametrize('server', [True, False])
+def test_release_resources(registry, monkeypatch, server):
+    registry(Loader('fake'))
+    monkeypatch.setattr(State, 'deploy_config', SimpleNamespace(UseOcrServer=server))
+    monkeypatch.setattr(OCR_ROUTER, '_route', 'local')
+    OCR_MODEL.release()
+    _ = OCR_MODEL.model
+    # Next task runs immediately, keep model
+    resource.release_resources(next_task='Commission')
+    assert OCR_MODEL.loaded
+    assert OCR_ROUTER._route == 'local'
+    # Idle
+    resource.release_resources()
+    assert not OCR_MODEL.loaded
+    # Server liveness is checked again
+    assert OCR_ROUTER._route == ('' if server else 'local')
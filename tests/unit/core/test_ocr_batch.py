@@ -0,0 +1,243 @@
+import sys
+from types import ModuleType, SimpleNamespace
+
+import numpy as np
+import pytest
+
+from module.base.button import Button
+from module.ocr.backend import OcrBackend
+from module.ocr.cache import OCR_CACHE
+from module.ocr.ocr import OCR_MODEL, Ocr, OcrBatch
+from module.ocr.router import OCR_ROUTER, OcrRoute
+
+
+class FakeBackend:
+    """
+    Reads the mean of each image as text.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def ocr(self, images, cls=True):
+        self.calls.append(len(images))
+        return [[[None, (str(int(image.mean())), 1.)]] for image in images]
+
+    def close(self):
+        pass
+
+
+class Upper(Ocr):
+    def after_process(self, result):
+        return f'<{result}>'
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = FakeBackend()
+    monkeypatch.setattr(OCR_ROUTER, '_route', OcrRoute.LOCAL)
+    monkeypatch.setattr(OcrBackend, 'registry', {'fake': lambda: backend})
+    monkeypatch.setattr(Ocr, 'SHOW_LOG', False)
+    monkeypatch.setattr(Ocr, 'save_ocr_debug_screenshot', lambda *args: None)
+    # Keep crops as is, text is the mean of crop
+    monkeypatch.setattr(Ocr, 'pre_process', lambda self, image: image)
+    monkeypatch.setattr(Ocr, '_cache_backend', '')
+    OCR_MODEL.release()
+    OCR_CACHE.clear()
+    yield backend
+    OCR_MODEL.release()
+    OCR_CACHE.clear()
+
+
+def screenshot():
+    image = np.zeros((720, 1280, 3), dtype=np.uint8)
+    image[0:20, 0:100] = 10
+    image[0:20, 100:200] = 20
+    image[0:20, 200:300] = 30
+    return image
+
+
+def ocrs():
+    return [
+        Ocr([(0, 0, 100, 20), (100, 0, 200, 20)], name='PAIR'),
+        Upper((200, 0, 300, 20), name='UPPER'),
+    ]
+
+
+def test_one_backend_call(backend):
+    image = screenshot()
+    pair, upper = ocrs()
+    assert OcrBatch([pair, upper]).preload(image)
+    assert backend.calls == [3]
+    assert pair.ocr(image) == ['10', '20']
+    # after_process of each Ocr still works
+    assert upper.ocr(image) == '<30>'
+    assert backend.calls == [3]
+
+
+def test_preset_on_another_image(backend):
+    image = screenshot()
+    pair, upper = ocrs()
+    OcrBatch([pair, upper]).preload(image)
+    other = screenshot()
+    other[0:20, 0:100] = 40
+    assert pair.ocr(other) == ['40', '20']
+    # Preset is dropped once checked, not used on the next call
+    assert pair._preset is None
+
+
+def test_preset_used_once(backend):
+    image = screenshot()
+    pair, upper = ocrs()
+    OcrBatch([pair]).preload(image)
+    pair.ocr(image)
+    OCR_CACHE.clear()
+    pair.ocr(image)
+    assert backend.calls == [2, 2]
+
+
+def test_partly_cached(backend):
+    image = screenshot()
+    pair, upper = ocrs()
+    upper.ocr(image)
+    assert OcrBatch([pair, upper]).preload(image)
+    assert backend.calls == [1, 2]
+    assert upper.ocr(image) == '<30>'
+
+
+def test_vision_not_preloaded(backend, monkeypatch):
+    monkeypatch.setattr(OCR_ROUTER, '_route', OcrRoute.VISION)
+    pair, upper = ocrs()
+    assert not OcrBatch([pair, upper]).preload(screenshot())
+    assert pair._preset is None
+    assert backend.calls == []
+
+
+def test_backend_error(backend, monkeypatch):
+    def ocr(images, cls=True):
+        raise RuntimeError('model crashed')
+
+    monkeypatch.setattr(backend, 'ocr', ocr)
+    pair, upper = ocrs()
+    assert not OcrBatch([pair, upper]).preload(screenshot())
+    assert pair._preset is None
+    assert upper._preset is None
+
+
+def test_result_count_mismatch(backend, monkeypatch):
+    monkeypatch.setattr(backend, 'ocr', lambda images, cls=True: [None])
+    pair, upper = ocrs()
+    assert not OcrBatch([pair, upper]).preload(screenshot())
+    assert pair._preset is None
+
+
+def test_empty(backend):
+    assert not OcrBatch([]).preload(screenshot())
+    assert not OcrBatch(ocrs()).preload(None)
+
+
+class FakeGemini:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.prompts = []
+        self.configured = 0
+
+    def configure(self, api_key):
+        self.configured += 1
+
+    def GenerativeModel(self, name):
+        return self
+
+    def generate_content(self, content):
+        prompt, image = content
+        self.prompts.append(prompt)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return SimpleNamespace(text=response)
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    def use(*responses):
+        fake = FakeGemini(responses)
+        genai = ModuleType('google.generativeai')
+        for name in ['configure', 'GenerativeModel']:
+            setattr(genai, name, getattr(fake, name))
+        google = ModuleType('google')
+        google.generativeai = genai
+        config = ModuleType('config.vision_llm_config')
+        config.GOOGLE_API_KEY = 'key'
+        config.GEMINI_MODEL = 'gemini-test'
+        monkeypatch.setitem(sys.modules, 'google', google)
+        monkeypatch.setitem(sys.modules, 'google.generativeai', genai)
+        monkeypatch.setitem(sys.modules, 'config.vision_llm_config', config)
+        return fake
+
+    OCR_CACHE.clear()
+    yield use
+    OCR_CACHE.clear()
+
+
+def button(area, name):
+    return Button(area=area, color=(), button=area, name=name)
+
+
+def vision_ocr():
+    areas = [(0, 0, 100, 20), (100, 0, 200, 20), (200, 0, 300, 20)]
+    return Ocr([button(area, 'OCR_DORM_FOOD') for area in areas], name='OCR_DORM_FOOD')
+
+
+@pytest.mark.parametrize('text', [
+    '["10", "20", "30"]',
+    '```json\n["10", "20", "30"]\n```',
+    '```\n[10, " 20 ", 30]\n```',
+])
+def test_vision_batch(gemini, text):
+    fake = gemini(text)
+    assert vision_ocr()._vision_ocr(screenshot()) == ['10', '20', '30']
+    assert len(fake.prompts) == 1
+    prompt = fake.prompts[0]
+    assert 'Item 3, area (200, 0, 300, 20)' in prompt
+    assert 'food item #3' in prompt
+    assert 'JSON array of 3 strings' in prompt
+
+
+@pytest.mark.parametrize('text', ['["10", "20"]', '{"1": "10"}', 'not json', RuntimeError('quota')])
+def test_vision_batch_fallback(gemini, text):
+    """
+    Unexpected batch response, buttons are requested one by one.
+    """
+    fake = gemini(text, '10', '20', '30')
+    assert vision_ocr()._vision_ocr(screenshot()) == ['10', '20', '30']
+    assert len(fake.prompts) == 4
+    assert 'food item #2' in fake.prompts[2]
+
+
+def test_vision_batch_missing_only(gemini):
+    image = screenshot()
+    gemini('["10", "20", "30"]')
+    vision_ocr()._vision_ocr(image)
+    image[0:20, 100:300] = 50
+    fake = gemini('["21", "31"]')
+    assert vision_ocr()._vision_ocr(image) == ['10', '21', '31']
+    assert 'Item 1, area (100, 0, 200, 20)' in fake.prompts[0]
+    assert 'JSON array of 2 strings' in fake.prompts[0]
+
+
+def test_vision_cached(gemini):
+    image = screenshot()
+    gemini('["10", "20", "30"]')
+    vision_ocr()._vision_ocr(image)
+    fake = gemini()
+    assert vision_ocr()._vision_ocr(image.copy()) == ['10', '20', '30']
+    assert fake.configured == 0
+    assert fake.prompts == []
+
+
+def test_vision_single(gemini):
+    fake = gemini(' 5/6 \n')
+    ocr = Ocr(button((0, 0, 100, 20), 'OCR_SLOT'))
+    assert ocr._vision_ocr(screenshot()) == '5/6'
+    assert 'JSON' not in fake.prompts[0]
+    assert 'CURRENT/MAXIMUM' in fake.prompts[0]
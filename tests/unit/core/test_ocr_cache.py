@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from module.ocr.backend import OcrBackend
+from module.ocr.cache import OCR_CACHE
+from module.ocr.ocr import OCR_MODEL, Ocr
+from module.ocr.router import OCR_ROUTER, OcrRoute
+
+AREA = (10, 10, 60, 30)
+
+
+class FakeBackend:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def ocr(self, images, cls=True):
+        self.calls += 1
+        return [[[None, (self.text, 1.)]] for _ in images]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def ocr(monkeypatch):
+    monkeypatch.setattr(OCR_ROUTER, '_route', OcrRoute.LOCAL)
+    monkeypatch.setattr(Ocr, 'SHOW_LOG', False)
+    monkeypatch.setattr(Ocr, 'save_ocr_debug_screenshot', lambda *args: None)
+    monkeypatch.setattr(Ocr, '_cache_backend', '')
+    OCR_MODEL.release()
+    OCR_CACHE.clear()
+    yield Ocr(AREA, name='TEST_OCR')
+    OCR_MODEL.release()
+    OCR_CACHE.clear()
+
+
+def use_backend(monkeypatch, name, backend):
+    monkeypatch.setattr(OcrBackend, 'registry', {name: lambda: backend})
+
+
+def screenshot(value=255):
+    image = np.zeros((720, 1280, 3), dtype=np.uint8)
+    image[15:25, 20:50] = value
+    return image
+
+
+def test_cache_hit_does_not_load_backend(ocr, monkeypatch):
+    backend = FakeBackend('123')
+    use_backend(monkeypatch, 'fake', backend)
+    assert ocr.ocr(screenshot()) == '123'
+    assert backend.calls == 1
+
+    OCR_MODEL.release()
+
+    def load():
+        raise AssertionError('Backend should not be loaded on cache hit')
+
+    monkeypatch.setattr(OcrBackend, 'registry', {'fake': load})
+    assert ocr.ocr(screenshot()) == '123'
+    assert not OCR_MODEL.loaded
+
+
+def test_cache_miss(ocr, monkeypatch):
+    backend = FakeBackend('123')
+    use_backend(monkeypatch, 'fake', backend)
+    ocr.ocr(screenshot())
+    ocr.ocr(screenshot(value=128))
+    assert backend.calls == 2
+
+
+def test_backend_changed(ocr, monkeypatch):
+    """
+    Local results are not keyed by backend name, results of another backend are dropped.
+    """
+    use_backend(monkeypatch, 'first', FakeBackend('123'))
+    assert ocr.ocr(screenshot()) == '123'
+
+    OCR_MODEL.release()
+    second = FakeBackend('456')
+    use_backend(monkeypatch, 'second', second)
+    # Another image loads the second backend
+    assert ocr.ocr(screenshot(value=128)) == '456'
+    assert ocr.ocr(screenshot()) == '456'
+    assert second.calls == 2
+
+
+def test_result_count_mismatch(ocr, monkeypatch):
+    """
+    Missing results are not cached as None, and read as empty.
+    """
+    backend = FakeBackend('123')
+    monkeypatch.setattr(backend, 'ocr', lambda images, cls=True: [])
+    use_backend(monkeypatch, 'fake', backend)
+    assert ocr.ocr(screenshot()) == ''
+    assert len(OCR_CACHE) == 0
@@ -0,0 +1,165 @@
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+import module.ocr.rpc as rpc
+from module.ocr.router import OcrRoute, OcrRouter
+from module.webui.setting import State
+
+
+@pytest.fixture
+def router():
+    return OcrRouter()
+
+
+@pytest.fixture
+def vision(monkeypatch):
+    """
+    Fake Gemini SDK and config, returns a function to set the API key.
+    """
+    google = ModuleType('google')
+    genai = ModuleType('google.generativeai')
+    google.generativeai = genai
+    config = ModuleType('config.vision_llm_config')
+    config.GOOGLE_API_KEY = 'key'
+    monkeypatch.setitem(sys.modules, 'google', google)
+    monkeypatch.setitem(sys.modules, 'google.generativeai', genai)
+    monkeypatch.setitem(sys.modules, 'config.vision_llm_config', config)
+
+    def set_key(key):
+        config.GOOGLE_API_KEY = key
+
+    return set_key
+
+
+@pytest.fixture
+def adb(monkeypatch):
+    """
+    Fake AdbClient, returns the list of devices it reports.
+    """
+    import adbutils
+
+    devices = []
+    calls = []
+
+    class AdbClient:
+        def __init__(self, host, port):
+            pass
+
+        def device_list(self):
+            calls.append(1)
+            return list(devices)
+
+    monkeypatch.setattr(adbutils, 'AdbClient', AdbClient)
+    return SimpleNamespace(devices=devices, calls=calls)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    state = SimpleNamespace(UseOcrServer=False, alive=False)
+    monkeypatch.setattr(State, 'deploy_config', state)
+    monkeypatch.setattr(rpc, 'alive', lambda: state.alive)
+    return state
+
+
+def test_local(router, adb, server):
+    assert router.route == OcrRoute.LOCAL
+
+
+def test_route_cached(router, monkeypatch):
+    calls = []
+
+    def decide():
+        calls.append(1)
+        return OcrRoute.LOCAL
+
+    monkeypatch.setattr(router, 'decide', decide)
+    for _ in range(3):
+        assert router.route == OcrRoute.LOCAL
+    assert len(calls) == 1
+    router.reset()
+    assert router.route == OcrRoute.LOCAL
+    assert len(calls) == 2
+
+
+def test_device_checked_once(router, adb, vision):
+    adb.devices.append('emulator-5554')
+    assert router.route == OcrRoute.VISION
+    router.reset()
+    assert router.route == OcrRoute.VISION
+    # Known until next connection event
+    assert len(adb.calls) == 1
+    router.on_disconnect()
+    assert router.route == OcrRoute.VISION
+    assert len(adb.calls) == 2
+
+
+def test_vision_needs_device(router, adb, vision, server):
+    assert router.route == OcrRoute.LOCAL
+    # Known from connection event, ADB is not queried
+    router.on_connect()
+    assert router.route == OcrRoute.VISION
+    assert len(adb.calls) == 1
+
+
+def test_vision_needs_key(router, adb, vision, server):
+    vision('')
+    router.on_connect()
+    assert router.route == OcrRoute.LOCAL
+
+
+def test_vision_not_installed(router, monkeypatch, server):
+    monkeypatch.setitem(sys.modules, 'google.generativeai', None)
+    router.on_connect()
+    assert router.route == OcrRoute.LOCAL
+
+
+def test_server(router, adb, server):
+    server.UseOcrServer = True
+    assert router.route == OcrRoute.LOCAL
+    server.alive = True
+    # Cached until reset
+    assert router.route == OcrRoute.LOCAL
+    router.reset()
+    assert router.route == OcrRoute.SERVER
+
+
+def test_server_check_error(router, adb, monkeypatch):
+    class DeployConfig:
+        @property
+        def UseOcrServer(self):
+            raise FileNotFoundError('deploy.yaml')
+
+    monkeypatch.setattr(State, 'deploy_config', DeployConfig())
+    assert not router.server_available()
+    assert router.route == OcrRoute.LOCAL
+
+
+def test_vision_failed_permanent(router, adb, vision, server):
+    router.on_connect()
+    assert router.route == OcrRoute.VISION
+    router.on_route_failed(OcrRoute.VISION, permanent=True)
+    assert router.route == OcrRoute.LOCAL
+    # Disabled until next connection event
+    router.on_disconnect()
+    adb.devices.append('emulator-5554')
+    assert router.route == OcrRoute.LOCAL
+    router.on_connect()
+    assert router.route == OcrRoute.VISION
+
+
+def test_vision_failed_temporary(router, adb, vision, server):
+    router.on_connect()
+    assert router.route == OcrRoute.VISION
+    router.on_route_failed(OcrRoute.VISION)
+    assert router._route == OcrRoute.VISION
+
+
+def test_server_failed(router, adb, server):
+    server.UseOcrServer = True
+    server.alive = True
+    assert router.route == OcrRoute.SERVER
+    server.alive = False
+    router.on_route_failed(OcrRoute.SERVER)
+    assert router.route == OcrRoute.LOCAL
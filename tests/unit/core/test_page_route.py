@@ -0,0 +1,198 @@
+import pytest
+
+from module.ui.page import Page
+from module.ui.ui import UI
+
+
+@pytest.fixture
+def pages():
+    """
+    Pages created in tests are removed afterwards, links of existing pages are restored.
+    """
+    all_pages = dict(Page.all_pages)
+    links = {page: dict(page.links) for page in all_pages.values()}
+    yield
+    Page.all_pages.clear()
+    Page.all_pages.update(all_pages)
+    for page, link in links.items():
+        page.links = link
+    Page.clear_connection()
+    Page._route_table = None
+    Page._neighbour_table = None
+    Page._check_button_batch = None
+
+
+def follow(destination, page):
+    route = Page.route_table()[destination]
+    path = [page]
+    while path[-1] != destination:
+        path.append(route[path[-1]])
+    return path
+
+
+def test_existing_routes():
+    main = Page.all_pages['page_main']
+    campaign = Page.all_pages['page_campaign']
+    fleet = Page.all_pages['page_fleet']
+    assert follow(fleet, campaign) == [campaign, main, fleet]
+    # Every step goes through a link
+    for destination, route in Page.route_table().items():
+        for page, parent in route.items():
+            assert parent in page.links
+
+
+def test_one_way_link():
+    """
+    page_unknown goes to page_main, but no page goes to page_unknown.
+    """
+    unknown = Page.all_pages['page_unknown']
+    main = Page.all_pages['page_main']
+    assert Page.route_table()[unknown] == {}
+    assert follow(main, unknown) == [unknown, main]
+    assert unknown in Page.neighbours(main)
+
+
+def test_shortest_route(pages):
+    page_a = Page(None)
+    page_b = Page(None)
+    page_c = Page(None)
+    page_d = Page(None)
+    page_a.link('A_TO_B', destination=page_b)
+    page_b.link('B_TO_C', destination=page_c)
+    page_c.link('C_TO_D', destination=page_d)
+    assert follow(page_d, page_a) == [page_a, page_b, page_c, page_d]
+    # Route table is built again after adding links
+    page_a.link('A_TO_D', destination=page_d)
+    assert follow(page_d, page_a) == [page_a, page_d]
+    assert page_a in Page.neighbours(page_d)
+
+
+def test_new_page_invalidates(pages):
+    table = Page.route_table()
+    page_new = Page(None)
+    assert Page.route_table() is not table
+    assert Page.route_table()[page_new] == {}
+
+
+def test_init_connection(pages):
+    page_a = Page(None)
+    page_b = Page(None)
+    page_c = Page(None)
+    page_a.link('A_TO_B', destination=page_b)
+    page_c.link('C_TO_B', destination=page_b)
+    page_b.link('B_TO_C', destination=page_c)
+
+    Page.init_connection(page_b)
+    assert (page_a.parent, page_b.parent, page_c.parent) == (page_b, None, page_b)
+    # Parents from the last destination are cleared
+    Page.init_connection(page_a)
+    assert (page_a.parent, page_b.parent, page_c.parent) == (None, None, None)
+
+
+def test_sort_by_likelihood():
+    pages = list(Page.iter_pages())[:6]
+    last = pages[3]
+    diff = {page: 0 for page in pages}
+    diff[pages[0]] = 100
+    diff[pages[1]] = 50
+    result = Page.sort_by_likelihood(pages, diff.get, last=last)
+    assert result[0] == last
+    # Candidates of the same priority keep the given order, then others by color difference
+    assert result[-2:] == [pages[1], pages[0]]
+    assert Page.sort_by_likelihood(pages, diff.get, last=last) == result
+
+
+class FakeUI(UI):
+    def __init__(self, appear, diff, last=None):
+        self.appear_pages = appear
+        self.diff = diff
+        self.tested = []
+        self.batched = []
+        if last is not None:
+            self.ui_current = last
+
+    def ui_page_color_diff(self):
+        return lambda page: self.diff.get(page, 100)
+
+    def ui_page_appear(self, page, offset=(30, 30)):
+        self.tested.append(page)
+        return page in self.appear_pages
+
+    def appear_batch(self, batch, offset=0, **kwargs):
+        pages = {page.check_button: page for page in known_pages()}
+        self.batched.append([pages[button] for button in batch])
+        return {button: pages[button] in self.appear_pages for button in batch}
+
+
+def known_pages():
+    return [page for page in Page.iter_pages() if page.check_button is not None]
+
+
+def test_match_page_defined_first_wins():
+    """
+    Two pages appear, the last known page is tested first but the one defined first is returned.
+    """
+    pages = known_pages()
+    first, second = pages[2], pages[7]
+    ui = FakeUI(appear={first, second}, diff={first: 0, second: 0}, last=second)
+    assert ui.ui_match_page() == first
+    assert ui.tested[0] == second
+    # All pages defined earlier are tested again, in one batch except page_main
+    assert set(ui.tested[1:] + sum(ui.batched, [])) == set(pages[:7])
+    assert len(ui.batched) == 1
+
+    ui = FakeUI(appear={first, second}, diff={first: 0, second: 0})
+    assert ui.ui_match_page() == first
+    assert ui.tested[0] == first
+
+
+def test_match_page_earlier_out_of_threshold():
+    """
+    Check button of the earlier page moved within offset, its color differs a lot but it still wins.
+    """
+    pages = known_pages()
+    first, second = pages[3], pages[9]
+    diff = {page: 0 for page in pages}
+    diff[first] = 80
+    ui = FakeUI(appear={first, second}, diff=diff, last=second)
+    assert ui.ui_match_page() == first
+    ui = FakeUI(appear={first, second}, diff=diff)
+    assert ui.ui_match_page() == first
+
+
+def test_match_page_first_defined():
+    """
+    Nothing is tested again if the page found is the first defined one.
+    """
+    pages = known_pages()
+    page = pages[0]
+    ui = FakeUI(appear={page, pages[7]}, diff={page: 0, pages[7]: 0}, last=page)
+    assert ui.ui_match_page() == page
+    assert ui.tested == [page]
+    assert ui.batched == []
+
+
+def test_match_page_skips_later_pages():
+    pages = known_pages()
+    page, later = pages[2], pages[7]
+    ui = FakeUI(appear={page, later}, diff={page: 0, later: 0}, last=page)
+    assert ui.ui_match_page() == page
+    # Later pages are never tested
+    assert later not in ui.tested + sum(ui.batched, [])
+
+
+def test_match_page_not_candidate():
+    """
+    Pages out of color threshold are tested after candidates, in color order.
+    """
+    pages = known_pages()
+    target = pages[5]
+    diff = {page: 50 + index for index, page in enumerate(pages)}
+    diff[target] = 40
+    ui = FakeUI(appear={target}, diff=diff)
+    assert ui.ui_match_page() == target
+    assert ui.tested[0] == target
+
+    ui = FakeUI(appear=set(), diff=diff)
+    assert ui.ui_match_page() is None
+    assert len(ui.tested) == len(pages)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from scipy import optimize
+
+from module.map_detection.perspective import Perspective
+from module.map_detection.utils import Lines
+
+VANISH_POINT_RANGE = ((540, 740), (-3000, -1000))
+VANISH_POINT = (640, -1700)
+# Two wrong lines crossing far from the vanish point, a local minimum of the objective
+WRONG_POINT = (720, -1100)
+
+
+def lines_through(point, thetas):
+    x, y = point
+    return [[x * np.cos(theta) + y * np.sin(theta), theta] for theta in thetas]
+
+
+@pytest.fixture
+def perspective():
+    perspective = Perspective(config=None)
+    thetas = np.radians(np.linspace(-20, 20, 8)) + np.pi
+    lines = lines_through(VANISH_POINT, thetas) + lines_through(WRONG_POINT, np.radians([-25, 25]) + np.pi)
+    perspective.vertical = Lines(lines, is_horizontal=False)
+    return perspective
+
+
+def solve(perspective, prev):
+    return perspective._solve(
+        perspective._vanish_point_value, VANISH_POINT_RANGE, prev, size=len(perspective.vertical))
+
+
+def test_first_run_brute(perspective):
+    point, score = solve(perspective, prev=None)
+    assert np.allclose(point, VANISH_POINT, atol=1)
+    # 8 of 10 lines meet at the vanish point
+    assert score < -1
+
+
+def test_warm_start_skips_brute(perspective, monkeypatch):
+    point, score = solve(perspective, prev=None)
+
+    def brute(*args, **kwargs):
+        raise AssertionError('Brute search should be skipped')
+
+    monkeypatch.setattr(optimize, 'brute', brute)
+    prev = (VANISH_POINT_RANGE, point + (3, -20), score)
+    warm, _ = solve(perspective, prev=prev)
+    assert np.allclose(warm, VANISH_POINT, atol=1)
+
+
+def test_wrong_warm_start_falls_back_to_brute(perspective, monkeypatch):
+    _, score = solve(perspective, prev=None)
+    called = []
+    brute = optimize.brute
+
+    def brute_record(*args, **kwargs):
+        called.append(True)
+        return brute(*args, **kwargs)
+
+    monkeypatch.setattr(optimize, 'brute', brute_record)
+    # Local search from the wrong point stays at the crossing of the two wrong lines
+    local = optimize.fmin(perspective._vanish_point_value, WRONG_POINT, disp=False)
+    assert np.allclose(local, WRONG_POINT, atol=1)
+
+    prev = (VANISH_POINT_RANGE, np.array(WRONG_POINT, dtype=float), score)
+    point, _ = solve(perspective, prev=prev)
+    assert called
+    assert np.allclose(point, VANISH_POINT, atol=1)
+
+
+def test_range_changed(perspective, monkeypatch):
+    point, score = solve(perspective, prev=None)
+    called = []
+    brute = optimize.brute
+
+    def brute_record(*args, **kwargs):
+        called.append(True)
+        return brute(*args, **kwargs)
+
+    monkeypatch.setattr(optimize, 'brute', brute_record)
+    # Previous result was searched in another range
+    solve(perspective, prev=(((500, 700), (-3000, -1000)), point, score))
+    assert called
@@ -0,0 +1,134 @@
+import threading
+import time
+
+import pytest
+
+from module.map_detection.grid_info import GridInfo
+from module.map_detection.utils import predict_grids
+
+
+class FakeGrid:
+    def __init__(self, location):
+        self.location = location
+        self.is_enemy = False
+        self.enemy_scale = 0
+
+    def predict(self):
+        self.is_enemy = self.predict_enemy()
+        self.enemy_scale = self.predict_enemy_scale()
+
+    def predict_enemy(self):
+        return sum(self.location) % 3 == 0
+
+    def predict_enemy_scale(self):
+        return self.location[0] % 4 if self.is_enemy else 0
+
+
+class BrokenGrid(FakeGrid):
+    def predict_enemy(self):
+        raise ValueError(self.location)
+
+
+def grids(cls=FakeGrid, width=9, height=6):
+    return [cls((x, y)) for x in range(width) for y in range(height)]
+
+
+def test_empty():
+    assert predict_grids([], threads=4) == {}
+    assert predict_grids([], threads=4, timing=True) == {}
+
+
+def test_more_threads_than_grids():
+    result = grids(width=2, height=1)
+    assert predict_grids(iter(result), threads=100) == {}
+    assert [grid.is_enemy for grid in result] == [True, False]
+
+
+def test_run_in_parallel():
+    """
+    All jobs must be running at the same time to pass the barrier.
+    """
+    barrier = threading.Barrier(4, timeout=10)
+
+    class BarrierGrid(FakeGrid):
+        def predict(self):
+            # First grid of each job
+            if self.location[1] < 4:
+                barrier.wait()
+            super().predict()
+
+    result = grids(BarrierGrid, width=1, height=8)
+    predict_grids(result, threads=4)
+    assert not barrier.broken
+    assert [grid.is_enemy for grid in result] == [sum(grid.location) % 3 == 0 for grid in result]
+
+
+def test_error_after_all_jobs():
+    """
+    Other jobs finish even if one of them raises.
+    """
+    result = grids(width=1, height=8)
+    result[1] = BrokenGrid((0, 1))
+    with pytest.raises(ValueError):
+        predict_grids(result, threads=4)
+    # Grids in other jobs, and the grid after the broken one in its own job
+    assert [grid.is_enemy for grid in result if grid.location[1] % 4 != 1] == [True, False, True, False, True, False]
+    assert not result[5].is_enemy
+
+
+def test_raise_first_job_error():
+    """
+    Error of the first job is raised, even if a later job fails earlier.
+    """
+
+    class SlowBrokenGrid(BrokenGrid):
+        def predict_enemy(self):
+            time.sleep(0.1)
+            return super().predict_enemy()
+
+    result = [SlowBrokenGrid((0, 0)), BrokenGrid((1, 0))]
+    with pytest.raises(ValueError) as e:
+        predict_grids(result, threads=2)
+    assert e.value.args[0] == (0, 0)
+
+
+@pytest.mark.parametrize('threads', [1, 4])
+def test_timing(threads):
+    class SlowGrid(FakeGrid):
+        def predict_enemy(self):
+            time.sleep(0.01)
+            return super().predict_enemy()
+
+    result = grids(SlowGrid, width=4, height=1)
+    timing = predict_grids(result, threads=threads, timing=True)
+    assert set(timing.keys()) == {'predict', 'predict_enemy', 'predict_enemy_scale'}
+    # Summed over grids, not wall time
+    assert timing['predict_enemy'] >= 0.04
+    assert timing['predict'] >= timing['predict_enemy']
+    # Timed methods are removed after prediction
+    assert all('predict_enemy' not in grid.__dict__ for grid in result)
+
+
+def test_timing_removed_on_error():
+    result = grids(BrokenGrid, width=2, height=1)
+    with pytest.raises(ValueError):
+        predict_grids(result, threads=1, timing=True)
+    assert all('predict_enemy' not in grid.__dict__ for grid in result)
+
+
+def test_timing_on_grid_info():
+    """
+    Timing shadows methods on instances of GridInfo, which tracks attribute changes.
+    """
+
+    class Grid(GridInfo):
+        def predict(self):
+            self.is_enemy = self.predict_enemy()
+
+        def predict_enemy(self):
+            return True
+
+    result = [Grid() for _ in range(4)]
+    predict_grids(result, threads=2, timing=True)
+    assert all(grid.is_enemy for grid in result)
+    assert all('predict_enemy' not in grid.__dict__ for grid in result)
@@ -0,0 +1,117 @@
+import queue
+import sys
+from types import SimpleNamespace
+
+import PIL.Image
+import pytest
+
+# process_manager replaces PIL with a fake module, restore it for other tests
+_pil = {name: sys.modules[name] for name in ['PIL', 'PIL.Image']}
+from module.webui.process_manager import ProcessManager
+from module.webui.setting import State
+from module.webui.widgets import DARK_TERMINAL_THEME, LIGHT_TERMINAL_THEME, RenderedLog
+
+sys.modules.update(_pil)
+
+
+@pytest.fixture
+def pm(monkeypatch):
+    monkeypatch.setattr(State, 'manager', SimpleNamespace(Queue=queue.Queue))
+    monkeypatch.setattr(RenderedLog, '_instances', {})
+    # HTML export depends on rich version, sequence numbers are tested here
+    monkeypatch.setattr(RenderedLog, 'render', lambda self, renderable: f'<{renderable}>')
+    return ProcessManager('test')
+
+
+def append(pm, start, stop):
+    for i in range(start, stop):
+        pm.append_renderable(f'record-{i}')
+
+
+def test_renderables_since(pm):
+    assert pm.renderables_since(0) == (0, [])
+    append(pm, 0, 5)
+    assert pm.renderables_since(0) == (0, [f'record-{i}' for i in range(5)])
+    assert pm.renderables_since(3) == (3, ['record-3', 'record-4'])
+    # Nothing new
+    assert pm.renderables_since(5) == (5, [])
+
+
+def test_renderables_trimmed(pm):
+    append(pm, 0, 401)
+    # Oldest 80 dropped on exceeding 400
+    assert len(pm.renderables) == 321
+    assert pm.renderables_seq == 401
+    # Sequence numbers don't change after trimming
+    assert pm.renderables_since(400) == (400, ['record-400'])
+    # Records from a dropped seq, return from the oldest one kept
+    start, renderables = pm.renderables_since(10)
+    assert start == 80
+    assert renderables[0] == 'record-80'
+    assert len(renderables) == 321
+
+
+def test_since_delta(pm):
+    rendered = RenderedLog.get(pm, DARK_TERMINAL_THEME, 80)
+    assert rendered.since(None) == (0, '')
+    append(pm, 0, 3)
+    seq, html = rendered.since(None)
+    assert seq == 3
+    assert html == '<record-0><record-1><record-2>'
+    append(pm, 3, 5)
+    seq, html = rendered.since(seq)
+    assert seq == 5
+    assert html == '<record-3><record-4>'
+    assert rendered.since(seq) == (5, '')
+
+
+def test_since_trimmed(pm):
+    rendered = RenderedLog.get(pm, DARK_TERMINAL_THEME, 80)
+    append(pm, 0, 10)
+    seq, _ = rendered.since(None)
+    append(pm, 10, 500)
+    # Records 10 to 159 are dropped before being rendered
+    new_seq, html = rendered.since(seq)
+    assert new_seq == 500
+    assert rendered.first_seq == 160
+    assert len(rendered.html) == 340
+    assert html.startswith('<record-160>')
+
+
+def test_rendered_once(pm, monkeypatch):
+    rendered = RenderedLog.get(pm, DARK_TERMINAL_THEME, 80)
+    calls = []
+    render = rendered.render
+    monkeypatch.setattr(rendered, 'render', lambda renderable: calls.append(renderable) or render(renderable))
+    append(pm, 0, 3)
+    # Another session with the same theme and width
+    assert RenderedLog.get(pm, DARK_TERMINAL_THEME, 80) is rendered
+    rendered.since(None)
+    rendered.since(0)
+    assert calls == ['record-0', 'record-1', 'record-2']
+    # Different theme or width is rendered separately
+    assert RenderedLog.get(pm, LIGHT_TERMINAL_THEME, 80) is not rendered
+    assert RenderedLog.get(pm, DARK_TERMINAL_THEME, 120) is not rendered
+
+
+def test_evict_on_stop(pm):
+    other = ProcessManager('other')
+    RenderedLog.get(pm, DARK_TERMINAL_THEME, 80)
+    RenderedLog.get(pm, LIGHT_TERMINAL_THEME, 80)
+    kept = RenderedLog.get(other, DARK_TERMINAL_THEME, 80)
+    pm.stop()
+    assert list(RenderedLog._instances.values()) == [kept]
+
+
+def test_continue_after_evict(pm):
+    """
+    Sessions showing the log of a stopped manager get a new instance, sequence numbers continue.
+    """
+    append(pm, 0, 3)
+    seq, _ = RenderedLog.get(pm, DARK_TERMINAL_THEME, 80).since(None)
+    pm.release_rendered_log()
+    append(pm, 3, 4)
+    rendered = RenderedLog.get(pm, DARK_TERMINAL_THEME, 80)
+    seq, html = rendered.since(seq)
+    assert seq == 4
+    assert html == '<record-3>'
@@ -0,0 +1,193 @@
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import module.device.method.scrcpy.core as core
+from module.device.method.scrcpy.core import ScrcpyCore
+from module.device.method.scrcpy.options import ScrcpyOptions
+
+SPS = b'\x00\x00\x00\x01\x67\x42'
+PPS = b'\x00\x00\x00\x01\x68\xce'
+IDR = b'\x00\x00\x00\x01\x65'
+SLICE = b'\x00\x00\x00\x01\x41'
+
+
+class Packet(bytes):
+    def __new__(cls, data, name):
+        packet = super().__new__(cls, data)
+        packet.name = name
+        packet.is_keyframe = IDR in data
+        return packet
+
+
+def key(name, config=False):
+    return Packet((SPS + PPS if config else b'') + IDR + name.encode(), name)
+
+
+def inter(name):
+    return Packet(SLICE + name.encode(), name)
+
+
+class Frame:
+    def __init__(self, name, reference=None):
+        self.name = name
+        self.reference = reference
+        self.width, self.height = 1280, 720
+        self.converted = 0
+
+    def to_ndarray(self, format):
+        self.converted += 1
+        return np.zeros((self.height, self.width, 3), dtype=np.uint8)
+
+
+class Codec:
+    """
+    Decoder fails without parameter sets, and on non-key frames without a reference.
+    """
+
+    def __init__(self):
+        self.decoded = []
+        self.config = False
+        self.reference = None
+        self.broken = set()
+
+    def decode(self, packet):
+        self.decoded.append(packet.name)
+        if SPS in packet:
+            self.config = True
+        if not self.config or packet.name in self.broken:
+            raise ValueError(f'Cannot decode {packet.name}')
+        if packet.is_keyframe:
+            self.reference = packet.name
+        elif self.reference is None:
+            raise ValueError(f'No reference for {packet.name}')
+        frame = Frame(packet.name, reference=self.reference)
+        self.reference = packet.name
+        return [frame]
+
+
+@pytest.fixture
+def scrcpy(monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(core, 'time', SimpleNamespace(time=lambda: float(next(clock))))
+    monkeypatch.setattr(ScrcpyOptions, 'decode_latest_only', True)
+    scrcpy = ScrcpyCore.__new__(ScrcpyCore)
+    scrcpy._scrcpy_codec = Codec()
+    return scrcpy
+
+
+def receive(scrcpy, *packets):
+    with scrcpy._scrcpy_codec_lock:
+        for packet in packets:
+            scrcpy._scrcpy_receive_packet(packet)
+
+
+def last_name(scrcpy):
+    return scrcpy._scrcpy_last_av_frame.name
+
+
+def test_pending_keyframe(scrcpy):
+    receive(scrcpy, key('k1', config=True), key('k2'), key('k3'))
+    # First key frame is decoded right away, later ones wait for screenshots
+    assert scrcpy._scrcpy_codec.decoded == ['k1']
+    assert scrcpy.scrcpy_get_last_frame() is not None
+    assert last_name(scrcpy) == 'k3'
+    # k2 is dropped without decoding
+    assert scrcpy._scrcpy_codec.decoded == ['k1', 'k3']
+    assert scrcpy._scrcpy_last_packet is None
+
+
+def test_first_keyframe_replaced(scrcpy):
+    """
+    Parameter sets in the first packet are not lost when newer key frames arrive before any screenshot.
+    """
+    receive(scrcpy, key('k1', config=True), key('k2'))
+    assert scrcpy.scrcpy_get_last_frame() is not None
+    assert last_name(scrcpy) == 'k2'
+
+
+def test_config_packet(scrcpy):
+    """
+    Config packets in the middle of stream, such as on resolution change, are decoded right away.
+    """
+    receive(scrcpy, key('k1', config=True))
+    scrcpy._scrcpy_codec.config = False
+    receive(scrcpy, key('k2', config=True), key('k3'))
+    assert scrcpy._scrcpy_codec.decoded == ['k1', 'k2']
+    assert scrcpy.scrcpy_get_last_frame() is not None
+    assert last_name(scrcpy) == 'k3'
+
+
+def test_inter_frame(scrcpy):
+    receive(scrcpy, key('k1', config=True), key('k2'), key('k3'), inter('p1'))
+    # Pending key frame is decoded before the frame referencing it
+    assert scrcpy._scrcpy_codec.decoded == ['k1', 'k3', 'p1']
+    assert last_name(scrcpy) == 'p1'
+    assert scrcpy._scrcpy_last_av_frame.reference == 'k3'
+    assert scrcpy._scrcpy_last_packet is None
+
+
+def test_decode_failed(scrcpy):
+    receive(scrcpy, key('k1', config=True))
+    frame_time = scrcpy._scrcpy_last_frame_time
+    assert scrcpy.scrcpy_get_last_frame(after=frame_time - 1) is not None
+
+    scrcpy._scrcpy_codec.broken.add('k2')
+    receive(scrcpy, key('k2'))
+    # Stale frame is not returned as a new one
+    assert scrcpy.scrcpy_get_last_frame(after=frame_time) is None
+    assert scrcpy._scrcpy_last_frame_time == frame_time
+    assert scrcpy._scrcpy_last_packet is None
+    assert last_name(scrcpy) == 'k1'
+    # Stream recovers on the next key frame
+    receive(scrcpy, key('k3'))
+    assert scrcpy.scrcpy_get_last_frame(after=frame_time) is not None
+    assert last_name(scrcpy) == 'k3'
+
+
+def test_frame_time(scrcpy):
+    """
+    Frame time is the receive time of the packet, set only if a frame is decoded.
+    """
+    receive(scrcpy, key('k1', config=True))
+    assert scrcpy._scrcpy_last_frame_time == scrcpy._scrcpy_last_packet_time
+    received = scrcpy._scrcpy_last_frame_time
+    receive(scrcpy, key('k2'))
+    pending = scrcpy._scrcpy_last_packet_time
+    assert scrcpy._scrcpy_last_frame_time == received
+    # Decoded later, still the time it's received
+    scrcpy.scrcpy_get_last_frame()
+    assert scrcpy._scrcpy_last_frame_time == pending
+
+
+def test_no_frame(scrcpy):
+    assert scrcpy.scrcpy_get_last_frame() is None
+    # Decoder fails without parameter sets
+    with pytest.raises(ValueError):
+        receive(scrcpy, key('k1'))
+    assert scrcpy._scrcpy_last_frame_time == 0.
+    # Key frames are decoded right away until the first frame
+    receive(scrcpy, key('k2', config=True))
+    assert scrcpy._scrcpy_codec.decoded == ['k1', 'k2']
+
+
+def test_conversion_cached(scrcpy):
+    receive(scrcpy, key('k1', config=True))
+    first = scrcpy.scrcpy_get_last_frame()
+    assert scrcpy.scrcpy_get_last_frame() is first
+    assert scrcpy._scrcpy_last_av_frame.converted == 1
+
+
+def test_decode_latest_only_disabled(scrcpy, monkeypatch):
+    monkeypatch.setattr(ScrcpyOptions, 'decode_latest_only', False)
+    receive(scrcpy, key('k1', config=True), key('k2'), inter('p1'))
+    assert scrcpy._scrcpy_codec.decoded == ['k1', 'k2', 'p1']
+
+
+def test_lock_per_instance():
+    a = ScrcpyCore.__new__(ScrcpyCore)
+    b = ScrcpyCore.__new__(ScrcpyCore)
+    assert a._scrcpy_codec_lock is a._scrcpy_codec_lock
+    assert a._scrcpy_codec_lock is not b._scrcpy_codec_lock
@@ -0,0 +1,277 @@
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from module.base.base import ModuleBase
+from module.base.timer import Timer
+from module.device.screenshot import Screenshot
+
+SHAPE = (720, 1280, 3)
+
+
+def screen(box=None, value=255):
+    image = np.zeros(SHAPE, dtype=np.uint8)
+    image[:, :, 1] = np.arange(SHAPE[1]) % 200
+    if box is not None:
+        x1, y1, x2, y2 = box
+        image[y1:y2, x1:x2] = value
+    return image
+
+
+class FakeScreenshot(Screenshot):
+    """
+    Screenshot with the real comparison and interval logic, taking images from a list.
+    """
+
+    def __init__(self, images):
+        self.images = iter(images)
+        self.image = None
+        self.image_previous = None
+        self.config = SimpleNamespace(Emulator_ScreenshotDedithering=False, Error_SaveError=False)
+        self.screenshot_method_override = 'fake'
+        self.__dict__['screenshot_methods'] = {'fake': lambda: next(self.images)}
+        self._screenshot_interval = Timer(0)
+        self._screenshot_interval_base = 0
+
+    def check_screen_size(self):
+        return True
+
+    def check_screen_black(self):
+        return True
+
+
+def feed(device, image):
+    """
+    Compare and adapt without waiting screenshot interval.
+    """
+    previous = device.image
+    device.image = image
+    device._screen_compare(previous)
+    device._screenshot_interval_adapt()
+
+
+"""
+Screen compare
+"""
+
+
+def test_identical_frame_reuses_ndarray():
+    first, second = screen(), screen()
+    device = FakeScreenshot([first, second])
+    assert device.screenshot() is first
+    assert device.frame_changed
+    # Identical content, previous object is kept so caches keyed on it are reused
+    assert device.screenshot() is first
+    assert not device.frame_changed
+    assert not device.area_changed((0, 0, 1280, 720))
+
+
+def test_similar_frame_not_reused():
+    """
+    Changes below SCREEN_CHANGE_THRESHOLD are not a visual change, but pixels differ,
+    the new image must be kept.
+    """
+    first = screen()
+    second = screen(box=(600, 300, 602, 302), value=1)
+    device = FakeScreenshot([first, second])
+    device.screenshot()
+    assert device.screenshot() is second
+    assert not device.frame_changed
+    assert device.area_changed((590, 290, 610, 310))
+    assert not device.area_changed((0, 0, 100, 100))
+
+
+def test_first_frame_changed():
+    device = FakeScreenshot([screen()])
+    device.screenshot()
+    assert device.frame_changed
+    assert device.changed_regions((100, 100, 200, 200)) == [(100, 100, 200, 200)]
+    assert device.area_changed((100, 100, 200, 200))
+
+
+def test_changed_regions():
+    device = FakeScreenshot([screen(), screen(box=(400, 200, 440, 240))])
+    device.screenshot()
+    device.screenshot()
+    assert device.frame_changed
+
+    regions = device.changed_regions()
+    assert regions
+    for x1, y1, x2, y2 in regions:
+        # Thumbnail cells are 20x20, change is covered by cells around it
+        assert 380 <= x1 and x2 <= 460 and 180 <= y1 and y2 <= 260
+    assert device.changed_regions((400, 200, 440, 240))
+    assert device.changed_regions((0, 0, 300, 720)) == []
+    assert device.area_changed((400, 200, 440, 240))
+    assert not device.area_changed((0, 0, 300, 720))
+
+
+def test_changed_regions_out_of_screen():
+    device = FakeScreenshot([screen(), screen(box=(1260, 700, 1280, 720))])
+    device.screenshot()
+    device.screenshot()
+    assert device.changed_regions((1200, 650, 1400, 800)) == [(1260, 700, 1280, 720)]
+
+
+def test_resolution_changed():
+    small = np.zeros((360, 640, 3), dtype=np.uint8)
+    device = FakeScreenshot([screen(), small])
+    device.screenshot()
+    device.screenshot()
+    assert device.frame_changed
+    assert device.area_changed((0, 0, 100, 100))
+
+
+"""
+Screenshot interval backoff
+"""
+
+
+@pytest.fixture
+def device():
+    device = FakeScreenshot([])
+    device._screenshot_interval_base = 0.1
+    device._screenshot_interval = Timer(0.1)
+    return device
+
+
+def test_no_backoff_outside_expect_wait(device):
+    image = screen()
+    for _ in range(20):
+        feed(device, image)
+    assert device._screenshot_unchanged == 19
+    assert device._screenshot_interval.limit == 0.1
+
+
+def test_backoff_during_expect_wait(device):
+    device.screenshot_expect_wait(300, max_interval=1.5)
+    image = screen()
+    limits = []
+    for _ in range(20):
+        feed(device, image)
+        limits.append(device._screenshot_interval.limit)
+
+    patience = device.SCREENSHOT_BACKOFF_PATIENCE
+    # First screenshot has no previous one, then `patience` unchanged screenshots at base
+    assert limits[:patience + 1] == [0.1] * (patience + 1)
+    assert limits[patience + 1] == pytest.approx(0.1 * device.SCREENSHOT_BACKOFF_FACTOR)
+    assert limits == sorted(limits)
+    assert limits[-1] == 1.5
+
+
+def test_backoff_restores_on_change(device):
+    device.screenshot_expect_wait(300, max_interval=1.5)
+    image = screen()
+    for _ in range(10):
+        feed(device, image)
+    assert device._screenshot_interval.limit > 0.1
+
+    feed(device, screen(box=(0, 0, 100, 100)))
+    assert device._screenshot_unchanged == 0
+    assert device._screenshot_interval.limit == 0.1
+
+
+def test_backoff_ends_with_expect_wait(device):
+    device.screenshot_expect_wait(10, max_interval=1.5)
+    image = screen()
+    for _ in range(10):
+        feed(device, image)
+    assert device._screenshot_interval.limit > 0.1
+
+    end, wait_max = device._screenshot_expect_wait
+    device._screenshot_expect_wait = (end - 11, wait_max)
+    feed(device, image)
+    assert device._screenshot_interval.limit == 0.1
+
+
+def test_interval_reset(device):
+    device.screenshot_expect_wait(300, max_interval=1.5)
+    image = screen()
+    for _ in range(10):
+        feed(device, image)
+    # Called on control actions
+    device.screenshot_interval_reset()
+    assert device._screenshot_unchanged == 0
+    assert device._screenshot_interval.limit == 0.1
+    # Backoff starts over after patience
+    feed(device, image)
+    assert device._screenshot_interval.limit == 0.1
+
+
+"""
+wait_until_stable
+"""
+
+
+class CountButton:
+    area = (400, 200, 440, 240)
+
+    def __init__(self):
+        self._match_init = False
+        self.match_count = 0
+        self.color_count = 0
+
+    def match(self, image, offset=(0, 0)):
+        self.match_count += 1
+        return True
+
+    def load_color(self, image):
+        self.color_count += 1
+
+    def __str__(self):
+        return 'COUNT_BUTTON'
+
+
+def wait_until_stable(images, button):
+    device = FakeScreenshot(images)
+    device.screenshot()
+    base = ModuleBase.__new__(ModuleBase)
+    base.device = device
+    base.wait_until_stable(button, timer=Timer(0, count=5).start(), timeout=Timer(5, count=20))
+    return device
+
+
+def test_wait_until_stable_skips_unchanged():
+    image = screen()
+    button = CountButton()
+    wait_until_stable((image.copy() for _ in itertools.count()), button)
+    # Matched once, screenshots after are the same object
+    assert button.match_count == 1
+
+
+def test_wait_until_stable_matches_changed():
+    """
+    Changes outside the button area don't trigger matching, changes inside do.
+    """
+
+    def images():
+        for i in itertools.count():
+            yield screen(box=(0, 0, 100, 100), value=i % 2 * 255)
+
+    button = CountButton()
+    wait_until_stable(images(), button)
+    assert button.match_count == 1
+
+    def images():
+        for i in itertools.count():
+            yield screen(box=CountButton.area, value=i % 2 * 255)
+
+    button = CountButton()
+    wait_until_stable(images(), button)
+    assert button.match_count > 1
+
+
+def test_expect_wait_end(device):
+    device.screenshot_expect_wait(300, max_interval=1.5)
+    image = screen()
+    for _ in range(10):
+        feed(device, image)
+    assert device._screenshot_interval.limit > 0.1
+    # Leaving the wait loop
+    device.screenshot_expect_wait_end()
+    assert device._screenshot_interval.limit == 0.1
+    for _ in range(10):
+        feed(device, image)
+    assert device._screenshot_interval.limit == 0.1
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+import module.vision_llm
+from module.base.template import Template
+
+# Stack of 8 images, 40x50
+SHAPE = (8, 40, 50)
+
+
+@pytest.fixture(autouse=True)
+def no_vision_log(monkeypatch):
+    """
+    Matches are logged to vision LLM, which saves screenshots under logs/.
+    """
+    monkeypatch.setattr(module.vision_llm, 'log_vision_comparison', lambda **kwargs: None)
+
+
+def pattern(shape, a, b):
+    y, x = np.indices(shape)
+    return ((x * a + y * b + x * y) % 251).astype(np.uint8)
+
+
+def stack():
+    background = pattern(SHAPE[1:], 7, 3)
+    return np.stack([np.roll(background, shift=i * 5, axis=1) for i in range(SHAPE[0])])
+
+
+def make_template(height=20, width=20):
+    template = Template(file="./assets/stacked_test.png")
+    template.image = pattern((height, width), 13, 29)
+    return template
+
+
+def test_match_on_images():
+    images = stack()
+    template = make_template()
+    images[2, 0:20, 0:20] = template.image
+    images[5, 20:40, 30:50] = template.image
+    assert np.flatnonzero(template.match_stacked(images)).tolist() == [2, 5]
+
+
+def test_across_two_images():
+    """
+    Template split on the bottom of an image and the top of the next one,
+    the joined image matches there but the result is dropped.
+    """
+    images = stack()
+    template = make_template()
+    images[3, 30:40, 10:30] = template.image[:10]
+    images[4, 0:10, 10:30] = template.image[10:]
+    joined = images.reshape(-1, SHAPE[2])
+    assert template.match(joined)
+    assert not template.match_stacked(images).any()
+
+
+def test_template_same_size_as_images():
+    images = stack()
+    template = make_template(*SHAPE[1:])
+    images[6] = template.image
+    assert np.flatnonzero(template.match_stacked(images)).tolist() == [6]
+
+
+@pytest.mark.parametrize('size', [(41, 20), (20, 51)])
+def test_template_larger(size):
+    assert make_template(*size).match_stacked(stack()) is None
+
+
+def test_single_image():
+    template = make_template()
+    image = stack()[:1]
+    assert template.match_stacked(image).tolist() == [False]
+    image[0, 10:30, 10:30] = template.image
+    assert template.match_stacked(image).tolist() == [True]
+
+
+def test_color_images():
+    images = np.repeat(stack()[..., np.newaxis], 3, axis=3)
+    template = make_template()
+    template.image = np.stack([template.image, template.image[::-1], template.image.T], axis=2)
+    images[1, 5:25, 5:25] = template.image
+    # Same gray levels in another channel order
+    images[4, 5:25, 5:25] = template.image[..., ::-1]
+    assert np.flatnonzero(template.match_stacked(images)).tolist() == [1]
+
+
+def test_gif():
+    images = stack()
+    template = make_template()
+    frame = template.image
+    template.is_gif = True
+    template.image = [frame, frame[:, ::-1].copy()]
+    images[0, 0:20, 0:20] = frame
+    images[7, 0:20, 0:20] = frame[:, ::-1]
+    assert np.flatnonzero(template.match_stacked(images)).tolist() == [0, 7]
+
+
+def test_similarity_threshold():
+    images = stack()
+    template = make_template()
+    images[2, 0:20, 0:20] = template.image
+    # Some noise on the template
+    images[2, 0:20:4, 0:20:4] = 0
+    assert template.match_stacked(images, similarity=0.5)[2]
+    assert not template.match_stacked(images, similarity=0.99)[2]
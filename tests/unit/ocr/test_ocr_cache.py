@@ -0,0 +1,33 @@
+"""
+Tests for the content-addressed OCR result cache.
+"""
+import numpy as np
+
+from module.ocr.cache import OcrCache
+
+
+class TestOcrCache:
+    def test_same_content_same_key(self):
+        a = np.zeros((20, 40, 3), dtype=np.uint8)
+        b = a.copy()
+        assert OcrCache.key(a, 128) == OcrCache.key(b, 128)
+        assert OcrCache.key(a, 128) != OcrCache.key(a, 64)
+        b[0, 0, 0] = 1
+        assert OcrCache.key(a, 128) != OcrCache.key(b, 128)
+
+    def test_non_contiguous_crop(self):
+        image = np.arange(100 * 100 * 3, dtype=np.uint8).reshape((100, 100, 3))
+        assert OcrCache.key(image[10:20, 10:30]) == OcrCache.key(image[10:20, 10:30].copy())
+
+    def test_lru_eviction_and_stats(self):
+        cache = OcrCache(maxsize=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        assert cache.get("a") == "1"
+        cache.put("c", "3")
+        # "b" is the least recently used
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+        assert len(cache) == 2
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1